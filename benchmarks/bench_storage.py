@@ -0,0 +1,75 @@
+"""
+Сравнение скорости сохранения и загрузки таблиц в разных форматах хранения.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_storage --rows 100000
+"""
+import os
+import time
+import argparse
+import tempfile
+import importlib.util
+import numpy as np
+from pandas import DataFrame, date_range
+
+from data_storage import DataStorage
+
+
+def make_frame(rows: int) -> DataFrame:
+    """
+    Функция создания синтетической таблицы временных рядов.
+
+    Args:
+        rows: число строк.
+
+    Returns:
+        Таблица с индексом Date и четырьмя столбцами.
+    """
+    rng = np.random.default_rng(0)
+    index = date_range("2020-01-01", periods=rows, freq="min", name="Date")
+    return DataFrame({name: np.cumsum(rng.normal(size=rows)) + 100
+                      for name in ("Open", "Movavg", "Diff", "Autocor")}, index=index)
+
+
+def measure(path: str,
+            data: DataFrame) -> tuple[float, float]:
+    """
+    Функция замера времени сохранения и загрузки листа.
+
+    Args:
+        path: путь к хранилищу.
+        data: сохраняемая таблица.
+
+    Returns:
+        Время сохранения и время загрузки в секундах.
+    """
+    storage = DataStorage(path)
+    start = time.perf_counter()
+    storage.save(data, sheet="bench")
+    saved = time.perf_counter()
+    storage.load(sheet="bench", index_col="Date")
+    return saved - start, time.perf_counter() - saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="число строк таблицы")
+    args = parser.parse_args()
+
+    data = make_frame(args.rows)
+    names = ["Storage.npz"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        names += ["Storage.parquet", "Storage.feather"]
+    if importlib.util.find_spec("openpyxl") is not None:
+        names += ["Storage.xlsx"]
+
+    print(f"{'format':<10}{'save, s':>12}{'load, s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in names:
+            save, load = measure(os.path.join(directory, name), data)
+            print(f"{os.path.splitext(name)[1]:<10}{save:>12.3f}{load:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
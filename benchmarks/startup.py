@@ -0,0 +1,98 @@
+"""
+Замер холодного запуска приложения до первого приглашения ввода.
+
+Приложение запускается в отдельном процессе с командой exit на входе,
+время берется лучшее из нескольких запусков. Отдельный запуск
+с -X importtime показывает самые долгие импорты и проверяет,
+что тяжелые модули не загружаются до первой команды.
+
+Запуск из корня репозитория:
+    python -m benchmarks.startup --repeat 5 --top 15
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+
+# Модули, которые не должны загружаться до первой команды.
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "yfinance", "openpyxl", "pyarrow")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_startup(repeat: int) -> float:
+    """
+    Функция замера времени от запуска main.py до выхода по команде exit.
+
+    Args:
+        repeat: число запусков.
+
+    Returns:
+        Лучшее время в секундах.
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py"], cwd=ROOT, input="exit\n",
+                       capture_output=True, text=True, check=True)
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """
+    Функция разбора вывода -X importtime.
+
+    Args:
+        stderr: вывод интерпретатора.
+
+    Returns:
+        Список (модуль, собственное время, суммарное время) в микросекундах.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure_imports() -> list[tuple[str, int, int]]:
+    """
+    Функция запуска main.py с -X importtime.
+
+    Returns:
+        Список импортов (см. parse_importtime).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "main.py"], cwd=ROOT,
+                            input="exit\n", capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="число запусков")
+    parser.add_argument("--top", type=int, default=15, help="число самых долгих импортов")
+    args = parser.parse_args()
+
+    print(f"Запуск до первой команды: {measure_startup(args.repeat) * 1000:.0f} ms")
+
+    imports = measure_imports()
+    print(f"\n{'module':<50}{'self, ms':>10}{'cumulative, ms':>16}")
+    for name, self_us, cumulative_us in sorted(imports, key=lambda item: -item[2])[:args.top]:
+        print(f"{name:<50}{self_us / 1000:>10.1f}{cumulative_us / 1000:>16.1f}")
+
+    loaded = sorted({name.strip().split(".")[0] for name, _, _ in imports} & set(HEAVY_MODULES))
+    if loaded:
+        print("\nДо первой команды загружены тяжелые модули:", ", ".join(loaded))
+        return 1
+    print("\nТяжелые модули до первой команды не загружаются.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
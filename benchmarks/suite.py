@@ -0,0 +1,259 @@
+"""
+Набор замеров производительности TimeSeriesAnalyser и DataStorage
+на синтетических рядах от 1e3 до 1e7 точек (регулярных и нерегулярных).
+Для каждого замера сохраняются лучшее время из нескольких повторов
+и пиковый объем памяти (tracemalloc, отдельным запуском).
+
+Запуск из корня репозитория:
+    python -m benchmarks.suite --sizes 1e3,1e4,1e5 --save-baseline baseline.json
+    python -m benchmarks.suite --sizes 1e3,1e4,1e5 --baseline baseline.json --threshold 0.25
+
+При сравнении с базовыми результатами код возврата равен 1,
+если хотя бы один замер стал медленнее (или тяжелее по памяти)
+более чем на threshold.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import importlib.util
+import numpy as np
+from datetime import timedelta
+from typing import Callable
+from pandas import DataFrame, DatetimeIndex, Series, Timestamp
+
+from data_storage import DataStorage
+from time_series import TimeSeriesAnalyser
+
+
+# Замеры быстрее этого порога считаются шумом и не проверяются на регрессию.
+MIN_SECONDS = 1e-3
+MIN_PEAK_MB = 1.0
+
+
+def make_series(size: int,
+                kind: str) -> Series:
+    """
+    Функция создания синтетического временного ряда (случайное блуждание).
+
+    Args:
+        size: число точек.
+        kind: "regular" - шаг одна минута, "irregular" - случайные
+        шаги от 1 до 120 секунд с редкими пропусками по несколько часов.
+
+    Returns:
+        Временной ряд.
+    """
+    rng = np.random.default_rng(0)
+    if kind == "regular":
+        steps = np.full(size, 60, dtype=np.int64)
+    elif kind == "irregular":
+        steps = rng.integers(1, 121, size=size)
+        gaps = rng.random(size) < 1e-3
+        steps[gaps] += rng.integers(3600, 6 * 3600, size=int(gaps.sum()))
+    else:
+        error = ValueError("Неизвестный вид ряда: " + kind)
+        raise error
+    start = Timestamp("2020-01-01").value
+    times = start + np.cumsum(steps) * 1_000_000_000
+    index = DatetimeIndex(times.view("datetime64[ns]"), name="Date")
+    return Series(np.cumsum(rng.normal(size=size)) + 100, index=index, name="Open")
+
+
+def analysis_cases(series: Series) -> dict[str, Callable[[], object]]:
+    """
+    Функция составления замеров методов TimeSeriesAnalyser. Анализатор
+    создается заново в каждом замере, чтобы не попадать в его кэш.
+
+    Args:
+        series: временной ряд.
+
+    Returns:
+        Словарь замеряемых функций.
+    """
+    interval = timedelta(minutes=1)
+    max_lag = min(1000, series.size - 2)
+    return {
+        "interval": lambda: TimeSeriesAnalyser(series).interval,
+        "differentiate": lambda: TimeSeriesAnalyser(series, interval).differentiate(),
+        "movavg_int": lambda: TimeSeriesAnalyser(series, interval).calc_movavg(60),
+        "movavg_timedelta": lambda: TimeSeriesAnalyser(series, interval).calc_movavg(timedelta(hours=1)),
+        "ema_int": lambda: TimeSeriesAnalyser(series, interval).calc_ema(60),
+        "ema_timedelta": lambda: TimeSeriesAnalyser(series, interval).calc_ema(timedelta(hours=1)),
+        "rolling_std": lambda: TimeSeriesAnalyser(series, interval).calc_rolling_std(timedelta(hours=1)),
+        "rolling_max_int": lambda: TimeSeriesAnalyser(series, interval).calc_rolling_max(60),
+        "rolling_max_timedelta": lambda: TimeSeriesAnalyser(series, interval).calc_rolling_max(timedelta(hours=1)),
+        "autocor_exact": lambda: TimeSeriesAnalyser(series, interval).calc_autocor(max_lag=max_lag),
+        "autocor_fft": lambda: TimeSeriesAnalyser(series, interval).calc_autocor(max_lag=max_lag, method="fft"),
+        "extremes": lambda: TimeSeriesAnalyser(series, interval).find_extremes(),
+        "extremes_filtered": lambda: TimeSeriesAnalyser(series, interval).find_extremes(
+            min_prominence=1.0, min_distance=timedelta(hours=1)),
+    }
+
+
+def storage_cases(series: Series,
+                  directory: str) -> dict[str, Callable[[], object]]:
+    """
+    Функция составления замеров сохранения и загрузки DataStorage.
+    Эксель замеряется только до 1e4 строк (ограничение формата и времени).
+
+    Args:
+        series: временной ряд.
+        directory: каталог для файлов хранилищ.
+
+    Returns:
+        Словарь замеряемых функций.
+    """
+    data = DataFrame({"Open": series, "Movavg": series.to_numpy()[::-1]}, index=series.index)
+    names = ["Storage.npz"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        names.append("Storage.parquet")
+    if importlib.util.find_spec("openpyxl") is not None and series.size <= 10_000:
+        names.append("Storage.xlsx")
+
+    # save_many пишет в отдельные файлы: лишние листы в общем файле
+    # замедлили бы остальные замеры эксель (копируются при каждом сохранении).
+    many_directory = os.path.join(directory, "many")
+    os.makedirs(many_directory, exist_ok=True)
+
+    cases = {}
+    for name in names:
+        storage = DataStorage(os.path.join(directory, name))
+        many = DataStorage(os.path.join(many_directory, name))
+        fmt = os.path.splitext(name)[1][1:]
+        storage.save(data, sheet="bench")
+        cases[f"save_{fmt}"] = lambda storage=storage: storage.save(data, sheet="bench")
+        cases[f"load_{fmt}"] = lambda storage=storage: storage.load(sheet="bench", index_col="Date")
+        cases[f"save_many_{fmt}"] = lambda many=many: many.save_many(
+            {f"bench_{i}": data for i in range(4)})
+    return cases
+
+
+def measure(run: Callable[[], object],
+            repeat: int) -> dict[str, float]:
+    """
+    Функция замера времени и пиковой памяти.
+
+    Args:
+        run: замеряемая функция.
+        repeat: число повторов замера времени.
+
+    Returns:
+        Лучшее время в секундах и пиковая память в мегабайтах.
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+
+    # tracemalloc замедляет выполнение, поэтому память замеряется отдельно.
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(seconds), "peak_mb": peak / 2**20}
+
+
+def run_suite(sizes: list[int],
+              kinds: list[str],
+              repeat: int,
+              storage: bool=True) -> dict[str, dict[str, float]]:
+    """
+    Функция выполнения всех замеров.
+
+    Args:
+        sizes: длины рядов.
+        kinds: виды рядов ("regular", "irregular").
+        repeat: число повторов замера времени.
+        storage: замерять ли DataStorage.
+
+    Returns:
+        Результаты с ключами вида "movavg_int/regular/1000".
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for kind in kinds:
+                series = make_series(size, kind)
+                cases = analysis_cases(series)
+                if storage:
+                    cases.update(storage_cases(series, directory))
+                for name, run in cases.items():
+                    key = f"{name}/{kind}/{size}"
+                    results[key] = measure(run, repeat)
+                    print(f"{key:<40}{results[key]['seconds']:>12.4f} s"
+                          f"{results[key]['peak_mb']:>12.1f} MB", flush=True)
+    return results
+
+
+def compare(results: dict[str, dict[str, float]],
+            baseline: dict[str, dict[str, float]],
+            threshold: float) -> list[str]:
+    """
+    Функция поиска регрессий относительно базовых результатов.
+
+    Args:
+        results: текущие результаты.
+        baseline: базовые результаты.
+        threshold: допустимое относительное ухудшение (0.25 - на 25%).
+
+    Returns:
+        Описания регрессий.
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric, floor in (("seconds", MIN_SECONDS), ("peak_mb", MIN_PEAK_MB)):
+            old, new = baseline[key][metric], result[metric]
+            if new > floor and new > old * (1 + threshold):
+                regressions.append(f"{key}: {metric} {old:.4g} -> {new:.4g} "
+                                   f"(+{(new / max(old, 1e-12) - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1e3,1e4,1e5,1e6",
+                        help="длины рядов через запятую (до 1e7)")
+    parser.add_argument("--kinds", default="regular,irregular", help="виды рядов через запятую")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов замера времени")
+    parser.add_argument("--no-storage", action="store_true", help="не замерять DataStorage")
+    parser.add_argument("--baseline", help="файл базовых результатов для сравнения")
+    parser.add_argument("--save-baseline", help="сохранить результаты в файл")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="допустимое относительное ухудшение")
+    args = parser.parse_args()
+
+    sizes = [int(float(size)) for size in args.sizes.split(",")]
+    results = run_suite(sizes, args.kinds.split(","), args.repeat, not args.no_storage)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump({"machine": platform.platform(),
+                       "python": platform.python_version(),
+                       "numpy": np.__version__,
+                       "results": results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print("Регрессия:", regression)
+        if regressions:
+            return 1
+        print("Регрессий нет.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,14 @@
-from data_storage.data_storage import DataStorage
-from data_storage.dowload import Downloader
+from lazy_exports import lazy_exports
+
+_EXPORTS = {
+    "DataStorage": "data_storage.data_storage",
+    "Downloader": "data_storage.dowload",
+    "MemmapStore": "data_storage.mmap_store",
+    "DownloadCache": "data_storage.download_cache",
+    "AsyncDownloader": "data_storage.async_download",
+    "HttpCsvSource": "data_storage.async_download",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,148 @@
+import asyncio
+import inspect
+import urllib.parse
+import urllib.request
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable
+import pandas as pd
+from pandas import DataFrame, Series
+
+
+class HttpCsvSource:
+    '''
+    Источник данных, загружающий CSV (столбцы Date и Open) по HTTP.
+    Запрос: [base_url]/[organization]?start=[ISO]&interval=[interval]
+    '''
+    def __init__(self,
+                 base_url: str,
+                 timeout: float=30):
+        '''
+        Args:
+            base_url: Адрес сервера данных
+            timeout: Время ожидания ответа в секундах
+        '''
+        self.__base_url = base_url.rstrip("/")
+        self.__timeout = timeout
+
+    def __call__(self,
+                 org: str,
+                 start: datetime,
+                 interval: str) -> Series:
+        '''
+        Метод загрузки временного ряда с сервера
+
+        Args:
+            org: Название ценной бумаги
+            start: Начало рассматриваемого периода
+            interval: Интервал данных
+        Returns:
+            Временной ряд
+        '''
+        query = urllib.parse.urlencode({"start": start.isoformat(), "interval": interval})
+        url = f"{self.__base_url}/{urllib.parse.quote(org)}?{query}"
+        with urllib.request.urlopen(url, timeout=self.__timeout) as response:
+            data = pd.read_csv(response, index_col="Date", parse_dates=["Date"])
+        return data["Open"]
+
+
+class AsyncDownloader:
+    '''
+    Класс для одновременной загрузки многих ценных бумаг.
+    Число одновременных запросов ограничено, неудачные запросы
+    повторяются с экспоненциальной задержкой.
+    '''
+    def __init__(self,
+                 fetch: Callable[[str, datetime, str], Series],
+                 concurrency: int=8,
+                 retries: int=3,
+                 backoff: float=0.5):
+        '''
+        Args:
+            fetch: Источник данных fetch(org, start, interval) -> Series,
+            обычная функция (выполняется в пуле потоков) или корутина
+            concurrency: Максимальное число одновременных запросов
+            retries: Число повторов неудачного запроса
+            backoff: Задержка перед первым повтором в секундах
+        '''
+        self.__fetch = fetch
+        self.__concurrency = concurrency
+        self.__retries = retries
+        self.__backoff = backoff
+
+    async def _fetch_one(self,
+                         semaphore: asyncio.Semaphore,
+                         org: str,
+                         start: datetime,
+                         interval: str) -> tuple[str, Series|Exception]:
+        '''
+        Метод загрузки одной ценной бумаги с повторами
+
+        Args:
+            semaphore: Ограничитель числа одновременных запросов
+            org: Название ценной бумаги
+            start: Начало рассматриваемого периода
+            interval: Интервал данных
+        Returns:
+            Название бумаги и временной ряд (или ошибка последней попытки)
+        '''
+        async with semaphore:
+            for attempt in range(self.__retries + 1):
+                try:
+                    if inspect.iscoroutinefunction(self.__fetch):
+                        return org, await self.__fetch(org, start, interval)
+                    return org, await asyncio.to_thread(self.__fetch, org, start, interval)
+                except Exception as error:
+                    if attempt == self.__retries:
+                        return org, error
+                    await asyncio.sleep(self.__backoff * 2 ** attempt)
+
+    async def stream(self,
+                     orgs: list[str],
+                     start: datetime,
+                     interval: str) -> AsyncIterator[tuple[str, Series|Exception]]:
+        '''
+        Метод загрузки, возвращающий результаты по мере готовности
+
+        Args:
+            orgs: Названия ценных бумаг
+            start: Начало рассматриваемого периода
+            interval: Интервал данных
+        Returns:
+            Асинхронный итератор пар (бумага, временной ряд или ошибка)
+        '''
+        semaphore = asyncio.Semaphore(self.__concurrency)
+        tasks = [asyncio.ensure_future(self._fetch_one(semaphore, org, start, interval))
+                 for org in dict.fromkeys(orgs)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def download_many(self,
+                      orgs: list[str],
+                      period: timedelta,
+                      interval: str) -> DataFrame:
+        '''
+        Синхронная обертка для загрузки нескольких ценных бумаг
+
+        Args:
+            orgs: Названия ценных бумаг
+            period: Рассматриваемый период
+            interval: Интервал данных
+        Returns:
+            Таблица временных рядов, выровненных по общему индексу
+        '''
+        async def collect():
+            return [result async for result in self.stream(orgs, datetime.now() - period, interval)]
+
+        results = dict(asyncio.run(collect()))
+        failed = [org for org, result in results.items() if isinstance(result, Exception)]
+        if failed:
+            raise RuntimeError(f"Не удалось загрузить: {', '.join(failed)}") from results[failed[0]]
+        return DataFrame({org: results[org] for org in dict.fromkeys(orgs)})
+
+
+if __name__ == "__main__":
+    pass
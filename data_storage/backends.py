@@ -0,0 +1,348 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+class StorageBackend:
+    '''
+    Базовый класс формата хранения таблиц
+    '''
+    def __init__(self,
+                 path: str):
+        self._path = path
+
+    def save(self,
+             data: DataFrame,
+             sheet: str):
+        '''
+        Метод сохраняющий таблицу
+        Args:
+            data: Датафрейм для сохранения
+            sheet: Название листа, под которым сохраняется таблица
+        '''
+        raise NotImplementedError
+
+    def load(self,
+             sheet: str,
+             index_col: str) -> DataFrame:
+        '''
+        Метод выгружающий таблицу
+
+        Args:
+             sheet: название листа с которого будет взята таблица
+             index_col: название столбца индекса
+
+        Returns:
+            Таблица с временными рядами
+        '''
+        raise NotImplementedError
+
+    def save_many(self,
+                  sheets: dict[str, DataFrame]):
+        '''
+        Метод сохраняющий несколько таблиц
+
+        Args:
+            sheets: Таблицы с ключами - названиями листов
+        '''
+        for sheet, data in sheets.items():
+            self.save(data, sheet)
+
+
+class ExcelBackend(StorageBackend):
+    '''
+    Хранение таблиц в листах эксель файла. Запись и чтение потоковые
+    (режимы write_only и read_only openpyxl): при сохранении остальные
+    листы построчно копируются в новый файл, который затем заменяет
+    старый, поэтому время записи линейно по размеру книги, а несколько
+    листов записываются за один проход. Копируются только значения
+    и формулы, оформление ячеек не сохраняется.
+    '''
+    def save(self,
+             data: DataFrame,
+             sheet: str):
+        self.save_many({sheet: data})
+
+    def save_many(self,
+                  sheets: dict[str, DataFrame]):
+        openpyxl = _import_openpyxl()
+        for data in sheets.values():
+            dtypes = [data.index.dtype] + list(data.dtypes)
+            if any(isinstance(dtype, pd.DatetimeTZDtype) for dtype in dtypes):
+                raise ValueError("Эксель не поддерживает даты с часовым поясом, "
+                                 "уберите его перед сохранением.")
+
+        # Новая книга пишется рядом со старой и заменяет ее целиком,
+        # поэтому при ошибке записи старый файл не повреждается.
+        temp_path = self._path + ".tmp"
+        try:
+            workbook = openpyxl.Workbook(write_only=True)
+            written = set()
+            if os.path.exists(self._path):
+                source = openpyxl.load_workbook(self._path, read_only=True, keep_links=False)
+                try:
+                    # Листы остаются на своих местах, замененные пишутся заново.
+                    for name in source.sheetnames:
+                        worksheet = workbook.create_sheet(name)
+                        if name in sheets:
+                            self._write_sheet(worksheet, sheets[name])
+                            written.add(name)
+                        else:
+                            for row in source[name].iter_rows(values_only=True):
+                                worksheet.append(row)
+                finally:
+                    source.close()
+            for name, data in sheets.items():
+                if name not in written:
+                    self._write_sheet(workbook.create_sheet(name), data)
+            workbook.save(temp_path)
+            os.replace(temp_path, self._path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def load(self,
+             sheet: str,
+             index_col: str) -> DataFrame:
+        openpyxl = _import_openpyxl()
+
+        workbook = openpyxl.load_workbook(self._path, read_only=True, data_only=True,
+                                          keep_links=False)
+        try:
+            if sheet not in workbook.sheetnames:
+                raise KeyError(f"Лист {sheet} не найден.")
+            worksheet = workbook[sheet]
+            header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+            # Пустые ячейки в конце строки не читаются, поэтому строки
+            # дополняются до ширины заголовка (столбец из одних пропусков).
+            rows = worksheet.iter_rows(min_row=2, max_col=len(header), values_only=True)
+            data = DataFrame.from_records(list(rows), columns=list(header))
+        finally:
+            workbook.close()
+        # Столбец из одних пустых ячеек - пропуски, как у pandas.read_excel.
+        empty = [name for name in data.columns
+                 if data[name].dtype == object and data[name].isna().all()]
+        if empty:
+            data[empty] = data[empty].astype(float)
+        if index_col is not None and index_col in data.columns:
+            data = data.set_index(index_col)
+        return data
+
+    @staticmethod
+    def _write_sheet(worksheet,
+                     data: DataFrame):
+        '''
+        Метод построчной записи таблицы в лист (в том же виде, что DataFrame.to_excel:
+        первый столбец - индекс, пропуски - пустые ячейки)
+
+        Args:
+            worksheet: Лист книги в режиме write_only
+            data: Таблица
+        '''
+        worksheet.append([data.index.name] + list(data.columns))
+        cells = [_excel_cells(data.index)] + [_excel_cells(data[column]) for column in data.columns]
+        for row in zip(*cells):
+            worksheet.append(row)
+
+
+def _import_openpyxl():
+    '''
+    Функция импорта необязательной зависимости openpyxl
+
+    Returns:
+        Модуль openpyxl
+    '''
+    try:
+        import openpyxl
+    except ImportError as error:
+        raise ImportError("Для формата xlsx требуется пакет openpyxl.") from error
+    return openpyxl
+
+
+def _excel_cells(values: pd.Index|pd.Series) -> list:
+    '''
+    Функция перевода столбца в значения ячеек эксель (объекты Python)
+
+    Args:
+        values: Индекс или столбец таблицы
+    Returns:
+        Значения ячеек (None для пропусков)
+    '''
+    if pd.api.types.is_datetime64_dtype(values.dtype):
+        cells = pd.DatetimeIndex(values).to_pydatetime().astype(object)
+    else:
+        cells = np.asarray(values).astype(object)
+    cells[np.asarray(pd.isna(values))] = None
+    return cells.tolist()
+
+
+class ColumnarBackend(StorageBackend):
+    '''
+    Базовый класс колоночных форматов. Путь хранилища - каталог,
+    каждый лист хранится в отдельном файле, поэтому сохранение листа
+    не переписывает остальные. Индекс и типы столбцов сохраняются.
+    '''
+    extension = None
+
+    def _sheet_path(self,
+                    sheet: str) -> str:
+        '''
+        Метод получения пути к файлу листа
+
+        Args:
+            sheet: Название листа
+        Returns:
+            Путь к файлу листа
+        '''
+        return os.path.join(self._path, sheet + self.extension)
+
+    def save(self,
+             data: DataFrame,
+             sheet: str):
+        os.makedirs(self._path, exist_ok=True)
+        self._write(data, self._sheet_path(sheet))
+
+    def load(self,
+             sheet: str,
+             index_col: str) -> DataFrame:
+        data = self._read(self._sheet_path(sheet))
+        if index_col is not None and data.index.name != index_col and index_col in data.columns:
+            data = data.set_index(index_col)
+        return data
+
+    def _write(self,
+               data: DataFrame,
+               path: str):
+        raise NotImplementedError
+
+    def _read(self,
+              path: str) -> DataFrame:
+        raise NotImplementedError
+
+
+def _import_pyarrow(fmt: str):
+    '''
+    Функция импорта необязательной зависимости pyarrow
+
+    Args:
+        fmt: Название формата, для которого нужен pyarrow
+    Returns:
+        Модуль pyarrow
+    '''
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError(f"Для формата {fmt} требуется пакет pyarrow.") from error
+    return pyarrow
+
+
+class ParquetBackend(ColumnarBackend):
+    '''
+    Хранение листов в файлах Parquet
+    '''
+    extension = ".parquet"
+
+    def _write(self,
+               data: DataFrame,
+               path: str):
+        _import_pyarrow("Parquet")
+        data.to_parquet(path)
+
+    def _read(self,
+              path: str) -> DataFrame:
+        _import_pyarrow("Parquet")
+        return pd.read_parquet(path)
+
+
+class FeatherBackend(ColumnarBackend):
+    '''
+    Хранение листов в файлах Feather (Arrow IPC)
+    '''
+    extension = ".feather"
+
+    def _write(self,
+               data: DataFrame,
+               path: str):
+        pyarrow = _import_pyarrow("Feather")
+        from pyarrow import feather
+        # В отличие от DataFrame.to_feather сохраняет произвольный индекс.
+        feather.write_feather(pyarrow.Table.from_pandas(data), path)
+
+    def _read(self,
+              path: str) -> DataFrame:
+        _import_pyarrow("Feather")
+        from pyarrow import feather
+        return feather.read_table(path).to_pandas()
+
+
+class NpzBackend(ColumnarBackend):
+    '''
+    Хранение листов в архивах NumPy .npz (не требует pyarrow)
+    '''
+    extension = ".npz"
+
+    def _write(self,
+               data: DataFrame,
+               path: str):
+        index = data.index
+        meta = {"index_name": index.name,
+                "columns": [str(column) for column in data.columns],
+                "tz": None}
+        arrays = {}
+        if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+            meta["tz"] = str(index.tz)
+            index = index.tz_convert(None)
+        arrays["index"] = index.to_numpy()
+        if arrays["index"].dtype == object:
+            arrays["index"] = arrays["index"].astype(str)
+        for i, column in enumerate(data.columns):
+            values = data[column].to_numpy()
+            if values.dtype == object:
+                values = values.astype(str)
+            arrays[f"column_{i}"] = values
+        arrays["meta"] = np.array(json.dumps(meta))
+        np.savez(path, **arrays)
+
+    def _read(self,
+              path: str) -> DataFrame:
+        with np.load(path) as archive:
+            meta = json.loads(str(archive["meta"]))
+            index = pd.Index(archive["index"], name=meta["index_name"])
+            if meta["tz"] is not None:
+                index = index.tz_localize("UTC").tz_convert(meta["tz"])
+            columns = {column: archive[f"column_{i}"]
+                       for i, column in enumerate(meta["columns"])}
+        return DataFrame(columns, index=index)
+
+
+# Формат хранилища выбирается по расширению пути
+BACKENDS = {
+    ".xlsx": ExcelBackend,
+    ".xlsm": ExcelBackend,
+    ".parquet": ParquetBackend,
+    ".pq": ParquetBackend,
+    ".feather": FeatherBackend,
+    ".arrow": FeatherBackend,
+    ".npz": NpzBackend,
+}
+
+
+def backend_for_path(path: str) -> StorageBackend:
+    '''
+    Функция выбора формата хранения по расширению пути
+
+    Args:
+        path: Путь к хранилищу
+    Returns:
+        Объект формата хранения
+    '''
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in BACKENDS:
+        raise ValueError(f"Неподдерживаемый формат хранилища: {extension}")
+    return BACKENDS[extension](path)
+
+
+if __name__ == "__main__":
+    pass
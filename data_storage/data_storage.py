@@ -1,7 +1,7 @@
-import yfinance as yf
-import pandas as pd
-from pandas import DataFrame, Series, ExcelWriter
-from datetime import datetime, timedelta
+from pandas import DataFrame
+
+from data_storage.backends import backend_for_path
+
 
 class DataStorage:
     '''
@@ -9,27 +9,44 @@ class DataStorage:
     '''
     def __init__(self,
                  path: str):
+        '''
+        Args:
+            path: Путь к хранилищу. Формат выбирается по расширению:
+            .xlsx - эксель таблица, .parquet/.feather/.npz - каталог
+            с отдельным файлом на каждый лист
+        '''
         self.__path = path
+        self.__backend = backend_for_path(path)
 
 
     def save(self,
              data: DataFrame,
              sheet: str):
         '''
-        Метод сохраняющий временные ряды в эксель таблицу
+        Метод сохраняющий временные ряды в хранилище
         Args:
-            data: Датафрейм для сохранения в эксель
+            data: Датафрейм для сохранения
             sheet: Название листа в которой будет создана таблица
         '''
-        with ExcelWriter(self.__path, mode='a', if_sheet_exists='replace') as writer:
-            data.to_excel(writer, sheet_name=sheet)
+        self.__backend.save(data, sheet)
+
+
+    def save_many(self,
+                  sheets: dict[str, DataFrame]):
+        '''
+        Метод сохраняющий несколько таблиц за один проход
+        (эксель файл переписывается один раз, а не для каждого листа)
+        Args:
+            sheets: Таблицы с ключами - названиями листов
+        '''
+        self.__backend.save_many(sheets)
 
 
     def load(self,
              sheet: str,
              index_col: str) -> DataFrame:
         '''
-        Метод выгружающий данные из эксель таблицы
+        Метод выгружающий данные из хранилища
 
         Args:
              sheet: название листа с которого будет взята таблица
@@ -38,7 +55,7 @@ class DataStorage:
         Returns:
             Таблица с временными рядами
         '''
-        return pd.read_excel(self.__path, sheet_name=sheet, index_col=index_col)
+        return self.__backend.load(sheet, index_col)
 
 
 if __name__ == "__main__":
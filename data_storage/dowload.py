@@ -1,9 +1,22 @@
-import yfinance as yf
 from datetime import datetime, timedelta
 from pandas import Series
 
+from data_storage.download_cache import DownloadCache
+
 
 class Downloader:
+    def __init__(self,
+                 cache_path: str=None,
+                 expiry: timedelta=timedelta(minutes=15)):
+        """
+        Args:
+            cache_path: Каталог кэша загрузок (без кэша, если не задан)
+            expiry: Время, в течение которого кэш считается актуальным
+        """
+        self.cache = None
+        if cache_path is not None:
+            self.cache = DownloadCache(cache_path, fetch=self.fetch, expiry=expiry)
+
     def download(self,
                  org: str,
                  period: timedelta,
@@ -19,12 +32,53 @@ class Downloader:
         Returns:
             Временной ряд
         """
-        data = yf.download(tickers=org,
-                           start=(datetime.now()-period),
-                           interval=interval)
-        values = data["Open"].values
-        values = values.reshape(values.shape[0])
-        return Series(values, index=data.index)
+        return self.download_since(org, datetime.now() - period, interval)
+
+    def download_since(self,
+                       org: str,
+                       start: datetime,
+                       interval: str) -> Series:
+        """
+        Метод для загрузки данных начиная с момента start (через кэш, если он задан)
+
+        Args:
+            org: Название ценных бумаг для выгрузки
+            start: Начало рассматриваемого периода
+            interval: Интервал для загрузки данных
+
+        Returns:
+            Временной ряд
+        """
+        if self.cache is not None:
+            return self.cache.get(org, start, interval)
+        return self.fetch(org, start, interval)
+
+    def fetch(self,
+              org: str,
+              start: datetime,
+              interval: str) -> Series:
+        """
+        Метод для загрузки данных из интернета без кэша
+
+        Args:
+            org: Название ценных бумаг для выгрузки
+            start: Начало рассматриваемого периода
+            interval: Интервал для загрузки данных
+
+        Returns:
+            Временной ряд
+        """
+        import yfinance as yf
+        # yf.download собирает результаты в общем словаре модуля и не может
+        # вызываться из нескольких потоков (AsyncDownloader), история
+        # отдельного Ticker такого состояния не имеет.
+        data = yf.Ticker(org).history(start=start,
+                                      interval=interval)
+        index = data.index
+        if interval[-1] not in ("m", "h") and index.tz is not None:
+            # Дневные бары без часового пояса, как у yf.download.
+            index = index.tz_localize(None)
+        return Series(data["Open"].to_numpy(), index=index)
 
 
 if __name__ == "__main__":
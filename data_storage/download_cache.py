@@ -0,0 +1,146 @@
+import os
+import re
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from pandas import Series, Timestamp
+
+from data_storage.mmap_store import MemmapStore
+
+
+def _to_utc(moment: datetime) -> Timestamp:
+    '''
+    Функция перевода момента времени в UTC
+
+    Args:
+        moment: Момент времени (без часового пояса считается UTC,
+        как в MemmapStore: дневные бары yfinance приходят без пояса)
+    Returns:
+        Момент времени в UTC
+    '''
+    moment = Timestamp(moment)
+    if moment.tz is None:
+        return moment.tz_localize("UTC")
+    return moment.tz_convert("UTC")
+
+
+class DownloadCache:
+    '''
+    Локальный кэш загруженных временных рядов по ключу (бумага, интервал).
+    Уже загруженные бары хранятся в MemmapStore, из источника
+    запрашивается только недостающий хвост (или начало, если
+    запрошен более длинный период).
+    '''
+    def __init__(self,
+                 path: str,
+                 fetch: Callable[[str, datetime, str], Series],
+                 expiry: timedelta=timedelta(minutes=15)):
+        '''
+        Args:
+            path: Каталог кэша
+            fetch: Функция загрузки fetch(org, start, interval) -> Series
+            expiry: Время, в течение которого кэш считается актуальным
+        '''
+        self.__path = path
+        self.__store = MemmapStore(path)
+        self.__fetch = fetch
+        self.__expiry = expiry
+
+    @property
+    def expiry(self) -> timedelta:
+        '''
+        Свойство времени актуальности кэша
+
+        Returns:
+            Время, после которого запрашивается хвост ряда
+        '''
+        return self.__expiry
+
+    def _key(self,
+             org: str,
+             interval: str) -> str:
+        '''
+        Метод получения имени ряда в хранилище
+
+        Args:
+            org: Название ценной бумаги
+            interval: Интервал данных
+        Returns:
+            Имя ряда, безопасное для файловой системы
+        '''
+        return re.sub(r"[^\w.-]", "_", f"{org}_{interval}")
+
+    def _read_meta(self,
+                   key: str) -> dict:
+        '''
+        Метод чтения сведений о загрузке ряда
+
+        Args:
+            key: Имя ряда в хранилище
+        Returns:
+            Начало загруженного периода и время последней загрузки
+        '''
+        path = os.path.join(self.__path, key + ".fetch.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as file:
+            meta = json.load(file)
+        return {name: Timestamp(value) for name, value in meta.items()}
+
+    def _write_meta(self,
+                    key: str,
+                    start: Timestamp,
+                    fetched_at: Timestamp):
+        '''
+        Метод записи сведений о загрузке ряда
+
+        Args:
+            key: Имя ряда в хранилище
+            start: Начало загруженного периода
+            fetched_at: Время последней загрузки
+        '''
+        path = os.path.join(self.__path, key + ".fetch.json")
+        with open(path, "w") as file:
+            json.dump({"start": start.isoformat(), "fetched_at": fetched_at.isoformat()}, file)
+
+    def get(self,
+            org: str,
+            start: datetime,
+            interval: str) -> Series:
+        '''
+        Метод получения временного ряда начиная с start
+
+        Args:
+            org: Название ценной бумаги
+            start: Начало рассматриваемого периода
+            interval: Интервал данных
+        Returns:
+            Временной ряд
+        '''
+        key = self._key(org, interval)
+        start = _to_utc(start)
+        now = Timestamp(datetime.now(timezone.utc))
+        meta = self._read_meta(key)
+
+        if meta is None or start < meta["start"] or self.__store.size(key) == 0:
+            self.__store.save(key, self.__fetch(org, start.to_pydatetime(), interval))
+            self._write_meta(key, start, now)
+        elif now - meta["fetched_at"] > self.__expiry:
+            # Последний бар мог быть незавершенным, поэтому
+            # хвост запрашивается начиная с него и перезаписывается.
+            last = self.__store.last_timestamp(key)
+            tail = self.__fetch(org, last.to_pydatetime(), interval)
+            if len(tail):
+                first = _to_utc(tail.index[0])
+                kept = len(self.__store.load(key, end=first - Timestamp.resolution))
+                self.__store.truncate(key, kept)
+                self.__store.append(key, tail)
+            self._write_meta(key, meta["start"], now)
+
+        # Копия не зависит от файлов кэша, которые могут быть обрезаны
+        # при следующей загрузке.
+        return self.__store.load(key, start=start).copy()
+
+
+if __name__ == "__main__":
+    pass
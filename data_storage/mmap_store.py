@@ -0,0 +1,280 @@
+import os
+import json
+import numpy as np
+from typing import Iterator
+from pandas import DatetimeIndex, Series, Timestamp
+
+
+class MemmapStore:
+    '''
+    Хранилище временных рядов в файлах, отображаемых в память.
+    Для каждого ряда хранятся два файла: метки времени (int64, нс UTC)
+    и значения (float64). Точки только дописываются в конец файлов,
+    выборка по диапазону дат - бинарный поиск и срез без копирования.
+    '''
+    def __init__(self,
+                 path: str):
+        '''
+        Args:
+            path: Каталог хранилища
+        '''
+        self.__path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _files(self,
+               sheet: str) -> tuple[str, str, str]:
+        '''
+        Метод получения путей к файлам ряда
+
+        Args:
+            sheet: Название ряда
+        Returns:
+            Пути к файлам меток времени, значений и описания
+        '''
+        base = os.path.join(self.__path, sheet)
+        return base + ".time", base + ".value", base + ".json"
+
+    def sheets(self) -> list[str]:
+        '''
+        Метод получения списка сохраненных рядов
+
+        Returns:
+            Названия рядов
+        '''
+        return sorted(name[:-len(".time")] for name in os.listdir(self.__path)
+                      if name.endswith(".time"))
+
+    def size(self,
+             sheet: str) -> int:
+        '''
+        Метод получения числа точек ряда
+
+        Args:
+            sheet: Название ряда
+        Returns:
+            Число сохраненных точек
+        '''
+        time_file, value_file, _ = self._files(sheet)
+        if not os.path.exists(time_file):
+            return 0
+        # При обрыве записи файлы могут отличаться по длине,
+        # учитываются только полностью записанные точки.
+        return min(os.path.getsize(time_file), os.path.getsize(value_file)) // 8
+
+    def last_timestamp(self,
+                       sheet: str) -> Timestamp:
+        '''
+        Метод получения времени последней точки ряда
+
+        Args:
+            sheet: Название ряда
+        Returns:
+            Время последней точки или None, если ряд пуст
+        '''
+        size = self.size(sheet)
+        if size == 0:
+            return None
+        with open(self._files(sheet)[0], "rb") as file:
+            file.seek(8 * (size - 1))
+            last = np.frombuffer(file.read(8), dtype=np.int64)[0]
+        return Timestamp(int(last), unit="ns", tz="UTC")
+
+    def append(self,
+               sheet: str,
+               series: Series):
+        '''
+        Метод дописывания точек в конец ряда. Время работы зависит
+        только от числа новых точек, но не от длины истории.
+
+        Args:
+            sheet: Название ряда
+            series: Новые точки (индекс - время, строго позже сохраненных)
+        '''
+        index = DatetimeIndex(series.index)
+        self.append_arrays(sheet, self._to_utc_ns(index), series.values,
+                           tz=str(index.tz) if index.tz is not None else None,
+                           name=series.name)
+
+    def append_arrays(self,
+                      sheet: str,
+                      times: np.ndarray,
+                      values: np.ndarray,
+                      tz: str=None,
+                      name: str=None):
+        '''
+        Метод дописывания точек, заданных массивами, без создания Series
+
+        Args:
+            sheet: Название ряда
+            times: Метки времени (int64, нс UTC, строго позже сохраненных)
+            values: Значения
+            tz: Часовой пояс индекса (записывается только для нового ряда)
+            name: Название ряда (записывается только для нового ряда)
+        '''
+        times = np.asarray(times, dtype=np.int64)
+        if times.size and np.any(np.diff(times) <= 0):
+            raise ValueError("Метки времени должны строго возрастать.")
+        last = self.last_timestamp(sheet)
+        if times.size and last is not None and times[0] <= last.value:
+            raise ValueError("Новые точки должны быть позже сохраненных.")
+
+        time_file, value_file, meta_file = self._files(sheet)
+        if not os.path.exists(meta_file):
+            with open(meta_file, "w") as file:
+                json.dump({"tz": tz, "name": name}, file)
+        # Отбрасываются не до конца записанные точки.
+        self.truncate(sheet, self.size(sheet))
+        with open(time_file, "ab") as file:
+            file.write(times.tobytes())
+        with open(value_file, "ab") as file:
+            file.write(np.asarray(values, dtype=np.float64).tobytes())
+
+    def save(self,
+             sheet: str,
+             series: Series):
+        '''
+        Метод сохранения ряда с заменой сохраненных точек
+
+        Args:
+            sheet: Название ряда
+            series: Временной ряд
+        '''
+        self.delete(sheet)
+        self.append(sheet, series)
+
+    def truncate(self,
+                 sheet: str,
+                 size: int):
+        '''
+        Метод удаления точек с конца ряда
+
+        Args:
+            sheet: Название ряда
+            size: Число точек, которые нужно оставить
+        '''
+        size = min(size, self.size(sheet))
+        for file in self._files(sheet)[:2]:
+            if os.path.exists(file):
+                os.truncate(file, 8 * size)
+
+    def delete(self,
+               sheet: str):
+        '''
+        Метод удаления ряда
+
+        Args:
+            sheet: Название ряда
+        '''
+        for file in self._files(sheet):
+            if os.path.exists(file):
+                os.remove(file)
+
+    def load(self,
+             sheet: str,
+             start: Timestamp=None,
+             end: Timestamp=None) -> Series:
+        '''
+        Метод выгрузки ряда за диапазон дат [start, end]. Значения
+        возвращаются срезом отображенного в память файла без копирования,
+        поэтому время не зависит от длины сохраненной истории.
+
+        Args:
+            sheet: Название ряда
+            start: Начало диапазона (по умолчанию - с первой точки)
+            end: Конец диапазона (по умолчанию - до последней точки)
+        Returns:
+            Временной ряд, доступный только для чтения
+        '''
+        time_file, value_file, _ = self._files(sheet)
+        meta = self.meta(sheet)
+
+        size = self.size(sheet)
+        if size == 0:
+            times = np.empty(0, dtype=np.int64)
+            values = np.empty(0, dtype=np.float64)
+        else:
+            times = np.memmap(time_file, dtype=np.int64, mode="r", shape=(size,))
+            values = np.memmap(value_file, dtype=np.float64, mode="r", shape=(size,))
+
+        lo = 0 if start is None else np.searchsorted(times, self._timestamp_to_ns(start), "left")
+        hi = size if end is None else np.searchsorted(times, self._timestamp_to_ns(end), "right")
+
+        index = DatetimeIndex(np.asarray(times[lo:hi]).view("datetime64[ns]"), copy=False)
+        if meta["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        return Series(np.asarray(values[lo:hi]), index=index, name=meta["name"], copy=False)
+
+    def meta(self,
+             sheet: str) -> dict:
+        '''
+        Метод получения описания ряда
+
+        Args:
+            sheet: Название ряда
+        Returns:
+            Словарь с часовым поясом индекса (tz) и названием ряда (name)
+        '''
+        meta_file = self._files(sheet)[2]
+        if not os.path.exists(meta_file):
+            raise KeyError(f"Ряд {sheet} не найден.")
+        with open(meta_file) as file:
+            return json.load(file)
+
+    def iter_chunks(self,
+                    sheet: str,
+                    chunk_size: int) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        '''
+        Метод последовательного чтения ряда блоками фиксированной длины.
+        Каждый блок копируется из отображенного файла, поэтому в памяти
+        процесса одновременно находится не больше одного блока.
+
+        Args:
+            sheet: Название ряда
+            chunk_size: Число точек в блоке
+        Returns:
+            Итератор пар (метки времени int64 в нс UTC, значения float64)
+        '''
+        if chunk_size < 1:
+            raise ValueError("Недопустимая длина блока.")
+        self.meta(sheet)
+        size = self.size(sheet)
+        if size == 0:
+            return
+        time_file, value_file, _ = self._files(sheet)
+        times = np.memmap(time_file, dtype=np.int64, mode="r", shape=(size,))
+        values = np.memmap(value_file, dtype=np.float64, mode="r", shape=(size,))
+        for start in range(0, size, chunk_size):
+            yield np.array(times[start:start + chunk_size]), np.array(values[start:start + chunk_size])
+
+    @staticmethod
+    def _to_utc_ns(index: DatetimeIndex) -> np.ndarray:
+        '''
+        Метод перевода индекса в наносекунды UTC
+
+        Args:
+            index: Временной индекс
+        Returns:
+            Массив int64
+        '''
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        return np.asarray(index.to_numpy(dtype="datetime64[ns]")).view(np.int64)
+
+    @staticmethod
+    def _timestamp_to_ns(timestamp: Timestamp) -> int:
+        '''
+        Метод перевода момента времени в наносекунды UTC
+
+        Args:
+            timestamp: Момент времени (без часового пояса считается UTC)
+        Returns:
+            Число наносекунд
+        '''
+        timestamp = Timestamp(timestamp)
+        if timestamp.tz is not None:
+            timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+        return timestamp.as_unit("ns").value
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,128 @@
+"""
+Модуль тестирования одновременной загрузки на локальном сервере-заглушке.
+"""
+import asyncio
+import sys
+import threading
+import types
+import unittest
+import urllib.parse
+from unittest import mock
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pandas import DataFrame, Series, date_range
+from data_storage import AsyncDownloader, Downloader, HttpCsvSource
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Сервер-заглушка: отдает CSV с барами, первый запрос FLAKY завершается ошибкой.
+    """
+    failures = {"FLAKY": 1}
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        org = urllib.parse.unquote(url.path.strip("/"))
+        if org == "MISSING" or StubHandler.failures.get(org, 0) > 0:
+            StubHandler.failures[org] = StubHandler.failures.get(org, 0) - 1
+            self.send_response(500)
+            self.end_headers()
+            return
+        lines = ["Date,Open"] + [f"{day:%Y-%m-%d},{i + len(org)}"
+                                 for i, day in enumerate(date_range("2024-01-01", periods=5))]
+        body = "\n".join(lines).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncDownloader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.source = HttpCsvSource(f"http://127.0.0.1:{cls.server.server_address[1]}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_download_many_with_retry(self):
+        StubHandler.failures["FLAKY"] = 1
+        downloader = AsyncDownloader(self.source, concurrency=2, retries=2, backoff=0.01)
+        frame = downloader.download_many(["A", "BB", "FLAKY"], timedelta(days=30), "1d")
+        self.assertEqual(list(frame.columns), ["A", "BB", "FLAKY"])
+        self.assertEqual(frame["BB"].iloc[0], 2)
+        self.assertEqual(frame["FLAKY"].iloc[-1], 9)
+
+    def test_permanent_failure(self):
+        downloader = AsyncDownloader(self.source, retries=1, backoff=0.01)
+        with self.assertRaises(RuntimeError):
+            downloader.download_many(["A", "MISSING"], timedelta(days=30), "1d")
+
+    def test_concurrency_limit(self):
+        active = 0
+        peak = 0
+
+        async def fetch(org, start, interval):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return Series([1.0], index=date_range("2024-01-01", periods=1))
+
+        async def collect():
+            downloader = AsyncDownloader(fetch, concurrency=3)
+            return [org async for org, _ in downloader.stream(list("ABCDEFGH"), datetime.now(), "1d")]
+
+        orgs = asyncio.run(collect())
+        self.assertEqual(sorted(orgs), list("ABCDEFGH"))
+        self.assertEqual(peak, 3)
+
+
+class TestYfinanceSource(unittest.TestCase):
+    """
+    Загрузка через Downloader.fetch из нескольких потоков с модулем-заглушкой
+    yfinance: общий для модуля yf.download вызываться не должен.
+    """
+    def setUp(self):
+        orgs = ["A", "BB", "CCC"]
+        barrier = threading.Barrier(len(orgs), timeout=5)
+
+        class Ticker:
+            def __init__(self, org):
+                self.org = org
+
+            def history(self, start, interval):
+                # Все загрузки идут одновременно.
+                barrier.wait()
+                index = date_range("2024-01-01", periods=5, tz="America/New_York")
+                return DataFrame({"Open": [float(len(self.org))] * 5}, index=index)
+
+        def download(*args, **kwargs):
+            raise AssertionError("yf.download не потокобезопасен")
+
+        self.orgs = orgs
+        self.module = types.SimpleNamespace(Ticker=Ticker, download=download)
+
+    def test_concurrent_download(self):
+        with mock.patch.dict(sys.modules, {"yfinance": self.module}):
+            downloader = AsyncDownloader(Downloader().download_since, concurrency=3)
+            frame = downloader.download_many(self.orgs, timedelta(days=30), "1d")
+        self.assertEqual(list(frame.columns), self.orgs)
+        self.assertEqual(len(frame), 5)
+        self.assertIsNone(frame.index.tz)
+        for org in self.orgs:
+            self.assertTrue((frame[org] == len(org)).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Модуль тестирования форматов хранения временных рядов.
+"""
+import os
+import tempfile
+import unittest
+import importlib.util
+import numpy as np
+from pandas import DataFrame, date_range
+from pandas.testing import assert_frame_equal
+from data_storage import DataStorage
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+HAS_OPENPYXL = importlib.util.find_spec("openpyxl") is not None
+
+
+class TestDataStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        index = date_range("2024-01-01", periods=50, freq="h", tz="America/New_York", name="Date")
+        self.data = DataFrame({"Open": np.linspace(1, 2, 50),
+                               "Volume": np.arange(50, dtype=np.int64)}, index=index)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def roundtrip(self, name):
+        storage = DataStorage(os.path.join(self.directory.name, name))
+        storage.save(self.data, sheet="first")
+        storage.save(self.data * 2, sheet="second")
+        assert_frame_equal(storage.load(sheet="first", index_col="Date"), self.data,
+                           check_freq=False)
+        assert_frame_equal(storage.load(sheet="second", index_col="Date"), self.data * 2,
+                           check_freq=False)
+
+    def test_npz(self):
+        self.roundtrip("Storage.npz")
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow не установлен")
+    def test_parquet(self):
+        self.roundtrip("Storage.parquet")
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow не установлен")
+    def test_feather(self):
+        self.roundtrip("Storage.feather")
+
+    @unittest.skipUnless(HAS_OPENPYXL, "openpyxl не установлен")
+    def test_excel(self):
+        storage = DataStorage(os.path.join(self.directory.name, "Storage.xlsx"))
+        data = self.data.tz_localize(None)
+        storage.save(data, sheet="first")
+        storage.save(data * 2, sheet="second")
+        loaded = storage.load(sheet="first", index_col="Date")
+        np.testing.assert_allclose(loaded["Open"], data["Open"])
+        self.assertTrue(loaded.index.equals(data.index))
+
+    @unittest.skipUnless(HAS_OPENPYXL, "openpyxl не установлен")
+    def test_excel_save_many_keeps_other_sheets(self):
+        import openpyxl
+        import pandas as pd
+
+        path = os.path.join(self.directory.name, "Storage.xlsx")
+        storage = DataStorage(path)
+        data = self.data.tz_localize(None)
+        data.iloc[3, 0] = np.nan
+        storage.save_many({"first": data, "second": data * 2, "third": data * 3})
+        storage.save(data * 4, sheet="second")
+        storage.save(data * 5, sheet="fourth")
+
+        self.assertEqual(openpyxl.load_workbook(path, read_only=True).sheetnames,
+                         ["first", "second", "third", "fourth"])
+        self.assertEqual(os.listdir(self.directory.name), ["Storage.xlsx"])
+        for sheet, factor in (("first", 1), ("second", 4), ("third", 3), ("fourth", 5)):
+            loaded = storage.load(sheet=sheet, index_col="Date")
+            assert_frame_equal(loaded, data * factor, check_freq=False, check_index_type=False)
+            assert_frame_equal(loaded, pd.read_excel(path, sheet_name=sheet, index_col="Date"))
+
+        with self.assertRaises(KeyError):
+            storage.load(sheet="missing", index_col="Date")
+        with self.assertRaises(ValueError):
+            storage.save(self.data, sheet="first")
+        assert_frame_equal(storage.load(sheet="first", index_col="Date"), data,
+                           check_freq=False, check_index_type=False)
+
+    @unittest.skipUnless(HAS_OPENPYXL, "openpyxl не установлен")
+    def test_excel_trailing_empty_column(self):
+        import pandas as pd
+
+        path = os.path.join(self.directory.name, "Storage.xlsx")
+        storage = DataStorage(path)
+        data = self.data.tz_localize(None)[["Open"]]
+        data["Autocor"] = np.nan
+        storage.save(data, sheet="first")
+        loaded = storage.load(sheet="first", index_col="Date")
+        assert_frame_equal(loaded, data, check_freq=False, check_index_type=False)
+        assert_frame_equal(loaded, pd.read_excel(path, sheet_name="first", index_col="Date"))
+
+    def test_save_many_columnar(self):
+        storage = DataStorage(os.path.join(self.directory.name, "Storage.npz"))
+        storage.save_many({"first": self.data, "second": self.data * 2})
+        assert_frame_equal(storage.load(sheet="second", index_col="Date"), self.data * 2,
+                           check_freq=False)
+
+    def test_unknown_extension(self):
+        with self.assertRaises(ValueError):
+            DataStorage("Storage.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Модуль тестирования кэша загрузок на локальном источнике данных.
+"""
+import os
+import time
+import tempfile
+import unittest
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from pandas import Series, Timestamp, date_range
+from data_storage import DownloadCache
+
+
+class FakeSource:
+    """
+    Локальный источник баров: часовые бары до момента now.
+    """
+    def __init__(self):
+        self.now = Timestamp("2024-03-01 12:00", tz="UTC")
+        self.requests = []
+
+    def __call__(self, org, start, interval):
+        self.requests.append(Timestamp(start))
+        index = date_range(Timestamp("2024-01-01", tz="UTC"), self.now, freq="h")
+        index = index[index >= Timestamp(start)]
+        values = np.asarray(index.asi8 // 10**9, dtype=float)
+        # Значение последнего бара меняется, пока бар не завершен.
+        values[-1:] += self.now.minute
+        return Series(values, index=index)
+
+
+class TestDownloadCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = FakeSource()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_serves_from_cache_until_expiry(self):
+        cache = DownloadCache(self.directory.name, self.source, expiry=timedelta(days=1))
+        start = datetime(2024, 2, 1, tzinfo=timezone.utc)
+        first = cache.get("AAPL", start, "1h")
+        second = cache.get("AAPL", start, "1h")
+        self.assertEqual(len(self.source.requests), 1)
+        self.assertTrue(first.equals(second))
+
+    def test_fetches_only_tail(self):
+        cache = DownloadCache(self.directory.name, self.source, expiry=timedelta(0))
+        start = datetime(2024, 2, 1, tzinfo=timezone.utc)
+        cache.get("AAPL", start, "1h")
+        self.source.now += timedelta(hours=5, minutes=30)
+        series = cache.get("AAPL", start, "1h")
+        self.assertEqual(self.source.requests[-1], Timestamp("2024-03-01 12:00", tz="UTC"))
+        expected = self.source("AAPL", start, "1h")
+        self.assertTrue(series.index.equals(expected.index))
+        np.testing.assert_array_equal(series.values, expected.values)
+
+    def test_refetches_longer_period(self):
+        cache = DownloadCache(self.directory.name, self.source, expiry=timedelta(days=1))
+        cache.get("AAPL", datetime(2024, 2, 1, tzinfo=timezone.utc), "1h")
+        series = cache.get("AAPL", datetime(2024, 1, 15, tzinfo=timezone.utc), "1h")
+        self.assertEqual(len(self.source.requests), 2)
+        self.assertEqual(series.index[0], Timestamp("2024-01-15", tz="UTC"))
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "нужен time.tzset")
+    def test_naive_daily_bars_in_local_timezone(self):
+        previous = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        time.tzset()
+        try:
+            def daily(org, start, interval):
+                index = date_range("2024-01-01", "2024-01-20", freq="D")
+                # Как yfinance: начало периода переводится в UTC.
+                index = index[index >= Timestamp(start).tz_convert(None)]
+                return Series(np.arange(index.size, dtype=float), index=index)
+
+            cache = DownloadCache(self.directory.name, daily, expiry=timedelta(0))
+            series = cache.get("AAPL", datetime(2024, 1, 1), "1d")
+            self.assertEqual(len(series), 20)
+            self.assertIsNone(series.index.tz)
+            self.assertEqual(series.index[0], Timestamp("2024-01-01"))
+            # Хвост после истечения срока перезаписывает последний бар.
+            self.assertEqual(len(cache.get("AAPL", datetime(2024, 1, 1), "1d")), 20)
+        finally:
+            if previous is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = previous
+            time.tzset()
+
+
+if __name__ == "__main__":
+    unittest.main()
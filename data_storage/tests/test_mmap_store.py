@@ -0,0 +1,50 @@
+"""
+Модуль тестирования хранилища рядов, отображаемых в память.
+"""
+import tempfile
+import unittest
+import numpy as np
+from pandas import Series, Timestamp, date_range
+from data_storage import MemmapStore
+
+
+class TestMemmapStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = MemmapStore(self.directory.name)
+        index = date_range("2024-01-01", periods=100, freq="h", tz="America/New_York")
+        self.series = Series(np.arange(100, dtype=float), index=index, name="Open")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append_and_load(self):
+        self.store.append("AAPL", self.series.iloc[:60])
+        self.store.append("AAPL", self.series.iloc[60:])
+        loaded = self.store.load("AAPL")
+        self.assertEqual(self.store.size("AAPL"), 100)
+        self.assertTrue(loaded.index.equals(self.series.index))
+        np.testing.assert_array_equal(loaded.values, self.series.values)
+        self.assertEqual(self.store.sheets(), ["AAPL"])
+
+    def test_range_is_zero_copy_slice(self):
+        self.store.save("AAPL", self.series)
+        start, end = self.series.index[10], self.series.index[19]
+        loaded = self.store.load("AAPL", start=start, end=end)
+        self.assertEqual(len(loaded), 10)
+        self.assertEqual(loaded.index[0], start)
+        self.assertEqual(loaded.index[-1], end)
+        base = loaded.values
+        while isinstance(base, np.ndarray) and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        self.assertEqual(len(self.store.load("AAPL", start=Timestamp("2030-01-01"))), 0)
+
+    def test_rejects_old_points(self):
+        self.store.append("AAPL", self.series.iloc[50:])
+        with self.assertRaises(ValueError):
+            self.store.append("AAPL", self.series.iloc[:10])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1,10 @@
-from host.host import Host
+from lazy_exports import lazy_exports
+
+_EXPORTS = {
+    "Host": "host.host",
+    "BatchRunner": "host.batch",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,108 @@
+import time
+
+from host.host import Host
+from ui.report import ReportInterface
+
+
+class BatchRunner:
+    '''
+    Неинтерактивный запуск Host: выполняет сценарий команд или
+    строит отчет по списку ценных бумаг. Графики сохраняются в файлы
+    (бэкенд Agg) несколькими процессами, в конце печатается
+    число построенных графиков в секунду.
+    '''
+    def __init__(self,
+                 output_dir: str="reports",
+                 fmt: str="png",
+                 workers: int=1,
+                 storage_path: str="Storage.xlsx",
+                 cache_path: str=None):
+        '''
+        Args:
+            output_dir: Каталог для изображений
+            fmt: Формат изображений (png или svg)
+            workers: Число процессов для вычислений и отрисовки
+            storage_path: Путь к хранилищу
+            cache_path: Каталог кэша загрузок
+        '''
+        self.__output_dir = output_dir
+        self.__fmt = fmt
+        self.__workers = workers
+        self.__storage_path = storage_path
+        self.__cache_path = cache_path
+
+    def run_commands(self,
+                     commands: list[str]) -> dict:
+        '''
+        Метод выполнения списка команд интерактивного режима
+
+        Args:
+            commands: Команды (по одной в строке, # - комментарий)
+        Returns:
+            Пути к изображениям, число графиков, время и графики в секунду
+        '''
+        started = time.perf_counter()
+        ui = ReportInterface(commands, self.__output_dir, self.__fmt, self.__workers)
+        host = Host(workers=self.__workers,
+                    storage_path=self.__storage_path,
+                    cache_path=self.__cache_path)
+        host.ui = ui
+        try:
+            host.start()
+        finally:
+            paths = ui.close()
+        elapsed = time.perf_counter() - started
+
+        report = {"paths": paths,
+                  "charts": len(paths),
+                  "seconds": elapsed,
+                  "charts_per_second": len(paths) / elapsed if elapsed > 0 else 0.0}
+        print(f"Построено графиков: {report['charts']} за {elapsed:.2f} с "
+              f"({report['charts_per_second']:.2f} графиков/с)")
+        return report
+
+    def run_script(self,
+                   path: str) -> dict:
+        '''
+        Метод выполнения файла со сценарием команд
+
+        Args:
+            path: Путь к файлу сценария
+        Returns:
+            Отчет о выполнении (см. run_commands)
+        '''
+        with open(path, encoding="utf-8") as file:
+            return self.run_commands(file.read().splitlines())
+
+    def run_tickers(self,
+                    orgs: list[str],
+                    period: str,
+                    interval: str,
+                    window: str,
+                    columns: tuple[str]=("Open", "Movavg", "Diff", "Autocor")) -> dict:
+        '''
+        Метод построения отчета по списку ценных бумаг: все бумаги
+        загружаются одной командой download, затем для каждой
+        строится свой рисунок
+
+        Args:
+            orgs: Названия ценных бумаг
+            period: Рассматриваемый период
+            interval: Интервал данных
+            window: Окно скользящего среднего
+            columns: Столбцы рисунка каждой бумаги
+        Returns:
+            Отчет о выполнении (см. run_commands)
+        '''
+        orgs = list(dict.fromkeys(orgs))
+        commands = [f"download {','.join(orgs)} {period} {interval} {window}"]
+        if len(orgs) == 1:
+            commands.append("draw " + " ".join(columns))
+        else:
+            commands.extend("draw " + " ".join(f"{column}_{org}" for column in columns)
+                            for org in orgs)
+        return self.run_commands(commands)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+# pandas и time_series импортируются при первом вычислении столбца.
+if TYPE_CHECKING:
+    from pandas import DataFrame, Index, Series
+    from time_series import TimeSeriesAnalyser
+
+
+# Граф зависимостей столбцов: исходные столбцы и параметры.
+DEPENDENCIES = {
+    "Open": ((), ()),
+    "Movavg": (("Open",), ("window",)),
+    "Ema": (("Open",), ("window",)),
+    "Std": (("Open",), ("window",)),
+    "Min": (("Open",), ("window",)),
+    "Max": (("Open",), ("window",)),
+    "Diff": (("Movavg",), ("interval",)),
+    "Autocor": (("Movavg",), ()),
+}
+
+
+class LazyFrame:
+    '''
+    Ленивая таблица производных столбцов временного ряда.
+    Столбец вычисляется при первом обращении (команды draw и save),
+    запоминается и пересчитывается, только если изменились его
+    входные данные: ряд, интервал или окно (свои или исходных столбцов).
+    '''
+    def __init__(self,
+                 series: Series,
+                 interval: timedelta,
+                 window: int|timedelta,
+                 profiler=None):
+        '''
+        Args:
+            series: Временной ряд (столбец Open)
+            interval: Интервал для дифференцирования
+            window: Окно скользящего среднего и скользящих статистик
+            profiler: Профилировщик с методом span(name) (без замеров, если не задан)
+        '''
+        self.__series = series
+        self.__version = 0
+        self.__params = {"interval": interval, "window": window}
+        self.__profiler = profiler
+        self.__source = None
+        self.__memo = {}
+
+    @property
+    def columns(self) -> list[str]:
+        '''
+        Свойство названий доступных столбцов
+
+        Returns:
+            Названия столбцов
+        '''
+        return list(DEPENDENCIES)
+
+    @property
+    def index(self) -> Index:
+        '''
+        Свойство индекса таблицы
+
+        Returns:
+            Индекс временного ряда
+        '''
+        return self.__series.index
+
+    @property
+    def computed(self) -> list[str]:
+        '''
+        Свойство столбцов, вычисленных для текущих входных данных
+
+        Returns:
+            Названия столбцов
+        '''
+        return [name for name, (key, _) in self.__memo.items() if key == self._key(name)]
+
+    def __len__(self) -> int:
+        return self.__series.size
+
+    def __contains__(self, name: str) -> bool:
+        return name in DEPENDENCIES
+
+    def update(self,
+               series: Series=None,
+               interval: timedelta=None,
+               window: int|timedelta=None):
+        '''
+        Метод изменения входных данных. Запомненные столбцы, зависящие
+        от измененных данных, будут пересчитаны при следующем обращении
+
+        Args:
+            series: Новый временной ряд (не меняется, если равен текущему)
+            interval: Новый интервал
+            window: Новое окно
+        '''
+        if series is not None and not (series is self.__series or series.equals(self.__series)):
+            self.__series = series
+            self.__version += 1
+            self.__source = None
+        if interval is not None:
+            self.__params["interval"] = interval
+        if window is not None:
+            self.__params["window"] = window
+
+    def __getitem__(self, name: str) -> Series:
+        '''
+        Метод получения столбца (вычисляется при первом обращении)
+
+        Args:
+            name: Название столбца
+        Returns:
+            Столбец
+        '''
+        if name not in DEPENDENCIES:
+            raise KeyError(name)
+        key = self._key(name)
+        memo = self.__memo.get(name)
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        # Исходные столбцы вычисляются отдельно, чтобы не попадать в замер этого.
+        for parent in DEPENDENCIES[name][0]:
+            self[parent]
+        with self._span(name.lower()):
+            value = self._compute(name)
+        self.__memo[name] = (key, value)
+        return value
+
+    def to_frame(self,
+                 columns: list[str]=None) -> DataFrame:
+        '''
+        Метод сборки таблицы из столбцов (вычисляются только указанные)
+
+        Args:
+            columns: Названия столбцов (по умолчанию все, неизвестные пропускаются)
+        Returns:
+            Таблица столбцов
+        '''
+        from pandas import DataFrame
+
+        if columns is None:
+            columns = self.columns
+        return DataFrame({name: self[name] for name in columns if name in DEPENDENCIES},
+                         index=self.index)
+
+    def _key(self,
+             name: str) -> tuple:
+        '''
+        Метод получения ключа входных данных столбца
+
+        Args:
+            name: Название столбца
+        Returns:
+            Значения параметров столбца и ключи исходных столбцов
+        '''
+        parents, params = DEPENDENCIES[name]
+        if not parents:
+            return (self.__version,)
+        return (tuple(self.__params[param] for param in params),
+                tuple(self._key(parent) for parent in parents))
+
+    def _source(self) -> TimeSeriesAnalyser:
+        '''
+        Метод получения анализатора исходного ряда. Он общий для скользящих
+        статистик, поэтому начала окон вычисляются один раз
+
+        Returns:
+            Анализатор временного ряда
+        '''
+        from time_series import TimeSeriesAnalyser
+
+        if self.__source is None:
+            self.__source = TimeSeriesAnalyser(self.__series)
+        return self.__source
+
+    def _compute(self,
+                 name: str) -> Series:
+        '''
+        Метод вычисления столбца
+
+        Args:
+            name: Название столбца
+        Returns:
+            Столбец
+        '''
+        from time_series import TimeSeriesAnalyser
+
+        window = self.__params["window"]
+        if name == "Open":
+            return self.__series
+        if name == "Movavg":
+            return self._source().calc_movavg(window)
+        if name == "Ema":
+            return self._source().calc_ema(window)
+        if name == "Std":
+            return self._source().calc_rolling_std(window)
+        if name == "Min":
+            return self._source().calc_rolling_min(window)
+        if name == "Max":
+            return self._source().calc_rolling_max(window)
+        analyser = TimeSeriesAnalyser(self["Movavg"], self.__params["interval"])
+        if name == "Diff":
+            return analyser.differentiate()
+        return analyser.calc_autocor()
+
+    def _span(self,
+              name: str):
+        '''
+        Метод получения контекста замера вычисления столбца
+
+        Args:
+            name: Название этапа
+        Returns:
+            Контекстный менеджер
+        '''
+        if self.__profiler is None:
+            return nullcontext()
+        return self.__profiler.span(name)
+
+
+if __name__ == "__main__":
+    pass
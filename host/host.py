@@ -1,16 +1,82 @@
-from datetime import timedelta
-from pandas import Series, DataFrame
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 from ui import UserInterface
-from data_storage import DataStorage, Downloader
-from time_series import TimeSeriesAnalyser
+from host.instrumentation import Profiler
+from host.columns import LazyFrame
+
+# Тяжелые модули (pandas, yfinance, matplotlib) импортируются
+# при первом выполнении команды, которой они нужны.
+if TYPE_CHECKING:
+    from pandas import Series, DataFrame
+    from data_storage import DataStorage, Downloader, AsyncDownloader
+    from time_series import StreamingAnalyser, ResamplePyramid
 
 
 class Host:
-    def __init__(self):
-        self.ui = UserInterface()
-        self.storage = DataStorage("Storage.xlsx")
-        self.downloader = Downloader()
+    def __init__(self,
+                 workers: int=1,
+                 storage_path: str="Storage.xlsx",
+                 cache_path: str=None,
+                 refresh: float=5.0):
+        """
+        Args:
+            workers: Число процессов для обработки нескольких временных рядов
+            storage_path: Путь к хранилищу (формат выбирается по расширению)
+            cache_path: Каталог кэша загрузок (без кэша, если не задан)
+            refresh: Период опроса новых данных в режиме live (секунды)
+        """
+        self.profiler = Profiler()
+        self.ui = UserInterface(profiler=self.profiler)
+        self.workers = workers
+        self.refresh = refresh
+        self.pyramid = None
+        self.__storage_path = storage_path
+        self.__cache_path = cache_path
+        self.__storage = None
+        self.__downloader = None
+        self.__async_downloader = None
+
+    @property
+    def storage(self) -> DataStorage:
+        '''
+        Свойство хранилища (создается при первом обращении)
+
+        Returns:
+            Хранилище таблиц
+        '''
+        if self.__storage is None:
+            from data_storage import DataStorage
+            self.__storage = DataStorage(self.__storage_path)
+        return self.__storage
+
+    @property
+    def downloader(self) -> Downloader:
+        '''
+        Свойство загрузчика (создается при первом обращении)
+
+        Returns:
+            Загрузчик временных рядов
+        '''
+        if self.__downloader is None:
+            from data_storage import Downloader
+            self.__downloader = Downloader(cache_path=self.__cache_path)
+        return self.__downloader
+
+    @property
+    def async_downloader(self) -> AsyncDownloader:
+        '''
+        Свойство загрузчика нескольких ценных бумаг (создается при первом обращении)
+
+        Returns:
+            Асинхронный загрузчик
+        '''
+        if self.__async_downloader is None:
+            from data_storage import AsyncDownloader
+            self.__async_downloader = AsyncDownloader(fetch=self.downloader.download_since)
+        return self.__async_downloader
 
     def is_exit(self,
                 command: list[str]) -> bool:
@@ -72,6 +138,59 @@ class Host:
         '''
         return len(command) > 1 and command[0] == "draw"
 
+    def is_live(self,
+                command: list[str]) -> bool:
+        '''
+        Метод проверяющий что введена команда live
+
+        Args:
+            command: Список аргументов
+        Returns:
+            Правильность формата bool
+        '''
+        return len(command) > 5 and command[0] == "live"
+
+    def is_resample(self,
+                    command: list[str]) -> bool:
+        '''
+        Метод проверяющий что введена команда resample
+
+        Args:
+            command: Список аргументов
+        Returns:
+            Правильность формата bool
+        '''
+        return len(command) == 2 and command[0] == "resample"
+
+    def is_stats(self,
+                 command: list[str]) -> bool:
+        '''
+        Метод проверяющий что введена команда stats
+
+        Args:
+            command: Список аргументов
+        Returns:
+            Правильность формата bool
+        '''
+        if len(command) == 0 or command[0] != "stats":
+            return False
+        return (len(command) == 1 or
+                (len(command) == 2 and command[1] in ("on", "off", "clear")) or
+                (len(command) == 3 and command[1:] == ["on", "memory"]) or
+                (len(command) == 3 and command[1] == "dump"))
+
+    def is_workers(self,
+                   command: list[str]) -> bool:
+        '''
+        Метод проверяющий что введена команда workers
+
+        Args:
+            command: Список аргументов
+        Returns:
+            Правильность формата bool
+        '''
+        return len(command) == 2 and command[0] == "workers" and command[1].isdigit()
+
     def is_help(self,
                 command: list[str]) -> bool:
         '''
@@ -115,26 +234,263 @@ class Host:
                 raise RuntimeError("Неверный формат периода.")
         return timedelta(seconds=seconds)
 
-    def _calculate_dataframe(self,
-                             series: Series,
-                             interval: str,
-                             window: str) -> DataFrame:
+    def _calculate_frame(self,
+                         series: Series,
+                         interval: str,
+                         window: str,
+                         frame: LazyFrame|DataFrame=None) -> LazyFrame:
         """
-        Метод для вычисления временных рядов
+        Метод подготовки ленивой таблицы временных рядов. Столбцы
+        (Movavg, Diff, Autocor, Ema, Std, Min, Max) вычисляются только
+        при обращении командами draw и save
 
         Args:
             series: Временной ряд
             interval: Интервал для дифференцирования
+            window: Окно скользящего среднего и скользящих статистик
+            frame: Текущая таблица: если она ленивая, запомненные столбцы
+            с неизменными входными данными не пересчитываются
+        Returns:
+            Ленивая таблица временных рядов
+        """
+        interval = self._str_to_timedelta(interval)
+        window = self._str_to_timedelta(window)
+        if isinstance(frame, LazyFrame):
+            frame.update(series=series, interval=interval, window=window)
+            return frame
+        return LazyFrame(series, interval, window, profiler=self.profiler)
+
+    @staticmethod
+    def _materialize(df: LazyFrame|DataFrame,
+                     columns: list[str]=None) -> DataFrame:
+        """
+        Метод получения обычной таблицы из текущей
+
+        Args:
+            df: Текущая таблица
+            columns: Нужные столбцы ленивой таблицы (по умолчанию все)
+        Returns:
+            Таблица (для ленивой - только с вычисленными нужными столбцами)
+        """
+        if isinstance(df, LazyFrame):
+            return df.to_frame(columns)
+        return df
+
+    def _calculate_batch_dataframe(self,
+                                   frame: DataFrame,
+                                   interval: str,
+                                   window: str) -> DataFrame:
+        """
+        Метод для вычисления временных рядов нескольких ценных бумаг
+
+        Args:
+            frame: Таблица временных рядов (по столбцу на ценную бумагу)
+            interval: Интервал для дифференцирования
             window: окно для автокорреляции
         Returns:
-            Таблица временных рядов
+            Таблица временных рядов со столбцами вида Movavg_[organization]
+        """
+        from pandas import DataFrame
+        from time_series import ParallelAnalyser
+
+        analyser = ParallelAnalyser(workers=self.workers)
+        results = analyser.analyse(frame,
+                                   self._str_to_timedelta(interval),
+                                   self._str_to_timedelta(window))
+
+        columns = {}
+        for org in frame.columns:
+            columns[f"Open_{org}"] = frame[org]
+            for name, result in results.items():
+                columns[f"{name}_{org}"] = result[org]
+        return DataFrame(columns)
+
+    def _stream_rows(self,
+                     series: Series,
+                     movavg: StreamingAnalyser,
+                     diff: StreamingAnalyser) -> DataFrame:
+        """
+        Метод потокового вычисления строк Open, Movavg и Diff для новых точек
+
+        Args:
+            series: Новые точки временного ряда
+            movavg: Потоковый анализатор исходного ряда
+            diff: Потоковый анализатор скользящего среднего
+        Returns:
+            Таблица новых строк
+        """
+        from pandas import DataFrame
+
+        rows = {"Open": [], "Movavg": [], "Diff": []}
+        for timestamp, value in series.items():
+            movavg.append(timestamp, value)
+            diff.append(timestamp, movavg.movavg)
+            rows["Open"].append(value)
+            rows["Movavg"].append(movavg.movavg)
+            rows["Diff"].append(diff.diff)
+        return DataFrame(rows, index=series.index, dtype=float)
+
+    def _live(self,
+              org: str,
+              period: str,
+              interval: str,
+              window: str,
+              columns: list[str]) -> DataFrame:
+        """
+        Метод отрисовки графиков, дополняемых новыми данными.
+        Новые точки обрабатываются потоково, на график добавляются
+        только они, поэтому обновление не зависит от длины истории.
+
+        Args:
+            org: Название ценной бумаги
+            period: Рассматриваемый период
+            interval: Интервал данных
+            window: Окно скользящего среднего
+            columns: Столбцы для отрисовки (Open, Movavg, Diff)
+        Returns:
+            Таблица всех обработанных строк
+        """
+        import pandas as pd
+        from time_series import StreamingAnalyser
+
+        step = self._str_to_timedelta(interval)
+        movavg = StreamingAnalyser(self._str_to_timedelta(window), step)
+        diff = StreamingAnalyser(1, step)
+
+        series = self.downloader.download_since(org, datetime.now() - self._str_to_timedelta(period), interval)
+        frames = [self._stream_rows(series, movavg, diff)]
+        if len(series) == 0 or not self.ui.start_live_plot(frames[0], columns):
+            return frames[0]
+
+        last = series.index[-1]
+        while self.ui.is_live_plot_open():
+            self.ui.wait(self.refresh)
+            tail = self.downloader.download_since(org, last.to_pydatetime(), interval)
+            # Незавершенный последний бар уже отрисован, добавляются только новые
+            tail = tail[tail.index > last]
+            if len(tail) and self.ui.is_live_plot_open():
+                frames.append(self._stream_rows(tail, movavg, diff))
+                self.ui.update_live_plot(frames[-1])
+                last = tail.index[-1]
+        return pd.concat(frames)
+
+    def _build_pyramid(self,
+                       series: Series) -> ResamplePyramid:
+        """
+        Метод построения пирамиды агрегатов временного ряда.
+        Уровни мельче шага ряда повторяли бы исходные точки,
+        поэтому пирамида начинается с уровня не мельче шага
+
+        Args:
+            series: Временной ряд
+        Returns:
+            Пирамида агрегатов
+        """
+        from pandas import NaT, Timedelta
+        from time_series import ResamplePyramid
+
+        with self.profiler.span("pyramid"):
+            levels = ResamplePyramid().levels
+            steps = series.dropna().index.to_series().diff()
+            step = steps[steps > Timedelta(0)].min()
+            if step is not NaT:
+                levels = tuple(level for level in levels if level >= step) or levels[-1:]
+            return ResamplePyramid(levels).build(series)
+
+    def _pyramid_sheets(self,
+                        sheet: str) -> dict[str, DataFrame]:
+        """
+        Метод получения уровней пирамиды для сохранения рядом с таблицей
+
+        Args:
+            sheet: Название листа таблицы
+        Returns:
+            Таблицы уровней с ключами - названиями листов [sheet]_[уровень]
+        """
+        from time_series import ResamplePyramid
+
+        frames = self.pyramid.to_frames()
+        default = ResamplePyramid()
+        # Уровни, которых нет в пирамиде, могли остаться от прежнего
+        # сохранения другого ряда, поэтому они заменяются пустыми.
+        for level, label in zip(default.levels, default.labels):
+            if label not in frames:
+                frames[label] = ResamplePyramid((level,)).level(level)
+        return {f"{sheet}_{label}": frame for label, frame in frames.items()}
+
+    def _load_pyramid(self,
+                      sheet: str) -> ResamplePyramid:
+        """
+        Метод загрузки уровней пирамиды, сохраненных рядом с таблицей
+
+        Args:
+            sheet: Название листа таблицы
+        Returns:
+            Пирамида агрегатов или None, если уровни не сохранялись
+        """
+        from time_series import ResamplePyramid
+
+        # Сохраняются только уровни не мельче шага ряда, остальные пустые.
+        pyramid = ResamplePyramid()
+        levels, frames = [], {}
+        for level, label in zip(pyramid.levels, pyramid.labels):
+            try:
+                frame = self.storage.load(sheet=f"{sheet}_{label}", index_col="Date")
+            except (KeyError, ValueError, OSError):
+                continue
+            if len(frame):
+                frames[label] = frame
+                levels.append(level)
+        if not levels:
+            return None
+        return ResamplePyramid.from_frames(frames, tuple(levels))
+
+    def _resample(self,
+                  df: LazyFrame|DataFrame,
+                  interval: str) -> DataFrame:
+        """
+        Метод получения баров OHLC с указанным интервалом из пирамиды.
+        Если пирамиды нет, она строится по столбцу Open текущей таблицы.
+
+        Args:
+            df: Текущая таблица
+            interval: Интервал баров
+        Returns:
+            Таблица баров (Open, High, Low, Close, Mean, Count)
         """
-        analyser = TimeSeriesAnalyser(series, self._str_to_timedelta(interval))
-        movavg = analyser.calc_movavg(self._str_to_timedelta(window))
-        analyser = TimeSeriesAnalyser(movavg, self._str_to_timedelta(interval))
-        diff = analyser.differentiate()
-        autocor = analyser.calc_autocor()
-        return DataFrame({"Open": series, "Movavg": movavg, "Diff": diff, "Autocor": autocor})
+        if self.pyramid is None:
+            if df is None or "Open" not in df.columns:
+                print("Нет данных для агрегации: загрузите ряд со столбцом Open.")
+                return df
+            self.pyramid = self._build_pyramid(df["Open"])
+        try:
+            return self.pyramid.view(self._str_to_timedelta(interval))
+        except ValueError as error:
+            print(error)
+            return df
+
+    def _stats(self,
+               args: list[str]):
+        """
+        Метод команды stats: вывод сводки по этапам, включение
+        и выключение замеров, сохранение этапов в файл
+
+        Args:
+            args: Аргументы команды (пусто, on, on memory, off, clear, dump [file])
+        """
+        if len(args) == 0:
+            if not self.profiler.enabled and not self.profiler.spans:
+                print("Замеры выключены, включите командой stats on.")
+            else:
+                print(self.profiler.report())
+        elif args[0] == "on":
+            self.profiler.enable(memory=args[1:] == ["memory"])
+        elif args[0] == "off":
+            self.profiler.disable()
+        elif args[0] == "clear":
+            self.profiler.clear()
+        elif args[0] == "dump":
+            self.profiler.dump(args[1])
 
     def start(self):
         df = None
@@ -143,22 +499,61 @@ class Host:
             command = self.ui.get_command()
             if self.is_exit(command):
                 break
-            elif self.is_load(command):
-                df = self.storage.load(sheet=command[1], index_col="Date")
-                print(df)
-            elif self.is_save(command):
-                self.storage.save(df, sheet=command[1])
-            elif self.is_download(command):
-                series = self.downloader.download(org=command[1],
-                                                  period=self._str_to_timedelta(command[2]),
-                                                  interval=command[3])
-                df = self._calculate_dataframe(series=series,
-                                               interval=command[3],
-                                               window=command[4])
-            elif self.is_draw(command):
-                self.ui.get_plot(df, command[1:])
-            elif self.is_help(command):
-                self.ui.get_help()
+            elif self.is_stats(command):
+                self._stats(command[1:])
+                continue
+
+            with self.profiler.span(command[0] if command else ""):
+                if self.is_load(command):
+                    with self.profiler.span("storage"):
+                        df = self.storage.load(sheet=command[1], index_col="Date")
+                        self.pyramid = self._load_pyramid(command[1])
+                    print(df)
+                elif self.is_save(command):
+                    with self.profiler.span("storage"):
+                        sheets = {command[1]: self._materialize(df)}
+                        if self.pyramid is not None:
+                            sheets.update(self._pyramid_sheets(command[1]))
+                        self.storage.save_many(sheets)
+                elif self.is_download(command):
+                    orgs = command[1].split(",")
+                    if len(orgs) == 1:
+                        with self.profiler.span("network"):
+                            series = self.downloader.download(org=command[1],
+                                                              period=self._str_to_timedelta(command[2]),
+                                                              interval=command[3])
+                        df = self._calculate_frame(series=series,
+                                                   interval=command[3],
+                                                   window=command[4],
+                                                   frame=df)
+                        self.pyramid = self._build_pyramid(series)
+                    else:
+                        with self.profiler.span("network"):
+                            frame = self.async_downloader.download_many(orgs=orgs,
+                                                                        period=self._str_to_timedelta(command[2]),
+                                                                        interval=command[3])
+                        with self.profiler.span("calculate"):
+                            df = self._calculate_batch_dataframe(frame=frame,
+                                                                 interval=command[3],
+                                                                 window=command[4])
+                        self.pyramid = None
+                elif self.is_draw(command):
+                    self.ui.get_plot(self._materialize(df, command[1:]), command[1:])
+                elif self.is_live(command):
+                    df = self._live(org=command[1],
+                                    period=command[2],
+                                    interval=command[3],
+                                    window=command[4],
+                                    columns=command[5:])
+                    self.pyramid = None
+                elif self.is_resample(command):
+                    with self.profiler.span("resample"):
+                        df = self._resample(df, command[1])
+                    print(df)
+                elif self.is_workers(command):
+                    self.workers = max(int(command[1]), 1)
+                elif self.is_help(command):
+                    self.ui.get_help()
 
 
 if __name__ == "__main__":
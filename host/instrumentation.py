@@ -0,0 +1,208 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:
+    # Модуль resource есть только на Unix, без него RSS не записывается.
+    resource = None
+
+
+# Общий пустой контекст: при выключенных замерах span не создает объектов.
+_NULL_SPAN = nullcontext()
+
+
+def _max_rss_mb() -> float:
+    '''
+    Функция получения пикового RSS процесса
+
+    Returns:
+        Пиковый RSS в мегабайтах (None, если недоступен)
+    '''
+    if resource is None:
+        return None
+    # На Linux ru_maxrss в килобайтах.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Profiler:
+    '''
+    Замеры времени и памяти этапов выполнения команд.
+    Этапы вкладываются друг в друга, имя вложенного этапа
+    содержит путь через "/" (например, "download/network").
+    Выключенный профилировщик почти не влияет на скорость.
+    '''
+    def __init__(self,
+                 enabled: bool=False,
+                 memory: bool=False):
+        '''
+        Args:
+            enabled: Включены ли замеры
+            memory: Замерять ли пиковую память через tracemalloc
+        '''
+        self.__enabled = False
+        self.__memory = False
+        self.__stack = []
+        self.__spans = []
+        if enabled:
+            self.enable(memory)
+
+    @property
+    def enabled(self) -> bool:
+        '''
+        Свойство включенности замеров
+
+        Returns:
+            True, если замеры включены
+        '''
+        return self.__enabled
+
+    @property
+    def spans(self) -> list[dict]:
+        '''
+        Свойство записанных этапов
+
+        Returns:
+            Список этапов в порядке завершения
+        '''
+        return list(self.__spans)
+
+    def enable(self,
+               memory: bool=False):
+        '''
+        Метод включения замеров
+
+        Args:
+            memory: Замерять ли пиковую память (замедляет выполнение)
+        '''
+        self.__enabled = True
+        if memory and not self.__memory:
+            tracemalloc.start()
+        elif not memory and self.__memory:
+            tracemalloc.stop()
+        self.__memory = memory
+
+    def disable(self):
+        '''
+        Метод выключения замеров
+        '''
+        if self.__memory:
+            tracemalloc.stop()
+        self.__enabled = False
+        self.__memory = False
+
+    def clear(self):
+        '''
+        Метод удаления записанных этапов
+        '''
+        self.__spans.clear()
+
+    def span(self,
+             name: str):
+        '''
+        Метод замера этапа: with profiler.span("download"): ...
+
+        Args:
+            name: Название этапа
+        Returns:
+            Контекстный менеджер
+        '''
+        if not self.__enabled:
+            return _NULL_SPAN
+        return self._record(name)
+
+    @contextmanager
+    def _record(self,
+                name: str):
+        '''
+        Контекстный менеджер записи одного этапа
+
+        Args:
+            name: Название этапа
+        '''
+        memory = self.__memory and tracemalloc.is_tracing()
+        record = {"name": "/".join([span["name"] for span in self.__stack[-1:]] + [name]),
+                  "depth": len(self.__stack),
+                  "start": time.time()}
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Пик внешнего этапа сохраняется до сброса счетчика.
+            if self.__stack:
+                self.__stack[-1]["_peak"] = max(self.__stack[-1]["_peak"], peak)
+            tracemalloc.reset_peak()
+            record["_current"] = current
+            record["_peak"] = current
+        self.__stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record["seconds"] = time.perf_counter() - started
+            self.__stack.pop()
+            if memory:
+                peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+                record["peak_mb"] = (peak - record.pop("_current")) / 2**20
+                if self.__stack:
+                    self.__stack[-1]["_peak"] = max(self.__stack[-1]["_peak"], peak)
+                tracemalloc.reset_peak()
+            record["max_rss_mb"] = _max_rss_mb()
+            self.__spans.append(record)
+
+    def summary(self) -> list[dict]:
+        '''
+        Метод сводки по этапам
+
+        Returns:
+            Для каждого этапа: число вызовов, суммарное, среднее
+            и максимальное время, наибольшая пиковая память
+        '''
+        stages = {}
+        for span in self.__spans:
+            stage = stages.setdefault(span["name"], {"name": span["name"], "calls": 0,
+                                                     "total": 0.0, "max": 0.0, "peak_mb": None})
+            stage["calls"] += 1
+            stage["total"] += span["seconds"]
+            stage["max"] = max(stage["max"], span["seconds"])
+            if span.get("peak_mb") is not None:
+                stage["peak_mb"] = max(stage["peak_mb"] or 0.0, span["peak_mb"])
+        for stage in stages.values():
+            stage["mean"] = stage["total"] / stage["calls"]
+        return sorted(stages.values(), key=lambda stage: stage["name"])
+
+    def report(self) -> str:
+        '''
+        Метод форматирования сводки по этапам в таблицу
+
+        Returns:
+            Текст таблицы
+        '''
+        lines = [f"{'stage':<32}{'calls':>7}{'total, s':>11}{'mean, ms':>11}"
+                 f"{'max, ms':>11}{'peak, MB':>10}"]
+        for stage in self.summary():
+            depth = stage["name"].count("/")
+            name = "  " * depth + stage["name"].rsplit("/", 1)[-1]
+            peak = "-" if stage["peak_mb"] is None else f"{stage['peak_mb']:.1f}"
+            lines.append(f"{name:<32}{stage['calls']:>7}{stage['total']:>11.3f}"
+                         f"{stage['mean'] * 1000:>11.1f}{stage['max'] * 1000:>11.1f}{peak:>10}")
+        rss = _max_rss_mb()
+        if rss is not None:
+            lines.append(f"max RSS: {rss:.1f} MB")
+        return "\n".join(lines)
+
+    def dump(self,
+             path: str):
+        '''
+        Метод сохранения этапов в файл JSON Lines (по этапу на строку)
+
+        Args:
+            path: Путь к файлу (дописывается в конец)
+        '''
+        with open(path, "a", encoding="utf-8") as file:
+            for span in self.__spans:
+                file.write(json.dumps(span, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,92 @@
+"""
+Модуль тестирования пакетного режима.
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from datetime import timedelta
+from pandas import DataFrame, date_range
+from data_storage import DataStorage
+from host import BatchRunner, Host
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage_path = os.path.join(self.directory.name, "storage.npz")
+        index = date_range("2024-01-01", periods=500, freq="h", name="Date")
+        values = np.cumsum(np.random.default_rng(5).normal(size=index.size))
+        DataStorage(self.storage_path).save(DataFrame({"Open": values, "Diff": np.gradient(values)},
+                                                      index=index), sheet="data")
+        self.output_dir = os.path.join(self.directory.name, "reports")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_script(self, workers, fmt):
+        runner = BatchRunner(output_dir=self.output_dir, fmt=fmt, workers=workers,
+                             storage_path=self.storage_path)
+        return runner.run_commands(["# отчет", "load data", "draw Open Diff",
+                                    "draw Open", "draw Close"])
+
+    def test_script_renders_files(self):
+        report = self.run_script(workers=1, fmt="png")
+        self.assertEqual(report["charts"], 2)
+        self.assertGreater(report["charts_per_second"], 0)
+        for path in report["paths"]:
+            self.assertTrue(path.endswith(".png"))
+            self.assertGreater(os.path.getsize(path), 0)
+
+    def test_parallel_svg(self):
+        report = self.run_script(workers=2, fmt="svg")
+        self.assertEqual(sorted(os.listdir(self.output_dir)),
+                         sorted(os.path.basename(path) for path in report["paths"]))
+        self.assertEqual(report["charts"], 2)
+
+    def test_resample_saves_pyramid_with_sheet(self):
+        runner = BatchRunner(output_dir=self.output_dir, storage_path=self.storage_path)
+        report = runner.run_commands(["load data", "resample 1h", "draw Close Mean", "save copy",
+                                      "load copy", "resample 1d"])
+        self.assertEqual(report["charts"], 1)
+        # Уровни мельче часового шага ряда сохраняются пустыми.
+        storage = DataStorage(self.storage_path)
+        for label, saved in (("1m", False), ("5m", False), ("1h", True), ("1d", True)):
+            level = storage.load(f"copy_{label}", index_col="Date")
+            self.assertEqual(len(level) > 0, saved)
+        hours = storage.load("copy_1h", index_col="Date")
+        self.assertEqual(hours["Count"].sum(), 500)
+        self.assertTrue((hours["Count"] == 1).all())
+
+    def test_pyramid_of_daily_series(self):
+        index = date_range("2024-01-01", periods=40, freq="D", name="Date")
+        DataStorage(self.storage_path).save(DataFrame({"Open": np.arange(40.0)}, index=index),
+                                            sheet="days")
+        runner = BatchRunner(output_dir=self.output_dir, storage_path=self.storage_path)
+        report = runner.run_commands(["load days", "resample 2d", "save days_copy",
+                                      "load days_copy", "resample 1d", "draw Count"])
+        self.assertEqual(report["charts"], 1)
+        storage = DataStorage(self.storage_path)
+        for label in ("1m", "5m", "1h"):
+            self.assertEqual(len(storage.load(f"days_copy_{label}", index_col="Date")), 0)
+        self.assertEqual(len(storage.load("days_copy_1d", index_col="Date")), 40)
+
+    def test_resave_coarser_series_replaces_stale_levels(self):
+        storage = DataStorage(self.storage_path)
+        minutes = date_range("2024-01-01", periods=600, freq="min", name="Date")
+        hours = date_range("2024-02-01", periods=100, freq="h", name="Date")
+        storage.save(DataFrame({"Open": np.ones(minutes.size)}, index=minutes), sheet="minutes")
+        storage.save(DataFrame({"Open": np.full(hours.size, 999.0)}, index=hours), sheet="hours")
+        runner = BatchRunner(output_dir=self.output_dir, storage_path=self.storage_path)
+        runner.run_commands(["load minutes", "resample 5m", "save AAPL",
+                             "load hours", "resample 1h", "save AAPL"])
+
+        pyramid = Host(storage_path=self.storage_path)._load_pyramid("AAPL")
+        self.assertEqual(pyramid.labels, ["1h", "1d"])
+        with self.assertRaises(ValueError):
+            pyramid.view(timedelta(minutes=5))
+        self.assertTrue((pyramid.view(timedelta(hours=1))["Open"] == 999.0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Модуль тестирования ленивой таблицы производных столбцов.
+"""
+import unittest
+import numpy as np
+from pandas import Series, date_range
+from datetime import timedelta
+from host import Host
+from host.columns import LazyFrame
+from host.instrumentation import Profiler
+from time_series import TimeSeriesAnalyser
+
+
+class TestLazyFrame(unittest.TestCase):
+    def setUp(self):
+        index = date_range("2024-01-01", periods=300, freq="h", name="Date")
+        values = np.cumsum(np.random.default_rng(2).normal(size=index.size)) + 100
+        self.series = Series(values, index=index, name="Open")
+        self.profiler = Profiler(enabled=True)
+        self.frame = LazyFrame(self.series, timedelta(hours=1), timedelta(hours=5),
+                               profiler=self.profiler)
+
+    def calls(self, name):
+        return sum(span["name"] == name for span in self.profiler.spans)
+
+    def test_computes_only_requested_columns(self):
+        table = self.frame.to_frame(["Open", "Movavg", "Close"])
+        self.assertEqual(list(table.columns), ["Open", "Movavg"])
+        self.assertEqual(sorted(self.frame.computed), ["Movavg", "Open"])
+        self.assertEqual(self.calls("autocor"), 0)
+
+    def test_memoizes_and_recomputes_on_input_change(self):
+        movavg = self.frame["Movavg"]
+        diff = self.frame["Diff"]
+        self.assertIs(self.frame["Diff"], diff)
+        self.assertEqual(self.calls("movavg"), 1)
+
+        self.frame.update(interval=timedelta(minutes=30))
+        self.assertIsNot(self.frame["Diff"], diff)
+        self.assertIs(self.frame["Movavg"], movavg)
+        self.assertEqual(self.calls("movavg"), 1)
+
+        self.frame.update(series=self.series.copy())
+        self.assertIs(self.frame["Movavg"], movavg)
+
+        self.frame.update(window=timedelta(hours=10))
+        self.assertEqual(self.frame.computed, ["Open"])
+        self.frame["Autocor"]
+        self.assertEqual(self.calls("movavg"), 2)
+
+        self.frame.update(series=self.series * 2)
+        self.assertEqual(self.frame.computed, [])
+
+    def test_matches_eager_analysis(self):
+        table = self.frame.to_frame()
+        movavg = TimeSeriesAnalyser(self.series).calc_movavg(timedelta(hours=5))
+        diff = TimeSeriesAnalyser(movavg, timedelta(hours=1)).differentiate()
+        self.assertEqual(list(table.columns),
+                         ["Open", "Movavg", "Ema", "Std", "Min", "Max", "Diff", "Autocor"])
+        np.testing.assert_array_equal(table["Movavg"].values, movavg.values)
+        np.testing.assert_array_equal(table["Diff"].values[:-1], diff.values)
+        self.assertTrue(np.isnan(table["Diff"].values[-1]))
+
+    def test_host_reuses_frame(self):
+        host = Host()
+        frame = host._calculate_frame(self.series, "1h", "5h")
+        frame["Movavg"]
+        self.assertIs(host._calculate_frame(self.series.copy(), "1h", "5h", frame), frame)
+        self.assertIn("Movavg", frame.computed)
+        self.assertEqual(list(host._materialize(frame, ["Open"]).columns), ["Open"])
+        with self.assertRaises(KeyError):
+            frame["Close"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Модуль тестирования замеров этапов команд.
+"""
+import os
+import json
+import tempfile
+import unittest
+import numpy as np
+from host.instrumentation import Profiler
+
+
+class TestProfiler(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        profiler = Profiler()
+        first, second = profiler.span("download"), profiler.span("draw")
+        self.assertIs(first, second)
+        with first:
+            pass
+        self.assertEqual(profiler.spans, [])
+
+    def test_nested_spans(self):
+        profiler = Profiler(enabled=True)
+        for _ in range(2):
+            with profiler.span("download"):
+                with profiler.span("network"):
+                    pass
+                with profiler.span("calculate"):
+                    pass
+        summary = {stage["name"]: stage for stage in profiler.summary()}
+        self.assertEqual(list(summary), ["download", "download/calculate", "download/network"])
+        self.assertEqual(summary["download"]["calls"], 2)
+        self.assertGreaterEqual(summary["download"]["total"],
+                                summary["download/network"]["total"] +
+                                summary["download/calculate"]["total"])
+        self.assertIn("network", profiler.report())
+
+    def test_memory_peak_propagates_to_parent(self):
+        profiler = Profiler(enabled=True, memory=True)
+        try:
+            with profiler.span("download"):
+                with profiler.span("calculate"):
+                    data = np.ones(2**20)
+                    del data
+                with profiler.span("network"):
+                    pass
+        finally:
+            profiler.disable()
+        peaks = {span["name"]: span["peak_mb"] for span in profiler.spans}
+        self.assertGreaterEqual(peaks["download/calculate"], 7.9)
+        self.assertLess(peaks["download/network"], 1.0)
+        self.assertGreaterEqual(peaks["download"], peaks["download/calculate"])
+
+    def test_dump_json_lines(self):
+        profiler = Profiler(enabled=True)
+        with profiler.span("save"):
+            pass
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spans.jsonl")
+            profiler.dump(path)
+            with open(path) as file:
+                spans = [json.loads(line) for line in file]
+        self.assertEqual([span["name"] for span in spans], ["save"])
+        self.assertIn("seconds", spans[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
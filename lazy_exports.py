@@ -0,0 +1,33 @@
+import sys
+from importlib import import_module
+from typing import Callable
+
+
+def lazy_exports(package: str,
+                 exports: dict[str, str]) -> tuple[Callable, Callable]:
+    '''
+    Функция создания ленивого импорта для пакета. Подмодули импортируются
+    при первом обращении к имени (PEP 562), поэтому импорт пакета
+    не загружает тяжелые зависимости
+
+    Args:
+        package: Название пакета (__name__)
+        exports: Экспортируемые имена и модули, в которых они определены
+    Returns:
+        Функции __getattr__ и __dir__ модуля пакета
+    '''
+    def __getattr__(name: str):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(exports[name]), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+if __name__ == "__main__":
+    pass
@@ -1,4 +1,35 @@
+import argparse
+
 from host import Host
 
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Анализ временных рядов ценных бумаг.")
+    parser.add_argument("--script", help="файл со сценарием команд (пакетный режим)")
+    parser.add_argument("--tickers", help="ценные бумаги через запятую (пакетный режим)")
+    parser.add_argument("--period", default="1mo", help="рассматриваемый период для --tickers")
+    parser.add_argument("--interval", default="1h", help="интервал данных для --tickers")
+    parser.add_argument("--window", default="1d", help="окно скользящего среднего для --tickers")
+    parser.add_argument("--output", default="reports", help="каталог для изображений")
+    parser.add_argument("--format", default="png", choices=["png", "svg"], help="формат изображений")
+    parser.add_argument("--workers", type=int, default=1, help="число процессов")
+    parser.add_argument("--storage", default="Storage.xlsx", help="путь к хранилищу")
+    parser.add_argument("--cache", default=None, help="каталог кэша загрузок")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    Host().start()
+    args = parse_args()
+    if args.script is None and args.tickers is None:
+        Host(workers=args.workers, storage_path=args.storage, cache_path=args.cache).start()
+    else:
+        from host import BatchRunner
+        runner = BatchRunner(output_dir=args.output,
+                             fmt=args.format,
+                             workers=args.workers,
+                             storage_path=args.storage,
+                             cache_path=args.cache)
+        if args.script is not None:
+            runner.run_script(args.script)
+        if args.tickers is not None:
+            runner.run_tickers(args.tickers.split(","), args.period, args.interval, args.window)
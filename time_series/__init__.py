@@ -1 +1,14 @@
-from time_series.time_series.analysis import TimeSeriesAnalyser
+from lazy_exports import lazy_exports
+
+_EXPORTS = {
+    "TimeSeriesAnalyser": "time_series.time_series.analysis",
+    "StreamingAnalyser": "time_series.time_series.streaming",
+    "BatchAnalyser": "time_series.time_series.batch",
+    "ParallelAnalyser": "time_series.time_series.parallel",
+    "ResamplePyramid": "time_series.time_series.resample",
+    "ChunkedAnalyser": "time_series.time_series.chunked",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
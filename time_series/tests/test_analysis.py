@@ -3,7 +3,8 @@
 """
 import unittest
 import numpy as np
-from pandas import Series
+from numpy.lib.stride_tricks import sliding_window_view
+from pandas import DatetimeIndex, Series, date_range
 from datetime import timedelta, datetime
 from time_series import TimeSeriesAnalyser
 
@@ -34,6 +35,24 @@ class TestStockAnalyser(unittest.TestCase):
         dataframe = self.stock_analyser.find_extremes()
         self.assertEqual(len(dataframe), 0)
 
+    def test_find_local_extremes_plateau(self):
+        data = Series([1, 3, 3, 3, 2, 2, 5, 0],
+                      index=date_range("2024-01-01", periods=8, freq="D"))
+        dataframe = TimeSeriesAnalyser(data).find_extremes()
+        self.assertEqual(list(dataframe["Type"]), ["Max", "Min", "Max"])
+        self.assertEqual(list(dataframe.index), [data.index[2], data.index[4], data.index[6]])
+
+    def test_find_local_extremes_filters(self):
+        data = Series([0, 5, 4, 4.5, 1, 3, 2.8, 6, 0],
+                      index=date_range("2024-01-01", periods=9, freq="D"))
+        analyser = TimeSeriesAnalyser(data)
+        dataframe = analyser.find_extremes(min_prominence=1)
+        self.assertEqual(list(dataframe["Extreme"]), [5, 1, 6])
+        dataframe = analyser.find_extremes(min_distance=3)
+        self.assertEqual(list(dataframe[dataframe["Type"] == "Max"]["Extreme"]), [5, 6])
+        dataframe = analyser.find_extremes(min_distance=timedelta(days=3))
+        self.assertEqual(list(dataframe[dataframe["Type"] == "Max"]["Extreme"]), [5, 6])
+
     def test_differentiate(self):
         series = self.stock_analyser.differentiate()
         self.assertEqual(np.sum(series), 8)
@@ -42,14 +61,89 @@ class TestStockAnalyser(unittest.TestCase):
         series = self.stock_analyser.calc_movavg(window=4)
         self.assertEqual(series.iloc[4], 3.5)
 
+    def test_calc_movavg_int_matches_naive(self):
+        rng = np.random.default_rng(0)
+        data = Series(rng.normal(100, 5, 500),
+                      index=date_range("2024-01-01", periods=500, freq="min"))
+        analyser = TimeSeriesAnalyser(data)
+        for window in (1, 2, 7, 500, 1000):
+            expected = [np.average(data.values[max(0, i - window + 1):i + 1])
+                        for i in range(data.size)]
+            series = analyser.calc_movavg(window=window)
+            np.testing.assert_allclose(series.values, expected, rtol=1e-12)
+
+    def test_calc_movavg_int_large_input(self):
+        # Длинный ряд: префиксные суммы не должны терять точность
+        # по сравнению с прямым усреднением каждого окна.
+        size, window = 1_600_000, 50
+        data = Series(np.random.default_rng(0).normal(size=size) + 1e3,
+                      index=date_range("2024-01-01", periods=size, freq="min"))
+        series = TimeSeriesAnalyser(data, timedelta(minutes=1)).calc_movavg(window=window)
+        values = data.to_numpy()
+        expected = np.empty(size)
+        expected[:window - 1] = np.cumsum(values[:window - 1]) / np.arange(1, window)
+        expected[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+        np.testing.assert_allclose(series.values, expected, rtol=1e-12)
+
     def test_calc_movarg_timedelta(self):
         data = self.stock_analyser.calc_movavg(window=timedelta(days=3))
         self.assertEqual(data.iloc[4], 3.5)
 
+    def test_calc_movavg_timedelta_irregular_index(self):
+        # Рабочие дни без выходных и праздников, внутри дня - часовые бары.
+        days = date_range("2024-01-01", "2024-03-01", freq="B")
+        days = days.drop([days[0], days[10], days[11], days[25]])
+        index = DatetimeIndex([day + timedelta(hours=h) for day in days for h in (10, 11, 12, 15)])
+        data = Series(np.random.default_rng(1).normal(50, 3, index.size), index=index)
+        analyser = TimeSeriesAnalyser(data)
+        for window in (timedelta(0), timedelta(hours=2), timedelta(days=1),
+                       timedelta(days=3), timedelta(days=365 * 1000)):
+            expected = []
+            for i in range(data.size):
+                j = i
+                while j >= 0 and data.index[i] - data.index[j] <= window:
+                    j -= 1
+                expected.append(np.average(data.values[j + 1:i + 1]))
+            series = analyser.calc_movavg(window=window)
+            np.testing.assert_allclose(series.values, expected, rtol=1e-12)
+
     def test_calc_autocor(self):
         series = self.stock_analyser.calc_autocor()
         self.assertTrue(1 - series.iloc[4] < 1e12)
 
+    def test_calc_autocor_exact_matches_naive(self):
+        rng = np.random.default_rng(2)
+        values = np.cumsum(rng.normal(size=300)) + 100
+        data = Series(values, index=date_range("2024-01-01", periods=300, freq="h"))
+        expected = []
+        for i in range(values.size - 1):
+            x = values[i:]
+            y = values[:values.size - i]
+            expected.append((np.average(x*y) - np.average(x)*np.average(y)) /
+                            (np.std(x)*np.std(y)))
+        analyser = TimeSeriesAnalyser(data)
+        series = analyser.calc_autocor()
+        np.testing.assert_allclose(series.values, expected, rtol=1e-7, atol=1e-9)
+        series = analyser.calc_autocor(max_lag=20)
+        self.assertEqual(len(series), 21)
+        np.testing.assert_allclose(series.values, expected[:21], rtol=1e-9)
+
+    def test_calc_autocor_fft(self):
+        values = np.random.default_rng(3).normal(size=200)
+        data = Series(values, index=date_range("2024-01-01", periods=200, freq="D"))
+        centered = values - values.mean()
+        expected = [np.sum(centered[i:] * centered[:200 - i]) / np.sum(centered**2)
+                    for i in range(11)]
+        series = TimeSeriesAnalyser(data).calc_autocor(max_lag=10, method="fft")
+        np.testing.assert_allclose(series.values, expected, atol=1e-12)
+        self.assertEqual(series.index[-1], data.index[10])
+
+    def test_calc_autocor_invalid_args(self):
+        with self.assertRaises(ValueError):
+            self.stock_analyser.calc_autocor(max_lag=8)
+        with self.assertRaises(ValueError):
+            self.stock_analyser.calc_autocor(method="unknown")
+
 if __name__ == "__main__":
     unittest.main()
 
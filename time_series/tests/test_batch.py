@@ -0,0 +1,92 @@
+"""
+Модуль тестирования пакетной обработки временных рядов.
+"""
+import unittest
+import numpy as np
+from pandas import DataFrame, date_range
+from datetime import timedelta
+from time_series import BatchAnalyser, TimeSeriesAnalyser
+
+
+class TestBatchAnalyser(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        index = date_range("2024-01-01", periods=200, freq="h")
+        index = index[np.sort(rng.choice(index.size, 150, replace=False))]
+        values = np.cumsum(rng.normal(size=(150, 4)), axis=0) + 100
+        # Пропуски разной длины, в том числе в начале и в конце столбцов.
+        values[:5, 0] = np.nan
+        values[40:60, 1] = np.nan
+        values[-7:, 2] = np.nan
+        values[rng.random(150) < 0.2, 3] = np.nan
+        self.frame = DataFrame(values, index=index, columns=["A", "B", "C", "D"])
+        self.interval = timedelta(hours=1)
+        self.analyser = BatchAnalyser(self.frame, self.interval)
+
+    def check(self, result, method):
+        for column in self.frame.columns:
+            analyser = TimeSeriesAnalyser(self.frame[column].dropna(), self.interval)
+            expected = method(analyser)
+            actual = result[column].dropna()
+            self.assertTrue(actual.index.equals(expected.index))
+            np.testing.assert_allclose(actual.values, expected.values, rtol=1e-8, atol=1e-10)
+
+    def test_calc_movavg_int(self):
+        self.check(self.analyser.calc_movavg(5), lambda a: a.calc_movavg(5))
+
+    def test_calc_movavg_timedelta(self):
+        window = timedelta(hours=6)
+        self.check(self.analyser.calc_movavg(window), lambda a: a.calc_movavg(window))
+
+    def test_differentiate(self):
+        self.check(self.analyser.differentiate(), lambda a: a.differentiate())
+
+    def test_calc_autocor(self):
+        self.check(self.analyser.calc_autocor(), lambda a: a.calc_autocor())
+        self.check(self.analyser.calc_autocor(max_lag=10),
+                   lambda a: a.calc_autocor(max_lag=10))
+        self.check(self.analyser.calc_autocor(max_lag=10, method="fft"),
+                   lambda a: a.calc_autocor(max_lag=10, method="fft"))
+
+    def check_crosscor(self, frame, lags):
+        result = BatchAnalyser(frame).calc_crosscor(lags)
+        for lag in lags:
+            for first in frame.columns:
+                for second in frame.columns:
+                    expected = frame[first].shift(-lag).corr(frame[second])
+                    self.assertAlmostEqual(result.loc[(lag, first), second], expected, places=10)
+
+    def test_calc_crosscor_with_gaps(self):
+        self.check_crosscor(self.frame, [0, 1, 7, -3])
+
+    def test_calc_crosscor_without_gaps(self):
+        self.check_crosscor(self.frame.dropna(), [0, 2])
+
+    def test_calc_crosscor_top_k(self):
+        frame = self.frame.copy()
+        frame["E"] = frame["A"].shift(3) * 2 + 1
+        pairs = BatchAnalyser(frame).calc_crosscor([0, 3], top_k=4)
+        self.assertEqual(list(pairs.columns), ["Lag", "First", "Second", "Crosscor"])
+        self.assertEqual(len(pairs), 4)
+        self.assertEqual(tuple(pairs.iloc[0][["Lag", "First", "Second"]]), (3, "E", "A"))
+        self.assertAlmostEqual(pairs.iloc[0]["Crosscor"], 1.0)
+        self.assertTrue(np.all(np.diff(np.abs(pairs["Crosscor"])) <= 0))
+        self.assertFalse(any(pairs["First"] == pairs["Second"]))
+
+        full = BatchAnalyser(frame).calc_crosscor(0)
+        matrix = full.loc[0].to_numpy()
+        np.testing.assert_allclose(matrix, matrix.T)
+        self.assertFalse(((pairs["Lag"] == 0) & (pairs["First"] > pairs["Second"])).any())
+
+        pairs = BatchAnalyser(frame).calc_crosscor([3, -3], top_k=2)
+        self.assertEqual(list(pairs["Lag"]), [3, 3])
+
+    def test_calc_crosscor_errors(self):
+        with self.assertRaises(ValueError):
+            self.analyser.calc_crosscor(len(self.frame))
+        with self.assertRaises(ValueError):
+            self.analyser.calc_crosscor(0, top_k=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
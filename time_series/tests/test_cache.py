@@ -0,0 +1,76 @@
+"""
+Модуль тестирования кэша вычисленных результатов.
+"""
+import unittest
+import numpy as np
+from pandas import Series, date_range
+from datetime import timedelta
+from time_series import TimeSeriesAnalyser
+from time_series.time_series.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.cache = LRUCache(maxsize=2)
+
+    def compute(self, key):
+        self.calls.append(key)
+        return key[1] * 10
+
+    def get(self, key):
+        return self.cache.get_or_compute(key, lambda: self.compute(key))
+
+    def test_get_or_compute(self):
+        self.assertEqual(self.get(("a", 1)), 10)
+        self.assertEqual(self.get(("a", 1)), 10)
+        self.assertEqual(self.calls, [("a", 1)])
+
+    def test_eviction(self):
+        self.get(("a", 1))
+        self.get(("a", 2))
+        self.get(("a", 1))
+        self.get(("a", 3))
+        self.assertEqual(len(self.cache), 2)
+        self.assertIn(("a", 1), self.cache)
+        self.assertNotIn(("a", 2), self.cache)
+
+    def test_invalidate(self):
+        self.get(("a", 1))
+        self.get(("b", 2))
+        self.cache.invalidate("a")
+        self.assertNotIn(("a", 1), self.cache)
+        self.assertIn(("b", 2), self.cache)
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class TestAnalyserCache(unittest.TestCase):
+    def setUp(self):
+        self.data = Series(np.arange(10, dtype=float),
+                           index=date_range("2024-01-01", periods=10, freq="h"))
+        self.analyser = TimeSeriesAnalyser(self.data)
+
+    def test_interval(self):
+        self.assertEqual(self.analyser.interval, timedelta(hours=1))
+
+    def test_results_are_reused(self):
+        self.assertIs(self.analyser.calc_movavg(3), self.analyser.calc_movavg(3))
+        self.assertIsNot(self.analyser.calc_movavg(3), self.analyser.calc_movavg(4))
+        self.assertIs(self.analyser.calc_autocor(), self.analyser.calc_autocor(max_lag=8))
+        self.assertIs(self.analyser.differentiate(), self.analyser.differentiate())
+
+    def test_invalidate(self):
+        movavg = self.analyser.calc_movavg(3)
+        self.data.iloc[0] = 100.0
+        self.assertIs(self.analyser.calc_movavg(3), movavg)
+        self.analyser.invalidate("movavg")
+        self.assertEqual(self.analyser.calc_movavg(3).iloc[0], 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Модуль тестирования обработки ряда из хранилища блоками.
+"""
+import tempfile
+import tracemalloc
+import unittest
+import numpy as np
+from pandas import Series, date_range
+from datetime import timedelta
+from data_storage import MemmapStore
+from time_series import ChunkedAnalyser, TimeSeriesAnalyser
+
+
+class TestChunkedAnalyser(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = MemmapStore(self.directory.name)
+        rng = np.random.default_rng(3)
+        index = date_range("2024-01-01", periods=6000, freq="min", tz="Europe/Moscow")
+        index = index[np.sort(rng.choice(index.size, 4000, replace=False))]
+        self.series = Series(np.cumsum(rng.normal(size=index.size)) + 1e4, index=index, name="Open")
+        self.store.save("AAPL", self.series)
+        self.interval = timedelta(minutes=1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def expected(self, window, max_lag, chained):
+        movavg = TimeSeriesAnalyser(self.series, self.interval).calc_movavg(window)
+        analyser = TimeSeriesAnalyser(movavg if chained else self.series, self.interval)
+        return movavg, analyser.differentiate(), analyser.calc_autocor(max_lag)
+
+    def test_matches_in_memory_analyser(self):
+        for window in (1, 37, timedelta(hours=2)):
+            for chunk_size in (7, 999, 4000, 10000):
+                for chained in (True, False):
+                    chunked = ChunkedAnalyser(self.store, "AAPL", chunk_size)
+                    result = chunked.load(chunked.run(window, self.interval, 50, chained))
+                    movavg, diff, autocor = self.expected(window, 50, chained)
+                    np.testing.assert_array_equal(result["Movavg"].values, movavg.values)
+                    np.testing.assert_array_equal(result["Diff"].values, diff.values)
+                    self.assertTrue(result["Diff"].index.equals(diff.index))
+                    np.testing.assert_allclose(result["Autocor"].values, autocor.values,
+                                               rtol=1e-9, atol=1e-12)
+                    self.assertTrue(result["Autocor"].index.equals(autocor.index))
+
+    def test_movavg_with_nan_gaps(self):
+        values = self.series.to_numpy().copy()
+        # Пропуски в начале (длиннее блока), подряд и одиночные.
+        values[:20] = np.nan
+        values[1000:1050] = np.nan
+        values[np.random.default_rng(4).choice(values.size, 30, replace=False)] = np.nan
+        series = Series(values, index=self.series.index, name="Open")
+        self.store.save("GAPS", series)
+        for window in (1, 37, timedelta(hours=2)):
+            movavg = TimeSeriesAnalyser(series, self.interval).calc_movavg(window)
+            diff = TimeSeriesAnalyser(movavg, self.interval).differentiate()
+            for chunk_size in (7, 999, 10000):
+                chunked = ChunkedAnalyser(self.store, "GAPS", chunk_size)
+                result = chunked.load(chunked.run(window, self.interval))
+                np.testing.assert_array_equal(result["Movavg"].values, movavg.values)
+                np.testing.assert_array_equal(result["Diff"].values, diff.values)
+                self.assertTrue(np.isfinite(result["Movavg"].values[1100:]).any())
+
+    def test_rerun_replaces_results_and_skips_autocor(self):
+        chunked = ChunkedAnalyser(self.store, "AAPL", 700)
+        chunked.run(10, self.interval, 20)
+        names = chunked.run(10, self.interval)
+        self.assertEqual(set(names), {"Movavg", "Diff"})
+        self.assertEqual(self.store.size(names["Movavg"]), self.series.size)
+        self.assertEqual(self.store.size("AAPL_Autocor"), 0)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            ChunkedAnalyser(self.store, "AAPL", 0)
+        with self.assertRaises(ValueError):
+            ChunkedAnalyser(self.store, "AAPL", 100).run(10, self.interval, self.series.size)
+        with self.assertRaises(KeyError):
+            ChunkedAnalyser(self.store, "MSFT", 100).run(10, self.interval)
+
+    def test_memory_is_bounded_by_chunk(self):
+        size = 400_000
+        index = date_range("2020-01-01", periods=size, freq="s")
+        self.store.save("LONG", Series(np.random.default_rng(0).normal(size=size), index=index))
+        chunked = ChunkedAnalyser(self.store, "LONG", 10_000)
+        tracemalloc.start()
+        try:
+            chunked.run(timedelta(minutes=5), self.interval, 100)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # Ряд целиком занимает 6.4 МБ (метки и значения).
+        self.assertLess(peak, 2 * 2**20)
+
+
+if __name__ == "__main__":
+    unittest.main()
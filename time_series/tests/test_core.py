@@ -0,0 +1,84 @@
+"""
+Модуль тестирования функций обработки рядов на массивах NumPy.
+"""
+import unittest
+import numpy as np
+from pandas import Series, date_range
+from datetime import timedelta
+from time_series import TimeSeriesAnalyser
+from time_series.time_series import core
+
+
+class TestCore(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        index = date_range("2024-01-01", periods=5000, freq="min")
+        index = index[np.sort(rng.choice(index.size, 3000, replace=False))]
+        self.series = Series(np.cumsum(rng.normal(size=index.size)) + 100, index=index)
+        self.times = np.asarray(index.to_numpy(dtype="datetime64[ns]")).view(np.int64)
+        self.values = self.series.to_numpy()
+
+    def test_matches_analyser(self):
+        analyser = TimeSeriesAnalyser(self.series, timedelta(minutes=1))
+        np.testing.assert_array_equal(core.movavg_points(self.values, 20),
+                                      analyser.calc_movavg(20).values)
+        np.testing.assert_array_equal(core.movavg_time(self.times, self.values, 3_600 * 10**9),
+                                      analyser.calc_movavg(timedelta(hours=1)).values)
+        np.testing.assert_array_equal(core.differentiate(self.times, self.values, 60 * 10**9),
+                                      analyser.differentiate().values)
+        np.testing.assert_array_equal(core.autocor(self.values, 50),
+                                      analyser.calc_autocor(50).values)
+
+    def test_out_buffers_are_filled_in_place(self):
+        out = np.empty(self.values.size)
+        result = core.movavg_points(self.values, 20, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out, core.movavg_points(self.values, 20))
+
+        out = np.empty(51, dtype=np.float32)
+        self.assertIs(core.autocor(self.values, 50, method="fft", out=out), out)
+
+        with self.assertRaises(ValueError):
+            core.differentiate(self.times, self.values, 1, out=np.empty(self.values.size))
+
+    def test_float32_mode(self):
+        values = self.values.astype(np.float32)
+        movavg = core.movavg_time(self.times, values, 3_600 * 10**9, dtype=np.float32)
+        self.assertEqual(movavg.dtype, np.float32)
+        np.testing.assert_allclose(movavg, core.movavg_time(self.times, self.values, 3_600 * 10**9),
+                                   rtol=1e-5)
+
+        analyser = TimeSeriesAnalyser(self.series.astype(np.float32), dtype=np.float32)
+        self.assertEqual(analyser.differentiate().dtype, np.float32)
+        with self.assertRaises(ValueError):
+            TimeSeriesAnalyser(self.series, dtype=np.int64)
+
+    def test_local_extremes_distance_in_time(self):
+        ids, is_max = core.local_extremes(self.values, min_distance=3_600 * 10**9, times=self.times)
+        for mask in (is_max, ~is_max):
+            self.assertTrue(np.all(np.diff(self.times[ids[mask]]) >= 3_600 * 10**9))
+
+    def test_movavg_points_with_nan_gaps(self):
+        values = self.values.copy()
+        values[[0, 100, 101, 2000]] = np.nan
+        expected = [np.average(values[max(i - 19, 0):i + 1]) for i in range(values.size)]
+        np.testing.assert_allclose(core.movavg_points(values, 20), expected, equal_nan=True)
+        self.assertTrue(np.isfinite(core.movavg_points(values, 20)[-1]))
+        self.assertTrue(np.all(np.isnan(core.movavg_points(np.full(5, np.nan), 2))))
+
+    def test_movavg_time_with_nan_gaps(self):
+        values = self.values.copy()
+        values[[0, 500, 1500]] = np.nan
+        window = 3_600 * 10**9
+        expected = [np.average(values[(self.times >= time - window) & (self.times <= time)])
+                    for time in self.times]
+        result = core.movavg_time(self.times, values, window)
+        np.testing.assert_allclose(result, expected, equal_nan=True)
+        self.assertEqual(int(np.isnan(result).sum()), int(np.isnan(expected).sum()))
+
+        analyser = TimeSeriesAnalyser(Series(values, index=self.series.index))
+        np.testing.assert_array_equal(analyser.calc_movavg(timedelta(hours=1)).values, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
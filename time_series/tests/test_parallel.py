@@ -0,0 +1,42 @@
+"""
+Модуль тестирования параллельной обработки временных рядов.
+"""
+import unittest
+import numpy as np
+from pandas import DataFrame, date_range
+from datetime import timedelta
+from time_series import ParallelAnalyser
+from time_series.time_series.parallel import analyse_frame
+
+
+class TestParallelAnalyser(unittest.TestCase):
+    def test_matches_serial(self):
+        rng = np.random.default_rng(6)
+        values = np.cumsum(rng.normal(size=(300, 7)), axis=0)
+        values[rng.random(values.shape) < 0.1] = np.nan
+        frame = DataFrame(values, index=date_range("2024-01-01", periods=300, freq="h"),
+                          columns=[f"T{i}" for i in range(7)])
+        for window in (5, timedelta(hours=5)):
+            expected = analyse_frame(frame, timedelta(hours=1), window)
+            actual = ParallelAnalyser(workers=2).analyse(frame, timedelta(hours=1), window)
+            for name, result in expected.items():
+                np.testing.assert_allclose(actual[name].to_numpy(), result.to_numpy())
+                self.assertTrue(actual[name].index.equals(frame.index))
+                self.assertTrue(actual[name].columns.equals(frame.columns))
+
+    def test_all_nan_columns_match_serial(self):
+        values = np.cumsum(np.random.default_rng(7).normal(size=(100, 4)), axis=0)
+        # Бумага без данных (например, снятая с торгов) - столбец пропусков.
+        values[:, 1:3] = np.nan
+        frame = DataFrame(values, index=date_range("2024-01-01", periods=100, freq="h"),
+                          columns=list("ABCD"))
+        expected = analyse_frame(frame, timedelta(hours=1), 5)
+        actual = ParallelAnalyser(workers=2).analyse(frame, timedelta(hours=1), 5)
+        for name, result in expected.items():
+            np.testing.assert_allclose(actual[name].to_numpy(), result.to_numpy())
+        self.assertTrue(actual["Autocor"][["B", "C"]].isna().all().all())
+        self.assertTrue(actual["Autocor"]["A"].notna().any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Модуль тестирования пирамиды агрегатов.
+"""
+import unittest
+import numpy as np
+from pandas import Series, date_range
+from pandas.testing import assert_frame_equal
+from datetime import timedelta
+from time_series import ResamplePyramid
+
+
+class TestResamplePyramid(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        index = date_range("2024-01-01", periods=20_000, freq="20s", tz="Europe/Moscow")
+        index = index[np.sort(rng.choice(index.size, 15_000, replace=False))]
+        self.series = Series(np.cumsum(rng.normal(size=index.size)) + 100, index=index)
+
+    def expected(self, rule):
+        utc = self.series.tz_convert("UTC")
+        resampled = utc.resample(rule)
+        frame = resampled.ohlc()
+        frame.columns = ["Open", "High", "Low", "Close"]
+        frame["Mean"] = resampled.mean()
+        frame["Count"] = resampled.count()
+        frame = frame[frame["Count"] > 0]
+        frame.index = frame.index.tz_convert("Europe/Moscow").rename("Date")
+        return frame
+
+    def test_levels_match_pandas(self):
+        pyramid = ResamplePyramid().build(self.series)
+        for interval, rule in ((timedelta(minutes=5), "5min"), (timedelta(hours=1), "1h"),
+                               (timedelta(days=1), "1D")):
+            assert_frame_equal(pyramid.level(interval), self.expected(rule),
+                               check_freq=False, check_dtype=False, check_index_type=False)
+
+    def test_view_from_coarser_level(self):
+        pyramid = ResamplePyramid().build(self.series)
+        assert_frame_equal(pyramid.view(timedelta(hours=3)), self.expected("3h"),
+                           check_freq=False, check_dtype=False, check_index_type=False)
+        with self.assertRaises(ValueError):
+            pyramid.view(timedelta(seconds=30))
+
+    def test_append_matches_build(self):
+        pyramid = ResamplePyramid()
+        for part in np.array_split(np.arange(self.series.size), 7):
+            pyramid.append(self.series.iloc[part])
+        built = ResamplePyramid().build(self.series)
+        for interval in pyramid.levels:
+            assert_frame_equal(pyramid.level(interval), built.level(interval))
+        with self.assertRaises(ValueError):
+            pyramid.append(self.series.iloc[:1])
+
+    def test_frames_roundtrip(self):
+        pyramid = ResamplePyramid().build(self.series)
+        restored = ResamplePyramid.from_frames(pyramid.to_frames())
+        for interval in pyramid.levels:
+            assert_frame_equal(restored.level(interval), pyramid.level(interval))
+
+    def test_levels_must_be_multiples(self):
+        with self.assertRaises(ValueError):
+            ResamplePyramid((timedelta(minutes=2), timedelta(minutes=5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Модуль тестирования скользящих статистик (EMA, дисперсия, минимум, максимум).
+"""
+import unittest
+import numpy as np
+from pandas import Series, date_range
+from datetime import timedelta
+from time_series import TimeSeriesAnalyser
+from time_series.time_series import core
+
+
+class TestRolling(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        index = date_range("2024-01-01", periods=4000, freq="min")
+        index = index[np.sort(rng.choice(index.size, 2500, replace=False))]
+        self.series = Series(np.cumsum(rng.normal(size=index.size)) + 1e6, index=index)
+        self.analyser = TimeSeriesAnalyser(self.series, timedelta(minutes=1))
+
+    def naive(self, window, reduce, series=None):
+        series = self.series if series is None else series
+        values = series.to_numpy()
+        if isinstance(window, timedelta):
+            times = series.index
+            return np.array([reduce(values[(times >= time - window) & (times <= time)])
+                             for time in times])
+        return np.array([reduce(values[max(i - window + 1, 0):i + 1])
+                         for i in range(values.size)])
+
+    def test_ema_matches_pandas(self):
+        for window in (1, 2, 30):
+            expected = self.series.ewm(span=window, adjust=False).mean()
+            np.testing.assert_allclose(self.analyser.calc_ema(window), expected, rtol=1e-12)
+
+    def test_ema_time_decays_with_gaps(self):
+        window = timedelta(minutes=10)
+        values = self.series.to_numpy()
+        seconds = np.diff(self.series.index.to_numpy(dtype="datetime64[ns]")) / np.timedelta64(1, "s")
+        expected = [values[0]]
+        for value, dt in zip(values[1:], seconds):
+            decay = np.exp(-dt / window.total_seconds())
+            expected.append(decay * expected[-1] + (1 - decay) * value)
+        np.testing.assert_allclose(self.analyser.calc_ema(window), expected, rtol=1e-12)
+
+    def test_ema_with_nan_gaps(self):
+        series = self.with_nan_gaps()
+        analyser = TimeSeriesAnalyser(series, timedelta(minutes=1))
+        # Пропуски пропускаются, в них повторяется предыдущее среднее.
+        for window in (1, 30):
+            expected = series.ewm(span=window, adjust=False, ignore_na=True).mean()
+            np.testing.assert_allclose(analyser.calc_ema(window), expected, rtol=1e-12)
+
+        window = timedelta(minutes=10)
+        times = series.index.to_numpy(dtype="datetime64[ns]")
+        expected, state, last = [], np.nan, None
+        for time, value in zip(times, series.to_numpy()):
+            if not np.isnan(value):
+                if last is None:
+                    state = value
+                else:
+                    decay = np.exp(-(time - last) / np.timedelta64(1, "s") / window.total_seconds())
+                    state = decay * state + (1 - decay) * value
+                last = time
+            expected.append(state)
+        result = analyser.calc_ema(window).to_numpy()
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+        self.assertTrue(np.isnan(result[0]))
+        self.assertTrue(np.isfinite(result[1:]).all())
+
+    def test_var_and_std(self):
+        for window in (2, 25, timedelta(hours=1)):
+            expected = self.naive(window, lambda part: np.var(part, ddof=1) if part.size > 1 else np.nan)
+            np.testing.assert_allclose(self.analyser.calc_rolling(window, "var"), expected,
+                                       rtol=1e-9, equal_nan=True)
+            np.testing.assert_allclose(self.analyser.calc_rolling_std(window), np.sqrt(expected),
+                                       rtol=1e-9, equal_nan=True)
+        self.assertEqual(self.analyser.calc_rolling_std(25).name, "Std")
+
+    def with_nan_gaps(self):
+        values = self.series.to_numpy().copy()
+        values[0] = np.nan
+        values[500:510] = np.nan
+        values[np.random.default_rng(8).choice(values.size, 20, replace=False)] = np.nan
+        return Series(values, index=self.series.index)
+
+    def test_var_with_nan_gaps(self):
+        series = self.with_nan_gaps()
+        analyser = TimeSeriesAnalyser(series, timedelta(minutes=1))
+        for window in (20, timedelta(minutes=30)):
+            expected = self.naive(window, lambda part: np.var(part, ddof=1) if part.size > 1 else np.nan,
+                                  series)
+            result = analyser.calc_rolling(window, "var")
+            np.testing.assert_allclose(result, expected, rtol=1e-9, equal_nan=True)
+            self.assertTrue(np.isfinite(result.to_numpy()[-10:]).any())
+
+    def test_var_is_exact_for_large_level(self):
+        values = np.array([1e9, 1e9 + 1, 1e9 + 3, 1e9 + 6])
+        result = core.rolling_var(values, core.window_starts_points(values.size, 2))
+        np.testing.assert_array_equal(result, [np.nan, 0.5, 2.0, 4.5])
+
+    def test_min_and_max(self):
+        for window in (1, 7, 64, timedelta(minutes=45)):
+            np.testing.assert_array_equal(self.analyser.calc_rolling_min(window),
+                                          self.naive(window, np.min))
+            np.testing.assert_array_equal(self.analyser.calc_rolling_max(window),
+                                          self.naive(window, np.max))
+
+    def test_min_and_max_with_nan_gaps(self):
+        series = self.with_nan_gaps()
+        analyser = TimeSeriesAnalyser(series, timedelta(minutes=1))
+        # Окна в точках - алгоритм ван Херка, временные - монотонная очередь.
+        for window in (1, 7, 64, timedelta(minutes=45)):
+            np.testing.assert_array_equal(analyser.calc_rolling_min(window),
+                                          self.naive(window, np.min, series))
+            np.testing.assert_array_equal(analyser.calc_rolling_max(window),
+                                          self.naive(window, np.max, series))
+
+    def test_errors_and_cache(self):
+        with self.assertRaises(ValueError):
+            self.analyser.calc_rolling(10, "median")
+        with self.assertRaises(ValueError):
+            self.analyser.calc_rolling_max(timedelta(minutes=-1))
+        with self.assertRaises(ValueError):
+            self.analyser.calc_ema(0)
+        self.assertIs(self.analyser.calc_rolling_max(7), self.analyser.calc_rolling_max(7))
+
+
+if __name__ == "__main__":
+    unittest.main()
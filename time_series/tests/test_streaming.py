@@ -0,0 +1,51 @@
+"""
+Модуль тестирования потоковой обработки временных рядов.
+"""
+import unittest
+import numpy as np
+from pandas import Series, date_range
+from datetime import timedelta
+from time_series import StreamingAnalyser, TimeSeriesAnalyser
+
+
+class TestStreamingAnalyser(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        index = date_range("2024-01-01", periods=400, freq="min")
+        # Нерегулярный индекс: часть точек выброшена.
+        index = index[np.sort(rng.choice(index.size, 300, replace=False))]
+        self.data = Series(np.cumsum(rng.normal(size=300)) + 1000, index=index)
+
+    def check(self, window):
+        streaming = StreamingAnalyser(window, timedelta(minutes=1), max_lag=5)
+        for i, (timestamp, value) in enumerate(self.data.items()):
+            streaming.append(timestamp, value)
+            if i < 10 or i % 37 == 0 or i == self.data.size - 1:
+                analyser = TimeSeriesAnalyser(self.data.iloc[:i+1], timedelta(minutes=1))
+                self.assertAlmostEqual(streaming.movavg,
+                                       analyser.calc_movavg(window).iloc[-1], places=9)
+                if i > 0:
+                    self.assertAlmostEqual(streaming.diff,
+                                           analyser.differentiate().iloc[-1], places=9)
+                if i > 1:
+                    expected = analyser.calc_autocor(max_lag=min(5, i - 1))
+                    autocor = streaming.autocor
+                    np.testing.assert_allclose(autocor.values, expected.values, rtol=1e-6)
+                    self.assertTrue(autocor.index.equals(expected.index))
+        self.assertEqual(streaming.size, self.data.size)
+
+    def test_int_window(self):
+        self.check(7)
+
+    def test_timedelta_window(self):
+        self.check(timedelta(minutes=10))
+
+    def test_rejects_unordered_timestamps(self):
+        streaming = StreamingAnalyser(3, timedelta(minutes=1))
+        streaming.append(self.data.index[1], 1.0)
+        with self.assertRaises(ValueError):
+            streaming.append(self.data.index[0], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
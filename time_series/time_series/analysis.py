@@ -2,32 +2,57 @@
 Модуль обработки временных рядов.
 """
 import numpy as np
-from pandas import DataFrame, Series, Index
+from pandas import DataFrame, Series, Index, Timedelta
 from datetime import timedelta
 
+from time_series.time_series import core
+from time_series.time_series.cache import LRUCache
+from time_series.time_series.core import index_to_ns, timedelta_to_ns
+
+
 class TimeSeriesAnalyser:
     """
-    Класс обработки временных рядов.
+    Класс обработки временных рядов. Вычисления выполняются функциями
+    модуля core над массивами NumPy, класс только переводит индекс
+    в метки времени и оборачивает результаты в Series и DataFrame.
+    Вычисленные результаты хранятся в ограниченном кэше,
+    поэтому возвращаемые ряды и таблицы не следует изменять.
     """
     def __init__(self,
                  series: Series,
-                 interval: timedelta=None):
+                 interval: timedelta=None,
+                 cache_size: int=32,
+                 dtype: type=np.float64):
         """
         Args:
             series: временной ряд.
-            interval: минимальный интервал ряда.
+            interval: минимальный интервал ряда (если не задан,
+            вычисляется по индексу при первом обращении).
+            cache_size: число результатов, хранимых в кэше.
+            dtype: тип значений результатов (np.float64 или np.float32).
         """
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            error = ValueError("Поддерживаются только типы float32 и float64.")
+            raise error
         self.__series = series
-        self.__interval = None
-
-        if interval is None:
-            self.__interval = self.index[1] - self.index[0]
-            for i in range(2, self.__series.size):
-                interval = self.index[i] - self.index[i-1]
-                if self.__interval > interval:
-                    self.__interval = interval
-        else:
-            self.__interval = interval
+        self.__interval = interval
+        self.__cache = LRUCache(cache_size)
+        self.__dtype = np.dtype(dtype)
+
+    def invalidate(self,
+                   *names: str) -> None:
+        """
+        Метод сброса кэша вычисленных результатов. Должен вызываться
+        после изменения временного ряда на месте.
+
+        Args:
+            names: имена сбрасываемых результатов ("interval", "diff",
+            "movavg", "ema", "rolling", "autocor", "extremes"). Без аргументов
+            сбрасывается весь кэш.
+        """
+        if "interval" in names:
+            names += ("diff", "times", "starts")
+        self.__cache.invalidate(*names)
 
     @property
     def size(self) -> int:
@@ -57,7 +82,37 @@ class TimeSeriesAnalyser:
         Returns:
             Интервал временного ряда.
         """
-        return self.__interval
+        if self.__interval is not None:
+            return self.__interval
+        return self.__cache.get_or_compute(("interval",), self._infer_interval)
+
+    def _infer_interval(self) -> timedelta:
+        """
+        Метод вычисления минимального интервала между соседними точками ряда.
+
+        Returns:
+            Минимальный интервал временного ряда.
+        """
+        return Timedelta(core.infer_interval(self._times()), unit="ns")
+
+    def _times(self) -> np.ndarray:
+        """
+        Метод получения меток времени ряда (int64, нс).
+        Переводятся из индекса один раз и хранятся в кэше.
+
+        Returns:
+            Метки времени.
+        """
+        return self.__cache.get_or_compute(("times",), lambda: index_to_ns(self.index))
+
+    def _values(self) -> np.ndarray:
+        """
+        Метод получения значений ряда без копирования (если тип совпадает).
+
+        Returns:
+            Значения ряда.
+        """
+        return self.__series.to_numpy(dtype=self.__dtype)
     
     @property
     def series(self) -> Series:
@@ -70,21 +125,28 @@ class TimeSeriesAnalyser:
         return self.__series
     
     def find_extremes(self,
-                      glb: bool=False) -> DataFrame:
+                      glb: bool=False,
+                      min_prominence: float=None,
+                      min_distance: int|timedelta=None) -> DataFrame:
         """
         Метод поиска экстремумов временного ряда.
 
         Args:
             glb: тип экстремумов (глобальные, если True,
             локальные, если False).
+            min_prominence: минимальная выраженность локального экстремума.
+            min_distance: минимальное расстояние между локальными
+            экстремумами одного типа (в точках или во времени).
 
         Returns:
             Таблица с экстремумами временного ряда.
         """
         if glb:
-            return self._find_glb_extremes()
-        else:
-            return self._find_loc_extremes()
+            return self.__cache.get_or_compute(("extremes", True),
+                                               self._find_glb_extremes)
+        return self.__cache.get_or_compute(
+            ("extremes", False, min_prominence, min_distance),
+            lambda: self._find_loc_extremes(min_prominence, min_distance))
 
     def _find_glb_extremes(self) -> DataFrame:
         """
@@ -93,29 +155,33 @@ class TimeSeriesAnalyser:
         Returns:
             Таблица с глобальными экстремумами временного ряда.
         """
-        ids = [np.argmin(self.series), np.argmax(self.series)]
+        ids = core.global_extremes(self._values())
         return DataFrame({"Extreme": self.series.iloc[ids], "Type": ["Min", "Max"]},
                          index=self.index[ids])
 
-    def _find_loc_extremes(self) -> DataFrame:
+    def _find_loc_extremes(self,
+                           min_prominence: float=None,
+                           min_distance: int|timedelta=None) -> DataFrame:
         """
         Метод поиска локальных экстремумов временного ряда.
+        Экстремумы ищутся по смене знака первой разности, плато
+        из равных значений считается одной точкой (берется его середина).
+
+        Args:
+            min_prominence: минимальная выраженность экстремума.
+            min_distance: минимальное расстояние между экстремумами одного типа.
 
         Returns:
             Таблица с локальными экстремумами временного ряда.
         """
-        ids = []
-        types = []
-        
-        for i in range(1, -1):
-            if self.series[i] <= self.series[i-1] and self.series[i] <= self.series[i+1]:
-                ids.append(i)
-                types.append("Min")
-            elif self.series[i] >= self.series[i-1] and self.series[i] >= self.series[i+1]:
-                ids.append(i)
-                types.append("Max")
-
-        return DataFrame({"Extreme": self.series.iloc[ids], "Type": types}, 
+        times = None
+        if isinstance(min_distance, timedelta):
+            times = self._times()
+            min_distance = timedelta_to_ns(min_distance)
+        ids, is_max = core.local_extremes(self._values(), min_prominence, min_distance, times)
+        types = np.where(is_max, "Max", "Min")
+
+        return DataFrame({"Extreme": self.series.iloc[ids], "Type": types},
                          index=self.index[ids])
 
     def differentiate(self) -> Series:
@@ -125,16 +191,38 @@ class TimeSeriesAnalyser:
         Returns:
             Дифференциал временного ряда.
         """
-        intervals = (self.index[1:] - self.index[:-1]) / self.interval
-        diffs = (self.series.values[1:] - self.series.values[:-1])
+        return self.__cache.get_or_compute(("diff",), self._differentiate)
 
-        return Series(diffs / intervals, index=self.index[:-1], name="Diff")
+    def _differentiate(self) -> Series:
+        """
+        Метод вычисления дифференциала временного ряда без кэша.
+
+        Returns:
+            Дифференциал временного ряда.
+        """
+        diffs = core.differentiate(self._times(), self._values(),
+                                   timedelta_to_ns(self.interval), dtype=self.__dtype)
+        return Series(diffs, index=self.index[:-1], name="Diff", copy=False)
 
     def calc_movavg(self,
                     window: int|timedelta) -> Series:
         """
         Метод вычисления скользящего среднего временного ряда.
 
+        Args:
+            window: окно, по которому вычисляется скользящее среднее.
+
+        Returns:
+            Скользящее среднее временного ряда.
+        """
+        return self.__cache.get_or_compute(("movavg", window),
+                                           lambda: self._calc_movavg(window))
+
+    def _calc_movavg(self,
+                     window: int|timedelta) -> Series:
+        """
+        Метод вычисления скользящего среднего временного ряда без кэша.
+
         Args:
             window: окно, по которому вычисляется скользящее среднее.
 
@@ -160,18 +248,8 @@ class TimeSeriesAnalyser:
         Returns:
             Скользящее среднее временного ряда.
         """
-        if window < 1:
-            error = ValueError("Попытка передачи отрицательного окна.")
-            raise error
-        
-        movavgs = np.empty(self.size, dtype=float)
-        for i in range(0, self.size):
-            start_pos = i - window + 1
-            if start_pos < 0:
-                start_pos = 0
-            movavgs[i] = np.average(self.series.values[start_pos:i+1])
-
-        return Series(movavgs, index=self.index, name="Movavg")
+        movavgs = core.movavg_points(self._values(), window, dtype=self.__dtype)
+        return Series(movavgs, index=self.index, name="Movavg", copy=False)
 
     def _calc_movavg_timedelta(self,
                                window: timedelta):
@@ -185,40 +263,197 @@ class TimeSeriesAnalyser:
         Returns:
             Скользящее среднее временного ряда.
         """
-        movavgs = np.empty([self.size], dtype=float)
-        for i in range(0, self.size):
-            sum_prices = 0
-            n = 0
-            for j in range(i, -1, -1):
-                interval = self.index[i] - self.index[j]
-                if interval <= window:
-                    sum_prices += self.series.values[j]
-                    n += 1
-                else:
-                    break
-            movavgs[i] = sum_prices / n
+        if window < timedelta(0):
+            error = ValueError("Попытка передачи отрицательного окна.")
+            raise error
+        movavgs = core.movavg_time(self._times(), self._values(),
+                                   timedelta_to_ns(window), dtype=self.__dtype)
+        return Series(movavgs, index=self.index, name="Movavg", copy=False)
+
+    def _window_starts(self,
+                       window: int|timedelta) -> np.ndarray:
+        """
+        Метод вычисления начал скользящих окон (в точках или во времени).
+        Позиции хранятся в кэше и общие для всех скользящих статистик.
+
+        Args:
+            window: окно.
+
+        Returns:
+            Позиции начала окна для каждой точки ряда.
+        """
+        if isinstance(window, timedelta):
+            if window < timedelta(0):
+                error = ValueError("Попытка передачи отрицательного окна.")
+                raise error
+            return self.__cache.get_or_compute(
+                ("starts", window),
+                lambda: core.window_starts_time(self._times(), timedelta_to_ns(window)))
+        return self.__cache.get_or_compute(
+            ("starts", window), lambda: core.window_starts_points(self.size, window))
+
+    def calc_ema(self,
+                 window: int|timedelta) -> Series:
+        """
+        Метод вычисления экспоненциального скользящего среднего.
 
-        return Series(movavgs, index=self.index, name="Movavg")
+        Args:
+            window: окно в точках (alpha = 2 / (window + 1)) или
+            постоянная времени (вес предыдущего значения exp(-dt / window)).
 
-    def calc_autocor(self) -> Series:
+        Returns:
+            Экспоненциальное скользящее среднее временного ряда.
+        """
+        return self.__cache.get_or_compute(("ema", window),
+                                           lambda: self._calc_ema(window))
+
+    def _calc_ema(self,
+                  window: int|timedelta) -> Series:
+        """
+        Метод вычисления экспоненциального скользящего среднего без кэша.
+
+        Args:
+            window: окно в точках или постоянная времени.
+
+        Returns:
+            Экспоненциальное скользящее среднее временного ряда.
+        """
+        if isinstance(window, timedelta):
+            emas = core.ema_time(self._times(), self._values(),
+                                 timedelta_to_ns(window), dtype=self.__dtype)
+        else:
+            emas = core.ema_points(self._values(), window, dtype=self.__dtype)
+        return Series(emas, index=self.index, name="Ema", copy=False)
+
+    def calc_rolling(self,
+                     window: int|timedelta,
+                     stat: str,
+                     ddof: int=1) -> Series:
+        """
+        Метод вычисления скользящей статистики за линейное время.
+
+        Args:
+            window: окно в точках или во времени.
+            stat: статистика ("var", "std", "min" или "max").
+            ddof: поправка числа степеней свободы для "var" и "std".
+
+        Returns:
+            Скользящая статистика временного ряда (название - stat
+            с заглавной буквы).
+        """
+        if stat not in ("var", "std", "min", "max"):
+            error = ValueError("Неизвестная скользящая статистика: " + str(stat))
+            raise error
+        if stat in ("min", "max"):
+            ddof = None
+        return self.__cache.get_or_compute(("rolling", stat, window, ddof),
+                                           lambda: self._calc_rolling(window, stat, ddof))
+
+    def _calc_rolling(self,
+                      window: int|timedelta,
+                      stat: str,
+                      ddof: int) -> Series:
+        """
+        Метод вычисления скользящей статистики без кэша.
+        Стандартное отклонение берется из дисперсии в кэше.
+
+        Args:
+            window: окно в точках или во времени.
+            stat: статистика ("var", "std", "min" или "max").
+            ddof: поправка числа степеней свободы.
+
+        Returns:
+            Скользящая статистика временного ряда.
+        """
+        if stat == "std":
+            rolled = np.sqrt(self.calc_rolling(window, "var", ddof).to_numpy())
+        elif stat == "var":
+            rolled = core.rolling_var(self._values(), self._window_starts(window),
+                                      ddof, dtype=self.__dtype)
+        elif stat == "min":
+            rolled = core.rolling_min(self._values(), self._window_starts(window),
+                                      dtype=self.__dtype)
+        else:
+            rolled = core.rolling_max(self._values(), self._window_starts(window),
+                                      dtype=self.__dtype)
+        return Series(rolled, index=self.index, name=stat.capitalize(), copy=False)
+
+    def calc_rolling_std(self,
+                         window: int|timedelta,
+                         ddof: int=1) -> Series:
+        """
+        Метод вычисления скользящего стандартного отклонения.
+
+        Args:
+            window: окно в точках или во времени.
+            ddof: поправка числа степеней свободы.
+
+        Returns:
+            Скользящее стандартное отклонение временного ряда.
+        """
+        return self.calc_rolling(window, "std", ddof)
+
+    def calc_rolling_min(self,
+                         window: int|timedelta) -> Series:
+        """
+        Метод вычисления скользящего минимума.
+
+        Args:
+            window: окно в точках или во времени.
+
+        Returns:
+            Скользящий минимум временного ряда.
+        """
+        return self.calc_rolling(window, "min")
+
+    def calc_rolling_max(self,
+                         window: int|timedelta) -> Series:
+        """
+        Метод вычисления скользящего максимума.
+
+        Args:
+            window: окно в точках или во времени.
+
+        Returns:
+            Скользящий максимум временного ряда.
+        """
+        return self.calc_rolling(window, "max")
+
+    def calc_autocor(self,
+                     max_lag: int=None,
+                     method: str="exact") -> Series:
         """
         Метод для вычисления автокорреляции временного ряда.
 
+        Args:
+            max_lag: максимальный сдвиг (по умолчанию size-2).
+            method: способ вычисления ("exact" - среднее и отклонение
+            считаются отдельно для каждого перекрывающегося отрезка,
+            "fft" - классическая оценка с общими средним и дисперсией).
+
+        Returns:
+            Автокорреляция временного ряда.
+        """
+        if max_lag is None:
+            max_lag = self.size - 2
+        return self.__cache.get_or_compute(("autocor", max_lag, method),
+                                           lambda: self._calc_autocor(max_lag, method))
+
+    def _calc_autocor(self,
+                      max_lag: int,
+                      method: str) -> Series:
+        """
+        Метод для вычисления автокорреляции временного ряда без кэша.
+
+        Args:
+            max_lag: максимальный сдвиг.
+            method: способ вычисления ("exact" или "fft").
+
         Returns:
             Автокорреляция временного ряда.
         """
-        autocors = np.empty([self.size-1])
-        for i in range(0, self.size-1):
-            x = self.series.values[i:]
-            y = self.series.values[:self.size-i]
-            avg_x = np.average(x)
-            avg_y = np.average(y)
-            avg_xy = np.average(x*y)
-            std_x = np.std(x)
-            std_y = np.std(y)
-            autocors[i] = (avg_xy - avg_x*avg_y) / (std_x*std_y)
-
-        return Series(autocors, index=self.index[:-1], name="Autocor")
+        autocors = core.autocor(self._values(), max_lag, method, dtype=self.__dtype)
+        return Series(autocors, index=self.index[:max_lag+1], name="Autocor", copy=False)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,423 @@
+"""
+Модуль пакетной обработки временных рядов нескольких ценных бумаг.
+"""
+import numpy as np
+from pandas import DataFrame, Index, MultiIndex, Timedelta
+from datetime import timedelta
+
+from time_series.time_series.core import index_to_ns, timedelta_to_ns
+
+
+# Число столбцов, для которых спектры считаются одновременно.
+# Ограничивает память под двумерное преобразование Фурье.
+_FFT_COLUMN_BLOCK = 64
+
+
+class BatchAnalyser:
+    """
+    Класс пакетной обработки выровненной таблицы временных рядов
+    (один столбец на ценную бумагу). Все столбцы обрабатываются
+    одним двумерным проходом NumPy.
+
+    Пропуски (NaN) обрабатываются так, как будто каждый столбец
+    был отдельным рядом без пропусков: результат для столбца совпадает
+    с результатом TimeSeriesAnalyser(frame[column].dropna()), разложенным
+    по строкам исходной таблицы.
+    """
+    def __init__(self,
+                 frame: DataFrame,
+                 interval: timedelta=None):
+        """
+        Args:
+            frame: таблица временных рядов с общим временным индексом.
+            interval: минимальный интервал рядов (если не задан,
+            вычисляется по общему индексу).
+        """
+        self.__frame = frame
+        self.__interval = interval
+        self.__compacted = None
+
+    @property
+    def frame(self) -> DataFrame:
+        """
+        Свойство таблицы временных рядов.
+
+        Returns:
+            Таблица временных рядов.
+        """
+        return self.__frame
+
+    @property
+    def index(self) -> Index:
+        """
+        Свойство общего индекса временных рядов.
+
+        Returns:
+            Индекс таблицы.
+        """
+        return self.__frame.index
+
+    @property
+    def interval(self) -> timedelta:
+        """
+        Свойство минимального интервала временных рядов.
+
+        Returns:
+            Интервал временных рядов.
+        """
+        if self.__interval is None:
+            if len(self.index) < 2:
+                error = ValueError("Для вычисления интервала нужны хотя бы две точки.")
+                raise error
+            self.__interval = Timedelta(int(np.diff(index_to_ns(self.index)).min()), unit="ns")
+        return self.__interval
+
+    def _compact(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Метод сжатия столбцов: в каждом столбце непропущенные значения
+        переносятся в начало с сохранением порядка.
+
+        Returns:
+            Кортеж из номеров исходных строк, сжатых значений,
+            сжатых меток времени и числа значений в каждом столбце.
+        """
+        if self.__compacted is None:
+            values = self.__frame.to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            order = np.argsort(~valid, axis=0, kind="stable")
+            compact = np.take_along_axis(values, order, axis=0)
+            times = index_to_ns(self.index)[order]
+            self.__compacted = (order, compact, times, valid.sum(axis=0))
+        return self.__compacted
+
+    def _expand(self,
+                compact: np.ndarray,
+                lengths: np.ndarray) -> DataFrame:
+        """
+        Метод раскладки сжатых результатов по строкам исходной таблицы.
+
+        Args:
+            compact: сжатые результаты.
+            lengths: число результатов в каждом столбце.
+
+        Returns:
+            Таблица результатов с индексом исходной таблицы.
+        """
+        order = self._compact()[0]
+        rows = np.arange(compact.shape[0])[:, np.newaxis]
+        columns = np.broadcast_to(np.arange(compact.shape[1]), compact.shape)
+        filled = rows < lengths
+
+        result = np.full(self.__frame.shape, np.nan)
+        result[order[:compact.shape[0]][filled], columns[filled]] = compact[filled]
+        return DataFrame(result, index=self.index, columns=self.__frame.columns)
+
+    def calc_movavg(self,
+                    window: int|timedelta) -> DataFrame:
+        """
+        Метод вычисления скользящего среднего всех временных рядов.
+
+        Args:
+            window: окно, по которому вычисляется скользящее среднее.
+
+        Returns:
+            Таблица скользящих средних.
+        """
+        movavgs = None
+        if isinstance(window, int):
+            movavgs = self._calc_movavg_int(window)
+        if isinstance(window, timedelta):
+            movavgs = self._calc_movavg_timedelta(window)
+        return movavgs
+
+    def _calc_movavg_int(self,
+                         window: int) -> DataFrame:
+        """
+        Метод вычисления скользящего среднего по целочисленному окну.
+        Окно отсчитывается по непропущенным значениям столбца.
+
+        Args:
+            window: окно, по которому вычисляется скользящее среднее.
+
+        Returns:
+            Таблица скользящих средних.
+        """
+        if window < 1:
+            error = ValueError("Попытка передачи отрицательного окна.")
+            raise error
+
+        _, compact, _, lengths = self._compact()
+        shift = compact[0] if compact.shape[0] else 0.0
+        cumsum = np.zeros((compact.shape[0] + 1, compact.shape[1]))
+        np.cumsum(np.nan_to_num(compact - shift), axis=0, out=cumsum[1:])
+
+        ends = np.arange(1, compact.shape[0] + 1)
+        starts = np.maximum(ends - window, 0)
+        movavgs = (cumsum[ends] - cumsum[starts]) / (ends - starts)[:, np.newaxis] + shift
+        return self._expand(movavgs, lengths)
+
+    def _calc_movavg_timedelta(self,
+                               window: timedelta) -> DataFrame:
+        """
+        Метод вычисления скользящего среднего по интервальному окну.
+        Начала окон ищутся один раз по общему индексу.
+
+        Args:
+            window: окно, по которому вычисляется скользящее среднее.
+
+        Returns:
+            Таблица скользящих средних.
+        """
+        if window < timedelta(0):
+            error = ValueError("Попытка передачи отрицательного окна.")
+            raise error
+
+        values = self.__frame.to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        times = index_to_ns(self.index)
+        window_ns = timedelta_to_ns(window)
+        if times.size:
+            window_ns = min(window_ns, int(times[-1] - times[0]))
+        starts = np.searchsorted(times, times - window_ns, side="left")
+
+        # Сдвиг на первое непропущенное значение каждого столбца.
+        shift = np.nan_to_num(self._compact()[1][0]) if times.size else 0.0
+        sums = np.zeros((times.size + 1, values.shape[1]))
+        counts = np.zeros((times.size + 1, values.shape[1]))
+        np.cumsum(np.where(valid, values - shift, 0.0), axis=0, out=sums[1:])
+        np.cumsum(valid, axis=0, out=counts[1:])
+
+        ends = np.arange(1, times.size + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            movavgs = (sums[ends] - sums[starts]) / (counts[ends] - counts[starts]) + shift
+        movavgs[~valid] = np.nan
+        return DataFrame(movavgs, index=self.index, columns=self.__frame.columns)
+
+    def differentiate(self) -> DataFrame:
+        """
+        Метод вычисления дифференциала всех временных рядов.
+        Значение относится к более ранней из двух соседних точек.
+
+        Returns:
+            Таблица дифференциалов.
+        """
+        _, compact, times, lengths = self._compact()
+        intervals = np.diff(times, axis=0) / timedelta_to_ns(self.interval)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            diffs = np.diff(compact, axis=0) / intervals
+        return self._expand(diffs, np.maximum(lengths - 1, 0))
+
+    def calc_autocor(self,
+                     max_lag: int=None,
+                     method: str="exact") -> DataFrame:
+        """
+        Метод для вычисления автокорреляции всех временных рядов.
+        Сдвиг отсчитывается по непропущенным значениям столбца,
+        значение для сдвига k относится к k-й точке столбца.
+
+        Args:
+            max_lag: максимальный сдвиг (по умолчанию наибольший
+            допустимый среди столбцов; если ни в одном столбце нет
+            двух значений, автокорреляция не определена - таблица пропусков).
+            method: способ вычисления ("exact" или "fft"),
+            см. TimeSeriesAnalyser.calc_autocor.
+
+        Returns:
+            Таблица автокорреляций.
+        """
+        if method not in ("exact", "fft"):
+            error = ValueError("Неизвестный способ вычисления автокорреляции.")
+            raise error
+        _, compact, _, lengths = self._compact()
+        if max_lag is None:
+            max_lag = int(lengths.max(initial=0)) - 2
+            if max_lag < 0:
+                # Пропуски, как для коротких столбцов рядом с длинными: результат
+                # не зависит от того, какие столбцы обрабатываются вместе.
+                return self._expand(np.empty((0, compact.shape[1])), lengths)
+        if max_lag < 0:
+            error = ValueError("Недопустимый максимальный сдвиг.")
+            raise error
+
+        autocors = np.full((max_lag + 1, compact.shape[1]), np.nan)
+        for start in range(0, compact.shape[1], _FFT_COLUMN_BLOCK):
+            block = slice(start, start + _FFT_COLUMN_BLOCK)
+            autocors[:, block] = self._calc_autocor_block(compact[:, block],
+                                                          lengths[block],
+                                                          max_lag, method)
+        return self._expand(autocors, np.maximum(lengths - 1, 0))
+
+    def _calc_autocor_block(self,
+                            compact: np.ndarray,
+                            lengths: np.ndarray,
+                            max_lag: int,
+                            method: str) -> np.ndarray:
+        """
+        Метод вычисления автокорреляции для блока сжатых столбцов.
+
+        Args:
+            compact: сжатые значения столбцов.
+            lengths: число значений в каждом столбце.
+            max_lag: максимальный сдвиг.
+            method: способ вычисления ("exact" или "fft").
+
+        Returns:
+            Автокорреляции для сдвигов от 0 до max_lag.
+        """
+        valid = np.arange(compact.shape[0])[:, np.newaxis] < lengths
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(valid, compact, 0.0).sum(axis=0) / lengths
+        centered = np.where(valid, compact - means, 0.0)
+
+        nfft = 1 << (compact.shape[0] + max_lag).bit_length()
+        spectrum = np.fft.rfft(centered, nfft, axis=0)
+        cross = np.fft.irfft(spectrum * np.conj(spectrum), nfft, axis=0)[:max_lag+1]
+
+        lags = np.arange(max_lag + 1)[:, np.newaxis]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if method == "fft":
+                autocors = cross / cross[0]
+            else:
+                sums = np.zeros((compact.shape[0] + 1, compact.shape[1]))
+                squares = np.zeros((compact.shape[0] + 1, compact.shape[1]))
+                np.cumsum(centered, axis=0, out=sums[1:])
+                np.cumsum(centered * centered, axis=0, out=squares[1:])
+
+                seg_lengths = lengths - lags
+                ends = np.maximum(seg_lengths, 0)
+                total = np.take_along_axis(sums, lengths[np.newaxis, :], axis=0)
+                total_sq = np.take_along_axis(squares, lengths[np.newaxis, :], axis=0)
+                head = sums[:max_lag+1]
+                head_sq = squares[:max_lag+1]
+                tail = np.take_along_axis(sums, ends, axis=0)
+                tail_sq = np.take_along_axis(squares, ends, axis=0)
+
+                avg_x = (total - head) / seg_lengths
+                avg_y = tail / seg_lengths
+                var_x = np.maximum((total_sq - head_sq) / seg_lengths - avg_x * avg_x, 0.0)
+                var_y = np.maximum(tail_sq / seg_lengths - avg_y * avg_y, 0.0)
+                autocors = (cross / seg_lengths - avg_x * avg_y) / np.sqrt(var_x * var_y)
+
+        autocors[lags >= lengths - 1] = np.nan
+        return autocors
+
+    def calc_crosscor(self,
+                      lags: int|list[int]=0,
+                      top_k: int=None,
+                      min_periods: int=2) -> DataFrame:
+        """
+        Метод вычисления взаимной корреляции всех пар временных рядов.
+        Значение для сдвига k в строке i и столбце j - корреляция
+        frame[i] в момент t+k и frame[j] в момент t (ряд j опережает ряд i
+        на k строк общего индекса). Для каждой пары учитываются только
+        строки, где оба значения не пропущены. Матрица для одного сдвига
+        вычисляется несколькими матричными произведениями на все пары сразу.
+
+        Args:
+            lags: сдвиг или список сдвигов в строках (могут быть отрицательными).
+            top_k: если задан, возвращаются только top_k пар с наибольшей
+            по модулю корреляцией (без пар ряда с самим собой).
+            min_periods: наименьшее число общих точек пары (иначе NaN).
+
+        Returns:
+            Таблица матриц корреляции с индексом (Lag, столбец) и столбцами
+            таблицы рядов, при заданном top_k - таблица пар со столбцами
+            Lag, First, Second, Crosscor по убыванию модуля корреляции.
+        """
+        if isinstance(lags, (int, np.integer)):
+            lags = [lags]
+        lags = [int(lag) for lag in lags]
+        values = self.__frame.to_numpy(dtype=float)
+        if any(abs(lag) >= values.shape[0] for lag in lags):
+            error = ValueError("Сдвиг должен быть меньше длины рядов.")
+            raise error
+        if top_k is not None and top_k < 1:
+            error = ValueError("Недопустимое число пар.")
+            raise error
+
+        valid = ~np.isnan(values)
+        # Столбцы центрируются заранее, чтобы суммы квадратов не теряли точность.
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(valid, values, 0.0).sum(axis=0) / valid.sum(axis=0)
+        centered = np.where(valid, values - np.nan_to_num(means), 0.0)
+
+        matrices = {}
+        for lag in sorted(set(abs(lag) for lag in lags)):
+            matrices[lag] = self._calc_crosscor_matrix(centered, valid, lag, min_periods)
+        crosscors = [matrices[lag] if lag >= 0 else matrices[-lag].T for lag in lags]
+
+        columns = self.__frame.columns
+        if top_k is None:
+            index = MultiIndex.from_product([lags, columns], names=["Lag", columns.name])
+            return DataFrame(np.concatenate(crosscors), index=index, columns=columns)
+
+        # Пары без самих рядов, при нулевом сдвиге - по одному разу (матрица
+        # симметрична). Сдвиг -k повторяет транспонированный сдвиг k.
+        size = len(columns)
+        firsts, seconds = np.divmod(np.arange(size * size), size)
+        pair_lags, pair_firsts, pair_seconds, pair_values = [], [], [], []
+        for lag, matrix in zip(lags, crosscors):
+            if lag < 0 and -lag in lags:
+                continue
+            keep = firsts < seconds if lag == 0 else firsts != seconds
+            keep &= ~np.isnan(matrix.ravel())
+            pair_lags.append(np.full(int(keep.sum()), lag))
+            pair_firsts.append(firsts[keep])
+            pair_seconds.append(seconds[keep])
+            pair_values.append(matrix.ravel()[keep])
+        pair_values = np.concatenate(pair_values)
+        top = np.argsort(-np.abs(pair_values), kind="stable")[:top_k]
+        return DataFrame({"Lag": np.concatenate(pair_lags)[top],
+                          "First": columns[np.concatenate(pair_firsts)[top]],
+                          "Second": columns[np.concatenate(pair_seconds)[top]],
+                          "Crosscor": pair_values[top]})
+
+    @staticmethod
+    def _calc_crosscor_matrix(centered: np.ndarray,
+                              valid: np.ndarray,
+                              lag: int,
+                              min_periods: int) -> np.ndarray:
+        """
+        Метод вычисления матрицы взаимной корреляции для одного сдвига.
+        Суммы по общим точкам пар - произведения матриц значений
+        и матриц признаков непропущенных значений.
+
+        Args:
+            centered: центрированные значения (пропуски заменены нулями).
+            valid: признаки непропущенных значений.
+            lag: неотрицательный сдвиг в строках.
+            min_periods: наименьшее число общих точек пары.
+
+        Returns:
+            Матрица корреляций размера число рядов на число рядов.
+        """
+        rows = centered.shape[0]
+        later, earlier = centered[lag:], centered[:rows - lag]
+        products = later.T @ earlier
+        if valid.all():
+            # Без пропусков суммы по парам не зависят от второго ряда пары.
+            counts = np.full(products.shape, float(rows - lag))
+            sums_x = later.sum(axis=0)[:, np.newaxis]
+            sums_y = earlier.sum(axis=0)[np.newaxis, :]
+            squares_x = (later * later).sum(axis=0)[:, np.newaxis]
+            squares_y = (earlier * earlier).sum(axis=0)[np.newaxis, :]
+        else:
+            valid_x = valid[lag:].astype(float)
+            valid_y = valid[:rows - lag].astype(float)
+            counts = valid_x.T @ valid_y
+            sums_x = later.T @ valid_y
+            sums_y = valid_x.T @ earlier
+            squares_x = (later * later).T @ valid_y
+            squares_y = valid_x.T @ (earlier * earlier)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covs = products - sums_x * sums_y / counts
+            vars_x = np.maximum(squares_x - sums_x * sums_x / counts, 0.0)
+            vars_y = np.maximum(squares_y - sums_y * sums_y / counts, 0.0)
+            crosscors = covs / np.sqrt(vars_x * vars_y)
+        crosscors[counts < max(min_periods, 2)] = np.nan
+        return crosscors
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,80 @@
+"""
+Модуль кэша вычисленных результатов.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """
+    Ограниченный кэш с вытеснением давно не использованных записей.
+    """
+    def __init__(self,
+                 maxsize: int=32):
+        """
+        Args:
+            maxsize: максимальное число записей в кэше.
+        """
+        if maxsize < 1:
+            error = ValueError("Размер кэша должен быть положительным.")
+            raise error
+        self.__maxsize = maxsize
+        self.__items = OrderedDict()
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Свойство максимального числа записей.
+
+        Returns:
+            Максимальное число записей в кэше.
+        """
+        return self.__maxsize
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__items
+
+    def get_or_compute(self,
+                       key: Hashable,
+                       compute: Callable[[], Any]) -> Any:
+        """
+        Метод получения значения из кэша. Если значения нет,
+        оно вычисляется и сохраняется.
+
+        Args:
+            key: ключ записи.
+            compute: функция вычисления значения.
+
+        Returns:
+            Значение из кэша.
+        """
+        if key in self.__items:
+            self.__items.move_to_end(key)
+            return self.__items[key]
+        value = compute()
+        self.__items[key] = value
+        if len(self.__items) > self.__maxsize:
+            self.__items.popitem(last=False)
+        return value
+
+    def invalidate(self,
+                   *names: str) -> None:
+        """
+        Метод удаления записей из кэша.
+
+        Args:
+            names: имена результатов, записи которых нужно удалить
+            (первый элемент ключа). Без аргументов кэш очищается полностью.
+        """
+        if not names:
+            self.__items.clear()
+            return
+        for key in [key for key in self.__items if key[0] in names]:
+            del self.__items[key]
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,337 @@
+"""
+Модуль обработки временных рядов, не помещающихся в память.
+"""
+import numpy as np
+from pandas import Series
+from datetime import timedelta
+
+from time_series.time_series.core import timedelta_to_ns
+
+
+class _MovavgStage:
+    """
+    Этап скользящего среднего. Между блоками переносятся префиксные
+    суммы, префиксные числа пропусков и метки времени точек, которые
+    еще могут попасть в окно, и сдвиг (первое непропущенное значение
+    ряда). Вычисления повторяют core.window_avgs операция в операцию,
+    поэтому результат совпадает с вычислением над всем рядом бит в бит.
+    """
+    def __init__(self,
+                 window: int|timedelta):
+        """
+        Args:
+            window: окно скользящего среднего (в точках или во времени).
+        """
+        if isinstance(window, timedelta):
+            if window < timedelta(0):
+                error = ValueError("Попытка передачи отрицательного окна.")
+                raise error
+            window = timedelta_to_ns(window)
+            self.__by_time = True
+        else:
+            if window < 1:
+                error = ValueError("Попытка передачи отрицательного окна.")
+                raise error
+            self.__by_time = False
+        self.__window = window
+        self.__shift = None
+        self.__first = None
+        self.__size = 0
+        # Префиксные суммы и числа пропусков с номером base и следующие
+        # за ними, метки времени точек с номерами от base.
+        self.__base = 0
+        self.__sums = np.zeros(1)
+        self.__nans = np.zeros(1, dtype=np.int64)
+        self.__times = np.empty(0, dtype=np.int64)
+
+    def push(self,
+             times: np.ndarray,
+             values: np.ndarray) -> np.ndarray:
+        """
+        Метод обработки очередного блока.
+
+        Args:
+            times: метки времени блока (int64, нс).
+            values: значения блока.
+
+        Returns:
+            Скользящее среднее для точек блока.
+        """
+        size = values.size
+        if size == 0:
+            return np.empty(0)
+        if self.__first is None:
+            self.__first = int(times[0])
+        isnan = np.isnan(values)
+        if self.__shift is None and not isnan.all():
+            # Пропуски до первого значения дают нулевые суммы при любом сдвиге.
+            self.__shift = float(values[np.flatnonzero(~isnan)[0]])
+        shift = 0.0 if self.__shift is None else self.__shift
+
+        kept = self.__sums.size
+        sums = np.empty(kept + size, dtype=np.float64)
+        sums[:kept] = self.__sums
+        np.subtract(values, shift, out=sums[kept:])
+        sums[kept:][isnan] = 0.0
+        np.cumsum(sums[kept - 1:], out=sums[kept - 1:])
+        nans = np.empty(kept + size, dtype=np.int64)
+        nans[:kept] = self.__nans
+        nans[kept:] = isnan
+        np.cumsum(nans[kept - 1:], out=nans[kept - 1:])
+
+        positions = np.arange(self.__size, self.__size + size)
+        if self.__by_time:
+            all_times = np.concatenate((self.__times, times))
+            # Ограничение окна защищает от переполнения int64.
+            window = min(self.__window, int(times[-1]) - self.__first)
+            starts = self.__base + np.searchsorted(all_times, times - window, side="left")
+        else:
+            starts = np.maximum(positions - self.__window + 1, 0)
+
+        out = sums[starts - self.__base]
+        np.subtract(sums[positions + 1 - self.__base], out, out=out)
+        np.divide(out, positions + 1 - starts, out=out)
+        np.add(out, shift, out=out)
+        # Окно с пропуском дает пропуск.
+        out[nans[positions + 1 - self.__base] - nans[starts - self.__base] > 0] = np.nan
+
+        # Окна следующих точек начинаются не раньше окна последней.
+        last = int(starts[-1])
+        self.__sums = sums[last - self.__base:].copy()
+        self.__nans = nans[last - self.__base:].copy()
+        if self.__by_time:
+            self.__times = all_times[last - self.__base:].copy()
+        self.__base = last
+        self.__size += size
+        return out
+
+
+class _DiffStage:
+    """
+    Этап дифференцирования. Между блоками переносится последняя точка,
+    поэтому дифференциал точки выдается вместе со следующим блоком.
+    """
+    def __init__(self,
+                 interval: timedelta):
+        """
+        Args:
+            interval: интервал для дифференцирования.
+        """
+        self.__interval = timedelta_to_ns(interval)
+        self.__time = None
+        self.__value = None
+
+    def push(self,
+             times: np.ndarray,
+             values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Метод обработки очередного блока.
+
+        Args:
+            times: метки времени блока (int64, нс).
+            values: значения блока.
+
+        Returns:
+            Метки времени и дифференциал для точек, следующие
+            точки которых уже получены.
+        """
+        if values.size == 0:
+            return times[:0], np.empty(0)
+        if self.__time is not None:
+            times = np.concatenate(([self.__time], times))
+            values = np.concatenate(([self.__value], values))
+        self.__time = int(times[-1])
+        self.__value = float(values[-1])
+
+        diffs = np.subtract(values[1:], values[:-1])
+        np.divide(diffs, np.diff(times) / self.__interval, out=diffs)
+        return times[:-1], diffs
+
+
+class _AutocorStage:
+    """
+    Этап автокорреляции. Копятся суммы значений, их квадратов и
+    произведений values[i+k]*values[i] для сдвигов до max_lag.
+    Между блоками переносятся последние max_lag значений, первые
+    max_lag+1 значений и их метки времени хранятся для итоговой формулы.
+    Значения сдвигаются на первое значение ряда, чтобы суммы
+    не теряли точность.
+    """
+    def __init__(self,
+                 max_lag: int):
+        """
+        Args:
+            max_lag: максимальный сдвиг.
+        """
+        if max_lag < 0:
+            error = ValueError("Недопустимый максимальный сдвиг.")
+            raise error
+        self.__max_lag = max_lag
+        self.__shift = None
+        self.__size = 0
+        self.__total = 0.0
+        self.__squares = 0.0
+        self.__products = np.zeros(max_lag + 1)
+        self.__head = np.empty(0)
+        self.__head_times = np.empty(0, dtype=np.int64)
+        self.__tail = np.empty(0)
+
+    def push(self,
+             times: np.ndarray,
+             values: np.ndarray) -> None:
+        """
+        Метод обработки очередного блока.
+
+        Args:
+            times: метки времени блока (int64, нс).
+            values: значения блока.
+        """
+        if values.size == 0:
+            return
+        if self.__shift is None:
+            self.__shift = float(values[0])
+        lag = self.__max_lag
+        shifted = np.subtract(values, self.__shift, dtype=np.float64)
+
+        # Произведения пар, правая точка которых лежит в блоке:
+        # перед блоком - перенесенный хвост, дополненный нулями до max_lag.
+        extended = np.zeros(lag + shifted.size)
+        extended[lag - self.__tail.size:lag] = self.__tail
+        extended[lag:] = shifted
+        nfft = 1 << (extended.size - 1).bit_length()
+        cross = np.fft.irfft(np.fft.rfft(extended, nfft) *
+                             np.conj(np.fft.rfft(shifted, nfft)), nfft)
+        self.__products += cross[lag::-1]
+
+        self.__total += float(shifted.sum())
+        self.__squares += float(np.dot(shifted, shifted))
+        if self.__head.size <= lag:
+            need = lag + 1 - self.__head.size
+            self.__head = np.concatenate((self.__head, shifted[:need]))
+            self.__head_times = np.concatenate((self.__head_times, times[:need]))
+        self.__tail = extended[-lag:].copy() if lag else self.__tail
+        self.__size += shifted.size
+
+    def result(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Метод вычисления автокорреляции по накопленным суммам
+        (та же формула, что и в core.autocor с method="exact").
+
+        Returns:
+            Метки времени первых max_lag+1 точек и автокорреляция.
+        """
+        lag = self.__max_lag
+        if lag > self.__size - 2:
+            error = ValueError("Недопустимый максимальный сдвиг.")
+            raise error
+        tail = self.__tail[::-1]
+        head_sums = np.concatenate(([0.0], np.cumsum(self.__head[:lag])))
+        head_squares = np.concatenate(([0.0], np.cumsum(self.__head[:lag] ** 2)))
+        tail_sums = np.concatenate(([0.0], np.cumsum(tail[:lag])))
+        tail_squares = np.concatenate(([0.0], np.cumsum(tail[:lag] ** 2)))
+
+        lengths = self.__size - np.arange(lag + 1)
+        avg_x = (self.__total - head_sums) / lengths
+        avg_y = (self.__total - tail_sums) / lengths
+        var_x = np.maximum((self.__squares - head_squares) / lengths - avg_x * avg_x, 0.0)
+        var_y = np.maximum((self.__squares - tail_squares) / lengths - avg_y * avg_y, 0.0)
+        avg_xy = self.__products / lengths
+        return self.__head_times, (avg_xy - avg_x * avg_y) / np.sqrt(var_x * var_y)
+
+
+class ChunkedAnalyser:
+    """
+    Класс обработки временного ряда из хранилища MemmapStore блоками
+    фиксированной длины. Каждый этап (скользящее среднее, дифференциал,
+    автокорреляция) переносит свое состояние между блоками, результаты
+    дописываются в хранилище по мере вычисления. Память ограничена
+    длиной блока, окном скользящего среднего и максимальным сдвигом,
+    а не длиной ряда. Результаты совпадают с TimeSeriesAnalyser:
+    скользящее среднее и дифференциал - бит в бит, автокорреляция -
+    с точностью до округления.
+    """
+    def __init__(self,
+                 store,
+                 sheet: str,
+                 chunk_size: int=1_000_000):
+        """
+        Args:
+            store: хранилище MemmapStore с исходным рядом.
+            sheet: название исходного ряда.
+            chunk_size: число точек в блоке.
+        """
+        if chunk_size < 1:
+            error = ValueError("Недопустимая длина блока.")
+            raise error
+        self.__store = store
+        self.__sheet = sheet
+        self.__chunk_size = chunk_size
+
+    def run(self,
+            window: int|timedelta,
+            interval: timedelta,
+            max_lag: int=None,
+            chained: bool=True,
+            output=None) -> dict[str, str]:
+        """
+        Метод обработки ряда за один проход по хранилищу.
+        Результаты сохраняются рядами [sheet]_Movavg, [sheet]_Diff
+        и [sheet]_Autocor (прежние ряды с этими названиями удаляются).
+
+        Args:
+            window: окно скользящего среднего.
+            interval: интервал для дифференцирования.
+            max_lag: максимальный сдвиг автокорреляции
+            (без автокорреляции, если не задан).
+            chained: считать ли дифференциал и автокорреляцию по скользящему
+            среднему (как Host), а не по исходному ряду.
+            output: хранилище результатов (по умолчанию - исходное).
+
+        Returns:
+            Названия сохраненных рядов с ключами Movavg, Diff, Autocor.
+        """
+        store = self.__store
+        output = store if output is None else output
+        meta = store.meta(self.__sheet)
+        names = {name: f"{self.__sheet}_{name}" for name in ("Movavg", "Diff", "Autocor")}
+        for name in names.values():
+            output.delete(name)
+        if max_lag is None:
+            del names["Autocor"]
+
+        movavg = _MovavgStage(window)
+        diff = _DiffStage(interval)
+        autocor = _AutocorStage(max_lag) if max_lag is not None else None
+        for times, values in store.iter_chunks(self.__sheet, self.__chunk_size):
+            averages = movavg.push(times, values)
+            output.append_arrays(names["Movavg"], times, averages, meta["tz"], "Movavg")
+            source = averages if chained else values
+            diff_times, diffs = diff.push(times, source)
+            output.append_arrays(names["Diff"], diff_times, diffs, meta["tz"], "Diff")
+            if autocor is not None:
+                autocor.push(times, source)
+
+        if autocor is not None:
+            times, autocors = autocor.result()
+            output.append_arrays(names["Autocor"], times, autocors, meta["tz"], "Autocor")
+        return names
+
+    def load(self,
+             names: dict[str, str],
+             output=None) -> dict[str, Series]:
+        """
+        Метод выгрузки сохраненных результатов (без копирования в память).
+
+        Args:
+            names: названия рядов, возвращенные методом run.
+            output: хранилище результатов (по умолчанию - исходное).
+
+        Returns:
+            Ряды результатов с ключами Movavg, Diff, Autocor.
+        """
+        output = self.__store if output is None else output
+        return {name: output.load(sheet) for name, sheet in names.items()}
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,890 @@
+"""
+Модуль низкоуровневых функций обработки временных рядов.
+
+Функции работают с массивами NumPy без pandas: метки времени -
+int64 в наносекундах, значения - float64 или float32. Результат
+записывается в заранее выделенный буфер out (если передан), иначе
+в новый массив типа dtype. Режим float32 уменьшает объем результатов,
+накопление сумм при этом ведется в float64.
+"""
+import numpy as np
+from pandas import Index, Timedelta
+from collections import deque
+from datetime import timedelta
+
+
+def index_to_ns(index: Index) -> np.ndarray:
+    """
+    Функция перевода временного индекса в массив наносекунд.
+
+    Args:
+        index: временной индекс ряда.
+
+    Returns:
+        Массив int64 с метками времени в наносекундах.
+    """
+    return np.asarray(index.to_numpy(dtype="datetime64[ns]")).view(np.int64)
+
+
+def timedelta_to_ns(delta: timedelta) -> int:
+    """
+    Функция перевода временного периода в наносекунды.
+
+    Args:
+        delta: временной период.
+
+    Returns:
+        Длина периода в наносекундах.
+    """
+    if isinstance(delta, Timedelta):
+        return int(delta.value)
+    # Целочисленное деление не переполняется на очень длинных периодах.
+    return (delta // timedelta(microseconds=1)) * 1000
+
+
+def _calc_left_bases(levels: np.ndarray,
+                     is_peak: np.ndarray) -> np.ndarray:
+    """
+    Функция поиска левых оснований пиков: минимума ряда между пиком
+    и ближайшей слева точкой, которая выше пика (или началом ряда).
+
+    Args:
+        levels: значения ряда без плато.
+        is_peak: маска пиков.
+
+    Returns:
+        Левые основания для каждого пика.
+    """
+    # Минимумы между соседними пиками считаются векторно,
+    # в цикле обрабатываются только сами пики.
+    peaks = np.flatnonzero(is_peak)
+    gaps = np.minimum.reduceat(levels, np.concatenate(([0], peaks)))[:peaks.size]
+
+    bases = []
+    heights = [np.inf]
+    mins_before = [np.inf]
+    for level, current in zip(levels[peaks].tolist(), gaps.tolist()):
+        while heights[-1] <= level:
+            heights.pop()
+            before = mins_before.pop()
+            if before < current:
+                current = before
+        bases.append(current)
+        heights.append(level)
+        mins_before.append(current)
+    return np.array(bases, dtype=float)
+
+
+def _calc_prominences(levels: np.ndarray,
+                      is_peak: np.ndarray) -> np.ndarray:
+    """
+    Функция вычисления выраженности пиков ряда.
+
+    Args:
+        levels: значения ряда без плато.
+        is_peak: маска пиков.
+
+    Returns:
+        Массив выраженностей (для точек, не являющихся пиками, - 0).
+    """
+    prominences = np.zeros(levels.size, dtype=float)
+    if not is_peak.any():
+        return prominences
+    left = _calc_left_bases(levels, is_peak)
+    right = _calc_left_bases(levels[::-1], is_peak[::-1])[::-1]
+    prominences[is_peak] = levels[is_peak] - np.maximum(left, right)
+    return prominences
+
+
+def _select_by_distance(coords: np.ndarray,
+                        levels: np.ndarray,
+                        is_peak: np.ndarray,
+                        distance: int) -> np.ndarray:
+    """
+    Функция прореживания пиков: из пиков, расположенных ближе
+    distance друг к другу, остаются наиболее высокие.
+
+    Args:
+        coords: координаты точек (позиции или время).
+        levels: значения ряда без плато.
+        is_peak: маска пиков.
+        distance: минимальное расстояние между пиками.
+
+    Returns:
+        Маска оставшихся пиков.
+    """
+    peaks = np.flatnonzero(is_peak)
+    peak_coords = coords[peaks].tolist()
+    keep = np.ones(peaks.size, dtype=bool)
+    for i in np.argsort(levels[peaks], kind="stable")[::-1].tolist():
+        if not keep[i]:
+            continue
+        j = i - 1
+        while j >= 0 and peak_coords[i] - peak_coords[j] < distance:
+            keep[j] = False
+            j -= 1
+        j = i + 1
+        while j < peaks.size and peak_coords[j] - peak_coords[i] < distance:
+            keep[j] = False
+            j += 1
+
+    selected = np.zeros(levels.size, dtype=bool)
+    selected[peaks[keep]] = True
+    return selected
+
+
+def _prepare_out(out: np.ndarray,
+                 size: int,
+                 dtype: type) -> np.ndarray:
+    """
+    Функция подготовки буфера результата.
+
+    Args:
+        out: буфер результата или None.
+        size: длина результата.
+        dtype: тип нового буфера (если out не передан).
+
+    Returns:
+        Буфер результата.
+    """
+    if out is None:
+        return np.empty(size, dtype=dtype)
+    if out.shape != (size,):
+        error = ValueError("Неверный размер буфера результата.")
+        raise error
+    return out
+
+
+def _first_valid(values: np.ndarray,
+                 nans: np.ndarray) -> float:
+    """
+    Функция получения первого непропущенного значения ряда.
+
+    Args:
+        values: значения ряда.
+        nans: признаки пропусков.
+
+    Returns:
+        Первое значение, не равное NaN (0.0, если таких нет).
+    """
+    valid = np.flatnonzero(~nans)
+    return float(values[valid[0]]) if valid.size else 0.0
+
+
+def _fill_nans(values: np.ndarray,
+               nans: np.ndarray) -> np.ndarray:
+    """
+    Функция замены пропусков предыдущим непропущенным значением
+    (пропуски в начале - первым непропущенным).
+
+    Args:
+        values: значения ряда.
+        nans: признаки пропусков.
+
+    Returns:
+        Значения без пропусков (float64).
+    """
+    positions = np.where(nans, 0, np.arange(values.size))
+    np.maximum.accumulate(positions, out=positions)
+    filled = np.asarray(values, dtype=np.float64)[positions]
+    filled[np.isnan(filled)] = _first_valid(values, nans)
+    return filled
+
+
+def _nan_windows(nans: np.ndarray,
+                 starts: np.ndarray) -> np.ndarray:
+    """
+    Функция поиска окон [starts[i], i], в которых есть пропуск.
+
+    Args:
+        nans: признаки пропусков.
+        starts: позиции начала окна для каждой точки ряда.
+
+    Returns:
+        Признаки окон с пропусками.
+    """
+    counts = np.concatenate(([0], np.cumsum(nans)))
+    return counts[1:] - counts[starts] > 0
+
+
+def infer_interval(times: np.ndarray) -> int:
+    """
+    Функция вычисления минимального интервала между соседними точками.
+
+    Args:
+        times: метки времени (int64, нс), по возрастанию.
+
+    Returns:
+        Минимальный интервал в наносекундах.
+    """
+    if times.size < 2:
+        error = ValueError("Для вычисления интервала нужны хотя бы две точки.")
+        raise error
+    return int(np.diff(times).min())
+
+
+def differentiate(times: np.ndarray,
+                  values: np.ndarray,
+                  interval: int,
+                  out: np.ndarray=None,
+                  dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления дифференциала ряда: разности соседних значений,
+    деленные на расстояние между точками в единицах interval.
+
+    Args:
+        times: метки времени (int64, нс).
+        values: значения ряда.
+        interval: интервал для дифференцирования в наносекундах.
+        out: буфер результата длины size-1.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Дифференциал для каждой точки, кроме последней.
+    """
+    size = max(values.size - 1, 0)
+    out = _prepare_out(out, size, dtype)
+    if size == 0:
+        return out
+    np.subtract(values[1:], values[:-1], out=out)
+    np.divide(out, np.diff(times) / interval, out=out)
+    return out
+
+
+def window_avgs(values: np.ndarray,
+                starts: np.ndarray,
+                out: np.ndarray=None,
+                dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления средних значений ряда по окнам
+    [starts[i], i] с помощью префиксных сумм. Среднее окна,
+    в котором есть пропуск (NaN), равно NaN, остальные окна
+    пропуски не затрагивают.
+
+    Args:
+        values: значения ряда.
+        starts: позиции начала окна для каждой точки ряда.
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Средние значения ряда по окнам.
+    """
+    size = values.size
+    out = _prepare_out(out, size, dtype)
+    if size == 0:
+        return out
+
+    # Префиксные суммы считаются в float64 по значениям, сдвинутым
+    # на первое непропущенное значение ряда, чтобы уменьшить потерю точности.
+    nans = np.isnan(values)
+    has_nans = bool(nans.any())
+    shift = _first_valid(values, nans) if has_nans else float(values[0])
+    cumsum = np.empty(size + 1, dtype=np.float64)
+    cumsum[0] = 0.0
+    np.subtract(values, shift, out=cumsum[1:])
+    if has_nans:
+        # Пропуски не входят в суммы, окна с пропусками дают NaN.
+        cumsum[1:][nans] = 0.0
+    np.cumsum(cumsum[1:], out=cumsum[1:])
+
+    sums = cumsum[starts]
+    np.subtract(cumsum[1:], sums, out=sums)
+    np.divide(sums, np.arange(1, size + 1) - starts, out=sums)
+    np.add(sums, shift, out=out)
+    if has_nans:
+        out[_nan_windows(nans, starts)] = np.nan
+    return out
+
+
+def window_starts_points(size: int,
+                         window: int) -> np.ndarray:
+    """
+    Функция вычисления начал окон из window точек: окно точки i - [starts[i], i].
+
+    Args:
+        size: длина ряда.
+        window: число точек в окне.
+
+    Returns:
+        Позиции начала окна для каждой точки ряда.
+    """
+    if window < 1:
+        error = ValueError("Попытка передачи отрицательного окна.")
+        raise error
+    return np.maximum(np.arange(1 - window, size + 1 - window), 0)
+
+
+def window_starts_time(times: np.ndarray,
+                       window: int) -> np.ndarray:
+    """
+    Функция вычисления начал временных окон: в окно точки входят
+    точки не раньше, чем за window до нее.
+
+    Args:
+        times: метки времени (int64, нс).
+        window: длина окна в наносекундах.
+
+    Returns:
+        Позиции начала окна для каждой точки ряда.
+    """
+    if window < 0:
+        error = ValueError("Попытка передачи отрицательного окна.")
+        raise error
+    if times.size:
+        # Ограничение окна защищает от переполнения int64.
+        window = min(window, int(times[-1] - times[0]))
+    return np.searchsorted(times, times - window, side="left")
+
+
+def movavg_points(values: np.ndarray,
+                  window: int,
+                  out: np.ndarray=None,
+                  dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления скользящего среднего по окну из window точек.
+
+    Args:
+        values: значения ряда.
+        window: число точек в окне.
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Скользящее среднее.
+    """
+    return window_avgs(values, window_starts_points(values.size, window), out, dtype)
+
+
+def movavg_time(times: np.ndarray,
+                values: np.ndarray,
+                window: int,
+                out: np.ndarray=None,
+                dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления скользящего среднего по временному окну:
+    для каждой точки усредняются точки не раньше, чем за window до нее.
+
+    Args:
+        times: метки времени (int64, нс).
+        values: значения ряда.
+        window: длина окна в наносекундах.
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Скользящее среднее.
+    """
+    return window_avgs(values, window_starts_time(times, window), out, dtype)
+
+
+# Наибольшее затухание внутри блока экспоненциального среднего (в показателе
+# экспоненты): масштабные множители блока не превышают exp(500).
+_EMA_BLOCK_DECAY = 500.0
+# Затухание за один шаг ограничивается: exp(-40) меньше точности float64.
+_EMA_STEP_DECAY = 40.0
+
+
+def ema(values: np.ndarray,
+        log_decays: np.ndarray,
+        out: np.ndarray=None,
+        dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления экспоненциального скользящего среднего
+    y[i] = d[i] * y[i-1] + (1 - d[i]) * x[i], y[0] = x[0], где d[i] = exp(log_decays[i]).
+    Рекуррентная формула заменяется префиксными суммами значений,
+    масштабированных на накопленное затухание. Чтобы множители не
+    переполнялись, ряд делится на блоки с ограниченным затуханием,
+    последовательно переносится только одно значение между блоками.
+    Пропуски (NaN) пропускаются: в них повторяется предыдущее значение
+    среднего, до первого непропущенного значения результат равен NaN.
+
+    Args:
+        values: значения ряда.
+        log_decays: логарифмы затухания для каждой точки (<= 0).
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Экспоненциальное скользящее среднее.
+    """
+    size = values.size
+    out = _prepare_out(out, size, dtype)
+    if size == 0:
+        return out
+
+    steps = np.maximum(np.asarray(log_decays, dtype=np.float64), -_EMA_STEP_DECAY)
+    nans = np.isnan(values)
+    first = 0
+    if nans.any():
+        # Пропуск не меняет среднее: нет ни затухания, ни нового значения.
+        first = int(np.argmin(nans)) if not nans.all() else size - 1
+        steps[nans] = 0.0
+        steps[:first] = 0.0
+        values = np.where(nans, 0.0, values)
+    steps[first] = 0.0
+    levels = np.cumsum(steps)
+    weights = (1.0 - np.exp(steps)) * values
+
+    blocks = np.floor(-levels / _EMA_BLOCK_DECAY)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(blocks)) + 1, [size]))
+    carry = float(values[first])
+    previous = levels[0]
+    for start, end in zip(starts[:-1].tolist(), starts[1:].tolist()):
+        base = levels[start]
+        sums = np.cumsum(weights[start:end] * np.exp(base - levels[start:end]))
+        sums += carry * np.exp(base - previous)
+        np.multiply(sums, np.exp(levels[start:end] - base), out=out[start:end])
+        carry = float(sums[-1] * np.exp(levels[end - 1] - base))
+        previous = levels[end - 1]
+    if nans[first]:
+        out[:] = np.nan
+    else:
+        out[:first] = np.nan
+    return out
+
+
+def ema_points(values: np.ndarray,
+               window: int,
+               out: np.ndarray=None,
+               dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления экспоненциального скользящего среднего
+    с коэффициентом alpha = 2 / (window + 1).
+
+    Args:
+        values: значения ряда.
+        window: окно в точках.
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Экспоненциальное скользящее среднее.
+    """
+    if window < 1:
+        error = ValueError("Попытка передачи отрицательного окна.")
+        raise error
+    alpha = 2.0 / (window + 1)
+    decay = np.log1p(-alpha) if alpha < 1 else -np.inf
+    return ema(values, np.full(values.size, decay), out, dtype)
+
+
+def ema_time(times: np.ndarray,
+             values: np.ndarray,
+             window: int,
+             out: np.ndarray=None,
+             dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления экспоненциального скользящего среднего
+    нерегулярного ряда: вес предыдущего значения равен exp(-dt / window),
+    где dt - время от предыдущей непропущенной точки.
+
+    Args:
+        times: метки времени (int64, нс).
+        values: значения ряда.
+        window: постоянная времени в наносекундах.
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Экспоненциальное скользящее среднее.
+    """
+    if window <= 0:
+        error = ValueError("Попытка передачи отрицательного окна.")
+        raise error
+    log_decays = np.empty(values.size, dtype=np.float64)
+    if values.size:
+        log_decays[0] = 0.0
+        nans = np.isnan(values)
+        if nans.any():
+            # Затухание отсчитывается от предыдущей непропущенной точки.
+            positions = np.where(nans, 0, np.arange(values.size))
+            np.maximum.accumulate(positions, out=positions)
+            np.divide(times[positions[:-1]] - times[1:], window, out=log_decays[1:])
+        else:
+            np.divide(-np.diff(times), window, out=log_decays[1:])
+    return ema(values, log_decays, out, dtype)
+
+
+def rolling_var(values: np.ndarray,
+                starts: np.ndarray,
+                ddof: int=1,
+                out: np.ndarray=None,
+                dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления дисперсии по окнам [starts[i], i].
+    Ряд делится на блоки не короче самого длинного окна, поэтому каждое
+    окно состоит из конца одного блока и начала следующего. Суммы внутри
+    блока считаются относительно его первого значения, а части окна
+    объединяются формулой Чана (параллельный вариант Уэлфорда),
+    поэтому точность не зависит от длины ряда и уровня значений.
+
+    Args:
+        values: значения ряда.
+        starts: позиции начала окна для каждой точки ряда (не убывают).
+        ddof: поправка числа степеней свободы (1 - несмещенная оценка).
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Дисперсия по окнам (NaN, если в окне не больше ddof точек
+        или есть пропуск).
+    """
+    size = values.size
+    out = _prepare_out(out, size, dtype)
+    if size == 0:
+        return out
+
+    # Пропуски заменяются соседними значениями, чтобы не портить суммы
+    # блока, а окна с пропусками дают NaN.
+    nans = np.isnan(values)
+    has_nans = bool(nans.any())
+    if has_nans:
+        values = _fill_nans(values, nans)
+
+    ends = np.arange(size)
+    block = int((ends - starts).max()) + 1
+    nblocks = -(-size // block)
+    firsts = np.asarray(values[::block], dtype=np.float64)
+
+    # Суммы отклонений от первого значения блока, накопленные с начала блока.
+    deviations = np.zeros(nblocks * block, dtype=np.float64)
+    np.subtract(values, np.repeat(firsts, block)[:size], out=deviations[:size])
+    deviations = deviations.reshape(nblocks, block)
+    sums = np.cumsum(deviations, axis=1).ravel()
+    squares = np.cumsum(deviations * deviations, axis=1).ravel()
+
+    def part(lo, hi):
+        # Число точек, среднее (от точки отсчета блока) и сумма квадратов
+        # отклонений от среднего для отрезков [lo, hi] внутри одного блока.
+        inside = lo % block > 0
+        before = np.maximum(lo - 1, 0)
+        count = (hi - lo + 1).astype(np.float64)
+        total = sums[hi] - np.where(inside, sums[before], 0.0)
+        square = squares[hi] - np.where(inside, squares[before], 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+        return count, mean, np.maximum(square - total * mean, 0.0)
+
+    # Окно - конец блока start (если окно начинается в предыдущем блоке)
+    # и начало блока end.
+    block_starts = ends - ends % block
+    spans = starts < block_starts
+    count_b, mean_b, m2_b = part(np.maximum(starts, block_starts), ends)
+    count_a, mean_a, m2_a = part(starts, np.where(spans, block_starts - 1, starts))
+    count_a[~spans] = 0.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Средние частей приводятся к общей точке отсчета.
+        delta = mean_b + firsts[ends // block] - mean_a - firsts[starts // block]
+        counts = count_a + count_b
+        m2 = m2_b + np.where(spans, m2_a + delta * delta * count_a * count_b / counts, 0.0)
+        np.divide(m2, counts - ddof, out=out)
+    out[counts <= ddof] = np.nan
+    if has_nans:
+        out[_nan_windows(nans, starts)] = np.nan
+    return out
+
+
+def _rolling_extreme(values: np.ndarray,
+                     starts: np.ndarray,
+                     is_max: bool,
+                     out: np.ndarray) -> np.ndarray:
+    """
+    Функция вычисления минимума или максимума по окнам [starts[i], i].
+    Окна постоянной длины (кроме начальных) обрабатываются алгоритмом
+    ван Херка - Гила - Вермана: максимумы с начала и с конца блоков
+    длины окна, по два значения на окно. Окна переменной длины -
+    монотонной очередью. Оба способа линейны по длине ряда.
+    Окно с пропуском (NaN) дает NaN.
+
+    Args:
+        values: значения ряда.
+        starts: позиции начала окна для каждой точки ряда (не убывают).
+        is_max: True - максимум, False - минимум.
+        out: буфер результата.
+
+    Returns:
+        Экстремумы по окнам.
+    """
+    size = values.size
+    if size == 0:
+        return out
+    ends = np.arange(size)
+    window = int((ends - starts).max()) + 1
+    reduce = np.maximum if is_max else np.minimum
+
+    if np.array_equal(starts, np.maximum(ends - window + 1, 0)):
+        nblocks = -(-size // window)
+        padded = np.full(nblocks * window, -np.inf if is_max else np.inf)
+        padded[:size] = values
+        blocks = padded.reshape(nblocks, window)
+        prefix = reduce.accumulate(blocks, axis=1).ravel()
+        suffix = reduce.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+        # Окно [start, end] - конец блока start и начало блока end.
+        # Начальные короткие окна лежат в начале первого блока.
+        reduce(suffix[starts], prefix[ends], out=out)
+        aligned = starts % window == 0
+        out[aligned] = prefix[ends[aligned]]
+        return out
+
+    # Сравнения с NaN ложны, поэтому очередь строится по значениям
+    # без пропусков, а окна с пропусками отмечаются отдельно.
+    nans = np.isnan(values)
+    has_nans = bool(nans.any())
+    if has_nans:
+        values = np.where(nans, -np.inf if is_max else np.inf, values)
+    queue = deque()
+    data = values.tolist()
+    results = []
+    for end, start in enumerate(starts.tolist()):
+        value = data[end]
+        if is_max:
+            while queue and data[queue[-1]] <= value:
+                queue.pop()
+        else:
+            while queue and data[queue[-1]] >= value:
+                queue.pop()
+        queue.append(end)
+        while queue[0] < start:
+            queue.popleft()
+        results.append(data[queue[0]])
+    out[:] = results
+    if has_nans:
+        out[_nan_windows(nans, starts)] = np.nan
+    return out
+
+
+def rolling_min(values: np.ndarray,
+                starts: np.ndarray,
+                out: np.ndarray=None,
+                dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления минимума по окнам [starts[i], i].
+
+    Args:
+        values: значения ряда.
+        starts: позиции начала окна для каждой точки ряда (не убывают).
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Минимумы по окнам.
+    """
+    return _rolling_extreme(values, starts, False, _prepare_out(out, values.size, dtype))
+
+
+def rolling_max(values: np.ndarray,
+                starts: np.ndarray,
+                out: np.ndarray=None,
+                dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления максимума по окнам [starts[i], i].
+
+    Args:
+        values: значения ряда.
+        starts: позиции начала окна для каждой точки ряда (не убывают).
+        out: буфер результата длины size.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Максимумы по окнам.
+    """
+    return _rolling_extreme(values, starts, True, _prepare_out(out, values.size, dtype))
+
+
+def lagged_products(values: np.ndarray,
+                    max_lag: int) -> np.ndarray:
+    """
+    Функция вычисления сумм произведений values[i+k]*values[i]
+    для сдвигов k от 0 до max_lag через быстрое преобразование Фурье.
+
+    Args:
+        values: значения ряда.
+        max_lag: максимальный сдвиг.
+
+    Returns:
+        Суммы произведений для каждого сдвига.
+    """
+    # Длина дополняется до степени двойки, не меньшей size+max_lag,
+    # чтобы циклическая свертка не захватывала лишние произведения.
+    nfft = 1 << (values.size + max_lag).bit_length()
+    spectrum = np.fft.rfft(values, nfft)
+    return np.fft.irfft(spectrum * np.conj(spectrum), nfft)[:max_lag+1]
+
+
+def autocor(values: np.ndarray,
+            max_lag: int,
+            method: str="exact",
+            out: np.ndarray=None,
+            dtype: type=np.float64) -> np.ndarray:
+    """
+    Функция вычисления автокорреляции ряда.
+
+    Args:
+        values: значения ряда.
+        max_lag: максимальный сдвиг (от 0 до size-2).
+        method: способ вычисления ("exact" - среднее и отклонение
+        считаются отдельно для каждого перекрывающегося отрезка,
+        "fft" - классическая оценка с общими средним и дисперсией).
+        out: буфер результата длины max_lag+1.
+        dtype: тип результата, если out не передан.
+
+    Returns:
+        Автокорреляция для каждого сдвига.
+    """
+    if max_lag < 0 or max_lag > values.size - 2:
+        error = ValueError("Недопустимый максимальный сдвиг.")
+        raise error
+    if method not in ("exact", "fft"):
+        error = ValueError("Неизвестный способ вычисления автокорреляции.")
+        raise error
+    out = _prepare_out(out, max_lag + 1, dtype)
+
+    centered = np.asarray(values, dtype=np.float64)
+    centered = centered - np.average(centered)
+    cross = lagged_products(centered, max_lag)
+    if method == "fft":
+        return np.divide(cross, cross[0], out=out)
+
+    # Суммы по отрезкам берутся из префиксных сумм.
+    sums = np.concatenate(([0.0], np.cumsum(centered)))
+    squares = np.concatenate(([0.0], np.cumsum(centered * centered)))
+
+    lags = np.arange(cross.size)
+    lengths = values.size - lags
+    avg_x = (sums[-1] - sums[lags]) / lengths
+    avg_y = sums[lengths] / lengths
+    var_x = np.maximum((squares[-1] - squares[lags]) / lengths - avg_x * avg_x, 0.0)
+    var_y = np.maximum(squares[lengths] / lengths - avg_y * avg_y, 0.0)
+    avg_xy = cross / lengths
+
+    return np.divide(avg_xy - avg_x * avg_y, np.sqrt(var_x * var_y), out=out)
+
+
+def global_extremes(values: np.ndarray) -> np.ndarray:
+    """
+    Функция поиска глобальных экстремумов ряда.
+
+    Args:
+        values: значения ряда.
+
+    Returns:
+        Позиции минимума и максимума.
+    """
+    return np.array([np.argmin(values), np.argmax(values)])
+
+
+def local_extremes(values: np.ndarray,
+                   min_prominence: float=None,
+                   min_distance: int=None,
+                   times: np.ndarray=None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Функция поиска локальных экстремумов ряда.
+    Экстремумы ищутся по смене знака первой разности, плато
+    из равных значений считается одной точкой (берется его середина).
+
+    Args:
+        values: значения ряда.
+        min_prominence: минимальная выраженность экстремума.
+        min_distance: минимальное расстояние между экстремумами
+        одного типа (в точках или, если передан times, в наносекундах).
+        times: метки времени (int64, нс) для расстояния во времени.
+
+    Returns:
+        Позиции экстремумов и маска максимумов среди них.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.size < 3:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=bool)
+
+    # Сжатие плато: каждая серия равных значений становится одной точкой.
+    changes = np.flatnonzero(np.diff(values) != 0) + 1
+    starts = np.concatenate(([0], changes))
+    ends = np.concatenate((changes, [values.size])) - 1
+    levels = values[starts]
+
+    slopes = np.sign(np.diff(levels))
+    is_max = np.zeros(levels.size, dtype=bool)
+    is_min = np.zeros(levels.size, dtype=bool)
+    is_max[1:-1] = (slopes[:-1] > 0) & (slopes[1:] < 0)
+    is_min[1:-1] = (slopes[:-1] < 0) & (slopes[1:] > 0)
+
+    if min_prominence is not None:
+        is_max &= _calc_prominences(levels, is_max) >= min_prominence
+        is_min &= _calc_prominences(-levels, is_min) >= min_prominence
+
+    ids = (starts + ends) // 2
+    if min_distance is not None:
+        coords = ids if times is None else times[ids]
+        is_max &= _select_by_distance(coords, levels, is_max, min_distance)
+        is_min &= _select_by_distance(coords, -levels, is_min, min_distance)
+
+    found = is_max | is_min
+    return ids[found], is_max[found]
+
+
+# Поля агрегированных баров в порядке, возвращаемом resample_bars.
+BAR_FIELDS = ("time", "open", "high", "low", "close", "sum", "count")
+
+
+def resample_bars(times: np.ndarray,
+                  opens: np.ndarray,
+                  highs: np.ndarray,
+                  lows: np.ndarray,
+                  closes: np.ndarray,
+                  sums: np.ndarray,
+                  counts: np.ndarray,
+                  bucket: int) -> tuple[np.ndarray, ...]:
+    """
+    Функция объединения баров в более крупные интервалы длины bucket,
+    выровненные по началу эпохи (UTC). Один проход reduceat по границам
+    интервалов, без цикла по барам.
+
+    Args:
+        times: время начала баров (int64, нс), по возрастанию.
+        opens, highs, lows, closes: цены открытия, максимумы,
+        минимумы и цены закрытия баров.
+        sums: суммы значений в барах.
+        counts: число точек в барах.
+        bucket: длина нового интервала в наносекундах.
+
+    Returns:
+        Массивы новых баров в порядке BAR_FIELDS.
+    """
+    if times.size == 0:
+        return (np.empty(0, dtype=np.int64),) + tuple(
+            np.empty(0, dtype=array.dtype) for array in (opens, highs, lows, closes, sums, counts))
+
+    ids = times // bucket
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(ids)) + 1))
+    ends = np.concatenate((starts[1:], [times.size])) - 1
+    return (ids[starts] * bucket,
+            opens[starts],
+            np.maximum.reduceat(highs, starts),
+            np.minimum.reduceat(lows, starts),
+            closes[ends],
+            np.add.reduceat(sums, starts),
+            np.add.reduceat(counts, starts))
+
+
+def resample_ohlc(times: np.ndarray,
+                  values: np.ndarray,
+                  bucket: int) -> tuple[np.ndarray, ...]:
+    """
+    Функция агрегации точек ряда в бары OHLC длины bucket.
+
+    Args:
+        times: метки времени (int64, нс), по возрастанию.
+        values: значения ряда (без пропусков).
+        bucket: длина бара в наносекундах.
+
+    Returns:
+        Массивы баров в порядке BAR_FIELDS.
+    """
+    counts = np.ones(values.size, dtype=np.int64)
+    return resample_bars(times, values, values, values, values, values, counts, bucket)
+
+
+if __name__ == "__main__":
+    pass
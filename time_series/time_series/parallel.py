@@ -0,0 +1,154 @@
+"""
+Модуль параллельной обработки временных рядов в нескольких процессах.
+"""
+import os
+import numpy as np
+from pandas import DataFrame, DatetimeIndex
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from multiprocessing.shared_memory import SharedMemory
+
+from time_series.time_series.core import index_to_ns
+from time_series.time_series.batch import BatchAnalyser
+
+
+# Названия вычисляемых таблиц в порядке их хранения в общей памяти.
+RESULTS = ("Movavg", "Diff", "Autocor")
+
+
+def analyse_frame(frame: DataFrame,
+                  interval: timedelta,
+                  window: int|timedelta) -> dict[str, DataFrame]:
+    """
+    Функция вычисления скользящего среднего, а также дифференциала
+    и автокорреляции скользящего среднего для таблицы временных рядов.
+
+    Args:
+        frame: таблица временных рядов (по столбцу на ценную бумагу).
+        interval: интервал для дифференцирования.
+        window: окно скользящего среднего.
+
+    Returns:
+        Словарь таблиц результатов с ключами из RESULTS.
+    """
+    movavg = BatchAnalyser(frame, interval).calc_movavg(window)
+    analyser = BatchAnalyser(movavg, interval)
+    return {"Movavg": movavg,
+            "Diff": analyser.differentiate(),
+            "Autocor": analyser.calc_autocor()}
+
+
+def _analyse_block(times_name: str,
+                   values_name: str,
+                   results_name: str,
+                   shape: tuple[int, int],
+                   columns: tuple[int, int],
+                   interval: timedelta,
+                   window: int|timedelta) -> None:
+    """
+    Функция обработки блока столбцов в дочернем процессе.
+    Входные и выходные массивы передаются через общую память.
+
+    Args:
+        times_name: имя общей памяти с метками времени (int64, нс).
+        values_name: имя общей памяти со значениями (ряды по строкам).
+        results_name: имя общей памяти для результатов.
+        shape: число рядов и длина каждого ряда.
+        columns: диапазон обрабатываемых рядов [начало, конец).
+        interval: интервал для дифференцирования.
+        window: окно скользящего среднего.
+    """
+    blocks = [SharedMemory(name=name) for name in (times_name, values_name, results_name)]
+    try:
+        times = np.ndarray(shape[1], dtype=np.int64, buffer=blocks[0].buf)
+        values = np.ndarray(shape, dtype=float, buffer=blocks[1].buf)
+        results = np.ndarray((len(RESULTS),) + shape, dtype=float, buffer=blocks[2].buf)
+
+        start, end = columns
+        frame = DataFrame(values[start:end].T, index=DatetimeIndex(times.view("datetime64[ns]")))
+        frames = analyse_frame(frame, interval, window)
+        for i, name in enumerate(RESULTS):
+            results[i, start:end] = frames[name].to_numpy().T
+        # Представления общей памяти должны быть освобождены до close().
+        del times, values, results, frame, frames
+    finally:
+        for block in blocks:
+            block.close()
+
+
+class ParallelAnalyser:
+    """
+    Класс параллельной обработки таблицы временных рядов.
+    Ряды распределяются по процессам ProcessPoolExecutor, данные
+    передаются через multiprocessing.shared_memory без сериализации.
+    """
+    def __init__(self,
+                 workers: int=None):
+        """
+        Args:
+            workers: число процессов (по умолчанию - число процессоров;
+            при 1 обработка идет в текущем процессе).
+        """
+        self.__workers = workers
+
+    @property
+    def workers(self) -> int:
+        """
+        Свойство числа процессов.
+
+        Returns:
+            Число процессов.
+        """
+        return self.__workers
+
+    def analyse(self,
+                frame: DataFrame,
+                interval: timedelta,
+                window: int|timedelta) -> dict[str, DataFrame]:
+        """
+        Метод вычисления скользящего среднего, дифференциала
+        и автокорреляции для всех рядов таблицы.
+
+        Args:
+            frame: таблица временных рядов (по столбцу на ценную бумагу).
+            interval: интервал для дифференцирования.
+            window: окно скользящего среднего.
+
+        Returns:
+            Словарь таблиц результатов с ключами из RESULTS.
+        """
+        if self.__workers == 1 or frame.shape[1] < 2:
+            return analyse_frame(frame, interval, window)
+
+        shape = (frame.shape[1], frame.shape[0])
+        times = SharedMemory(create=True, size=max(8 * shape[1], 1))
+        values = SharedMemory(create=True, size=max(8 * shape[0] * shape[1], 1))
+        results = SharedMemory(create=True, size=max(8 * len(RESULTS) * shape[0] * shape[1], 1))
+        try:
+            np.ndarray(shape[1], dtype=np.int64, buffer=times.buf)[:] = index_to_ns(frame.index)
+            np.ndarray(shape, dtype=float, buffer=values.buf)[:] = frame.to_numpy(dtype=float).T
+
+            workers = self.__workers or os.cpu_count() or 1
+            # Блоков больше, чем процессов, чтобы выровнять нагрузку.
+            bounds = np.linspace(0, shape[0], min(4 * workers, shape[0]) + 1).astype(int)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_analyse_block, times.name, values.name,
+                                           results.name, shape, (start, end),
+                                           interval, window)
+                           for start, end in zip(bounds[:-1], bounds[1:])]
+                for future in futures:
+                    future.result()
+
+            view = np.ndarray((len(RESULTS),) + shape, dtype=float, buffer=results.buf)
+            frames = {name: DataFrame(view[i].T.copy(), index=frame.index, columns=frame.columns)
+                      for i, name in enumerate(RESULTS)}
+            del view
+            return frames
+        finally:
+            for block in (times, values, results):
+                block.close()
+                block.unlink()
+
+
+if __name__ == "__main__":
+    pass
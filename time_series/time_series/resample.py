@@ -0,0 +1,283 @@
+"""
+Модуль пирамиды агрегатов временного ряда разных разрешений.
+"""
+import numpy as np
+from pandas import DataFrame, DatetimeIndex, Series
+from datetime import timedelta
+
+from time_series.time_series import core
+from time_series.time_series.core import BAR_FIELDS, index_to_ns, timedelta_to_ns
+
+
+# Уровни пирамиды по умолчанию: 1 минута, 5 минут, 1 час, 1 день.
+DEFAULT_LEVELS = (timedelta(minutes=1), timedelta(minutes=5),
+                  timedelta(hours=1), timedelta(days=1))
+
+# Названия столбцов таблиц уровней.
+COLUMNS = ("Open", "High", "Low", "Close", "Mean", "Count")
+
+
+def _label(delta: timedelta) -> str:
+    """
+    Функция получения короткого названия интервала ("5m", "1h", "1d").
+
+    Args:
+        delta: интервал.
+
+    Returns:
+        Название интервала в формате команд Host.
+    """
+    seconds = int(delta.total_seconds())
+    for unit, length in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds % length == 0:
+            return f"{seconds // length}{unit}"
+    return f"{seconds}s"
+
+
+class ResamplePyramid:
+    """
+    Класс пирамиды агрегатов временного ряда: бары OHLC, среднее
+    и число точек на нескольких уровнях (например, 1m - 5m - 1h - 1d).
+    Первый уровень строится по исходным точкам, каждый следующий -
+    по барам предыдущего, поэтому грубые представления длинной
+    истории не требуют повторного прохода по исходным данным.
+    Бары выровнены по началу эпохи (UTC).
+    """
+    def __init__(self,
+                 levels: tuple[timedelta]=DEFAULT_LEVELS):
+        """
+        Args:
+            levels: интервалы уровней по возрастанию, каждый следующий
+            должен быть кратен предыдущему.
+        """
+        buckets = [timedelta_to_ns(level) for level in levels]
+        if len(buckets) == 0 or buckets[0] <= 0:
+            error = ValueError("Недопустимые уровни пирамиды.")
+            raise error
+        for smaller, larger in zip(buckets[:-1], buckets[1:]):
+            if larger <= smaller or larger % smaller != 0:
+                error = ValueError("Каждый уровень пирамиды должен быть кратен предыдущему.")
+                raise error
+
+        self.__levels = tuple(levels)
+        self.__buckets = buckets
+        self.__tz = None
+        self.__last = None
+        self.__bars = [self._empty_bars() for _ in buckets]
+
+    @property
+    def levels(self) -> tuple[timedelta]:
+        """
+        Свойство интервалов уровней.
+
+        Returns:
+            Интервалы уровней по возрастанию.
+        """
+        return self.__levels
+
+    @property
+    def labels(self) -> list[str]:
+        """
+        Свойство названий уровней.
+
+        Returns:
+            Названия уровней ("1m", "5m", ...).
+        """
+        return [_label(level) for level in self.__levels]
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            Число баров первого уровня.
+        """
+        return self.__bars[0]["time"].size
+
+    @staticmethod
+    def _empty_bars() -> dict[str, np.ndarray]:
+        """
+        Метод создания пустого уровня.
+
+        Returns:
+            Словарь пустых массивов с ключами из BAR_FIELDS.
+        """
+        bars = {field: np.empty(0, dtype=float) for field in BAR_FIELDS}
+        bars["time"] = np.empty(0, dtype=np.int64)
+        bars["count"] = np.empty(0, dtype=np.int64)
+        return bars
+
+    def build(self,
+              series: Series) -> "ResamplePyramid":
+        """
+        Метод построения пирамиды по временному ряду (пропуски отбрасываются).
+
+        Args:
+            series: временной ряд с временным индексом.
+
+        Returns:
+            Эта же пирамида.
+        """
+        self.__bars = [self._empty_bars() for _ in self.__buckets]
+        self.__tz = None
+        self.__last = None
+        return self.append(series)
+
+    def append(self,
+               series: Series) -> "ResamplePyramid":
+        """
+        Метод добавления новых точек (позже уже добавленных).
+        Пересчитываются только бары, в которые попали новые точки,
+        исходные точки истории повторно не просматриваются.
+
+        Args:
+            series: новые точки временного ряда.
+
+        Returns:
+            Эта же пирамида.
+        """
+        series = series.dropna()
+        if series.size == 0:
+            return self
+        index = DatetimeIndex(series.index)
+        if len(self) == 0:
+            self.__tz = index.tz
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        times = index_to_ns(index)
+        values = series.to_numpy(dtype=float)
+
+        if self.__last is not None and times[0] <= self.__last:
+            error = ValueError("Новые точки должны быть позже добавленных.")
+            raise error
+        self.__last = int(times[-1])
+
+        new = dict(zip(BAR_FIELDS, core.resample_ohlc(times, values, self.__buckets[0])))
+        changed = new["time"][0]
+        for level, bucket in enumerate(self.__buckets):
+            # Бары уровня, начиная с интервала, в который попало
+            # первое изменение, пересчитываются заново.
+            start = changed // bucket * bucket
+            bars = self.__bars[level]
+            keep = int(np.searchsorted(bars["time"], start, side="left"))
+            if level == 0:
+                source = {field: np.concatenate((bars[field][keep:], new[field]))
+                          for field in BAR_FIELDS}
+            else:
+                lower = self.__bars[level - 1]
+                first = int(np.searchsorted(lower["time"], start, side="left"))
+                source = {field: lower[field][first:] for field in BAR_FIELDS}
+            tail = core.resample_bars(*(source[field] for field in BAR_FIELDS), bucket)
+            self.__bars[level] = {field: np.concatenate((bars[field][:keep], array))
+                                  for field, array in zip(BAR_FIELDS, tail)}
+        return self
+
+    def level(self,
+              interval: timedelta) -> DataFrame:
+        """
+        Метод получения таблицы одного из уровней пирамиды.
+
+        Args:
+            interval: интервал уровня.
+
+        Returns:
+            Таблица баров (столбцы COLUMNS, индекс Date - начало бара).
+        """
+        bucket = timedelta_to_ns(interval)
+        if bucket not in self.__buckets:
+            error = ValueError("В пирамиде нет уровня " + _label(interval))
+            raise error
+        return self._to_frame(self.__bars[self.__buckets.index(bucket)])
+
+    def view(self,
+             interval: timedelta) -> DataFrame:
+        """
+        Метод получения баров произвольного интервала, кратного одному
+        из уровней. Бары собираются из самого крупного подходящего
+        уровня, а не из исходных точек.
+
+        Args:
+            interval: интервал баров.
+
+        Returns:
+            Таблица баров (столбцы COLUMNS, индекс Date - начало бара).
+        """
+        bucket = timedelta_to_ns(interval)
+        suitable = [level for level, size in enumerate(self.__buckets)
+                    if size <= bucket and bucket % size == 0]
+        if not suitable:
+            error = ValueError("Интервал " + _label(interval) +
+                               " не кратен ни одному уровню пирамиды.")
+            raise error
+        level = suitable[-1]
+        bars = self.__bars[level]
+        if self.__buckets[level] != bucket:
+            bars = dict(zip(BAR_FIELDS, core.resample_bars(
+                *(bars[field] for field in BAR_FIELDS), bucket)))
+        return self._to_frame(bars)
+
+    def _to_frame(self,
+                  bars: dict[str, np.ndarray]) -> DataFrame:
+        """
+        Метод перевода баров в таблицу.
+
+        Args:
+            bars: массивы баров с ключами из BAR_FIELDS.
+
+        Returns:
+            Таблица баров.
+        """
+        index = DatetimeIndex(bars["time"].view("datetime64[ns]"), name="Date")
+        if self.__tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.__tz)
+        values = (bars["open"], bars["high"], bars["low"], bars["close"],
+                  bars["sum"] / bars["count"], bars["count"])
+        return DataFrame(dict(zip(COLUMNS, values)), index=index)
+
+    def to_frames(self) -> dict[str, DataFrame]:
+        """
+        Метод получения таблиц всех уровней для сохранения.
+
+        Returns:
+            Словарь таблиц с ключами - названиями уровней.
+        """
+        return {label: self._to_frame(bars) for label, bars in zip(self.labels, self.__bars)}
+
+    @classmethod
+    def from_frames(cls,
+                    frames: dict[str, DataFrame],
+                    levels: tuple[timedelta]=DEFAULT_LEVELS) -> "ResamplePyramid":
+        """
+        Метод восстановления пирамиды из сохраненных таблиц уровней.
+
+        Args:
+            frames: таблицы уровней с ключами - названиями уровней.
+            levels: интервалы уровней.
+
+        Returns:
+            Пирамида.
+        """
+        pyramid = cls(levels)
+        bars = []
+        for label in pyramid.labels:
+            frame = frames[label]
+            index = DatetimeIndex(frame.index)
+            if index.tz is not None:
+                pyramid.__tz = index.tz
+                index = index.tz_convert("UTC").tz_localize(None)
+            counts = frame["Count"].to_numpy(dtype=np.int64)
+            bars.append({"time": index_to_ns(index),
+                         "open": frame["Open"].to_numpy(dtype=float),
+                         "high": frame["High"].to_numpy(dtype=float),
+                         "low": frame["Low"].to_numpy(dtype=float),
+                         "close": frame["Close"].to_numpy(dtype=float),
+                         "sum": frame["Mean"].to_numpy(dtype=float) * counts,
+                         "count": counts})
+        pyramid.__bars = bars
+        if bars[0]["time"].size:
+            # Точное время последней точки не сохраняется, поэтому
+            # новые точки принимаются начиная с последнего бара.
+            pyramid.__last = int(bars[0]["time"][-1]) - 1
+        return pyramid
+
+
+if __name__ == "__main__":
+    pass
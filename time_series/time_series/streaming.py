@@ -0,0 +1,214 @@
+"""
+Модуль потоковой обработки временных рядов.
+"""
+import numpy as np
+from pandas import DatetimeIndex, Series, Timestamp
+from collections import deque
+from datetime import timedelta
+
+
+class StreamingAnalyser:
+    """
+    Класс потоковой обработки временного ряда. Точки добавляются
+    по одной, скользящее среднее, производная и автокорреляция
+    обновляются за амортизированное O(1) (для автокорреляции - O(max_lag)).
+    Память ограничена размером окна и числом сдвигов, а не длиной истории.
+    """
+    def __init__(self,
+                 window: int|timedelta,
+                 interval: timedelta,
+                 max_lag: int=0):
+        """
+        Args:
+            window: окно скользящего среднего.
+            interval: интервал для дифференцирования.
+            max_lag: максимальный сдвиг автокорреляции.
+        """
+        if isinstance(window, int) and window < 1:
+            error = ValueError("Попытка передачи отрицательного окна.")
+            raise error
+        if isinstance(window, timedelta) and window < timedelta(0):
+            error = ValueError("Попытка передачи отрицательного окна.")
+            raise error
+        if max_lag < 0:
+            error = ValueError("Недопустимый максимальный сдвиг.")
+            raise error
+
+        self.__window = window
+        self.__interval = interval
+        self.__max_lag = max_lag
+        self.__size = 0
+        self.__last_time = None
+        self.__last_value = None
+        self.__diff = None
+
+        # Состояние скользящего среднего: точки окна и их сумма.
+        self.__window_times = deque()
+        self.__window_values = deque()
+        self.__window_sum = 0.0
+        self.__removed = 0
+
+        # Состояние автокорреляции. Значения сдвигаются на первое
+        # значение ряда, чтобы суммы квадратов не теряли точность.
+        self.__shift = None
+        self.__total = 0.0
+        self.__squares = 0.0
+        self.__head_times = []
+        self.__head = []
+        self.__tail = deque(maxlen=max_lag)
+        self.__products = [0.0] * (max_lag + 1)
+
+    @property
+    def size(self) -> int:
+        """
+        Свойство числа добавленных точек.
+
+        Returns:
+            Длина обработанного временного ряда.
+        """
+        return self.__size
+
+    @property
+    def movavg(self) -> float:
+        """
+        Свойство последнего значения скользящего среднего.
+
+        Returns:
+            Скользящее среднее по последнему окну.
+        """
+        if not self.__window_values:
+            return None
+        return self.__window_sum / len(self.__window_values) + self.__shift
+
+    @property
+    def diff(self) -> float:
+        """
+        Свойство последнего значения производной.
+
+        Returns:
+            Производная между двумя последними точками.
+        """
+        return self.__diff
+
+    @property
+    def autocor(self) -> Series:
+        """
+        Свойство автокорреляции всего обработанного ряда
+        для сдвигов от 0 до max_lag.
+
+        Returns:
+            Автокорреляция временного ряда.
+        """
+        max_lag = min(self.__max_lag, self.__size - 2)
+        if max_lag < 0:
+            return Series([], index=DatetimeIndex([]), name="Autocor", dtype=float)
+
+        lags = np.arange(max_lag + 1)
+        lengths = self.__size - lags
+        head = np.asarray(self.__head[:max_lag], dtype=float)
+        tail = np.asarray(self.__tail, dtype=float)[::-1][:max_lag]
+        head_sums = np.concatenate(([0.0], np.cumsum(head)))
+        head_squares = np.concatenate(([0.0], np.cumsum(head * head)))
+        tail_sums = np.concatenate(([0.0], np.cumsum(tail)))
+        tail_squares = np.concatenate(([0.0], np.cumsum(tail * tail)))
+
+        avg_x = (self.__total - head_sums) / lengths
+        avg_y = (self.__total - tail_sums) / lengths
+        var_x = np.maximum((self.__squares - head_squares) / lengths - avg_x * avg_x, 0.0)
+        var_y = np.maximum((self.__squares - tail_squares) / lengths - avg_y * avg_y, 0.0)
+        avg_xy = np.asarray(self.__products[:max_lag+1]) / lengths
+
+        autocors = (avg_xy - avg_x * avg_y) / np.sqrt(var_x * var_y)
+        return Series(autocors, index=DatetimeIndex(self.__head_times[:max_lag+1]),
+                      name="Autocor")
+
+    def append(self,
+               timestamp: Timestamp,
+               value: float) -> None:
+        """
+        Метод добавления новой точки временного ряда.
+
+        Args:
+            timestamp: время точки (строго позже предыдущей).
+            value: значение ряда.
+        """
+        timestamp = Timestamp(timestamp)
+        if self.__last_time is not None and timestamp <= self.__last_time:
+            error = ValueError("Точки должны добавляться в порядке времени.")
+            raise error
+
+        value = float(value)
+        if self.__shift is None:
+            self.__shift = value
+        shifted = value - self.__shift
+
+        if self.__last_time is not None:
+            self.__diff = ((value - self.__last_value) /
+                           ((timestamp - self.__last_time) / self.__interval))
+        self._update_movavg(timestamp, shifted)
+        self._update_autocor(timestamp, shifted)
+
+        self.__last_time = timestamp
+        self.__last_value = value
+        self.__size += 1
+
+    def _update_movavg(self,
+                       timestamp: Timestamp,
+                       shifted: float) -> None:
+        """
+        Метод обновления окна скользящего среднего.
+
+        Args:
+            timestamp: время новой точки.
+            shifted: сдвинутое значение новой точки.
+        """
+        self.__window_times.append(timestamp)
+        self.__window_values.append(shifted)
+        self.__window_sum += shifted
+
+        if isinstance(self.__window, int):
+            while len(self.__window_values) > self.__window:
+                self._pop_window()
+        else:
+            while timestamp - self.__window_times[0] > self.__window:
+                self._pop_window()
+
+        # Сумма периодически пересчитывается заново, чтобы ошибки
+        # округления от вычитаний не накапливались (амортизированно O(1)).
+        if self.__removed >= len(self.__window_values):
+            self.__window_sum = sum(self.__window_values)
+            self.__removed = 0
+
+    def _pop_window(self) -> None:
+        """
+        Метод удаления самой старой точки из окна скользящего среднего.
+        """
+        self.__window_times.popleft()
+        self.__window_sum -= self.__window_values.popleft()
+        self.__removed += 1
+
+    def _update_autocor(self,
+                        timestamp: Timestamp,
+                        shifted: float) -> None:
+        """
+        Метод обновления сумм, по которым считается автокорреляция.
+
+        Args:
+            timestamp: время новой точки.
+            shifted: сдвинутое значение новой точки.
+        """
+        self.__total += shifted
+        self.__squares += shifted * shifted
+        self.__products[0] += shifted * shifted
+        for lag, previous in enumerate(reversed(self.__tail), start=1):
+            self.__products[lag] += shifted * previous
+
+        if len(self.__head_times) <= self.__max_lag:
+            self.__head_times.append(timestamp)
+        if len(self.__head) < self.__max_lag:
+            self.__head.append(shifted)
+        self.__tail.append(shifted)
+
+
+if __name__ == "__main__":
+    pass
@@ -1,2 +1,10 @@
-from ui.ui import UserInterface
-from ui.plots import Drawer
+from lazy_exports import lazy_exports
+
+_EXPORTS = {
+    "UserInterface": "ui.ui",
+    "Drawer": "ui.plots",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
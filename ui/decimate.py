@@ -0,0 +1,83 @@
+import numpy as np
+
+
+def minmax(x: np.ndarray,
+           y: np.ndarray,
+           buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Прореживание по интервалам оси x (по одному интервалу на пиксель).
+    Для каждого интервала сохраняются первая и последняя точки,
+    а также минимум и максимум, поэтому картинка совпадает
+    с отрисовкой всех точек с точностью до пикселя.
+    Входные параметры:
+        x - возрастающие координаты точек
+        y - значения
+        buckets - число интервалов
+    Возвращает:
+        Координаты и значения не более чем 4 * buckets точек
+    """
+    if x.size <= 4 * buckets:
+        return x, y
+
+    edges = np.linspace(x[0], x[-1], buckets + 1)
+    starts = np.unique(np.searchsorted(x, edges[:-1], side="left"))
+    starts = starts[starts < x.size]
+    ends = np.append(starts[1:], x.size) - 1
+
+    with np.errstate(invalid="ignore"):
+        lows = np.fmin.reduceat(y, starts)
+        highs = np.fmax.reduceat(y, starts)
+    middles = (x[starts] + x[ends]) / 2
+
+    xs = np.column_stack((x[starts], middles, middles, x[ends])).ravel()
+    ys = np.column_stack((y[starts], lows, highs, y[ends])).ravel()
+    return xs, ys
+
+
+def lttb(x: np.ndarray,
+         y: np.ndarray,
+         threshold: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Прореживание алгоритмом Largest-Triangle-Three-Buckets:
+    из каждого интервала выбирается точка, образующая треугольник
+    наибольшей площади с выбранной точкой предыдущего интервала
+    и средней точкой следующего.
+    Входные параметры:
+        x - возрастающие координаты точек
+        y - значения
+        threshold - число точек результата
+    Возвращает:
+        Координаты и значения threshold точек
+    """
+    if threshold >= x.size or threshold < 3:
+        return x, y
+
+    edges = np.linspace(1, x.size - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = x.size - 1
+
+    # Средние точки интервалов считаются заранее через префиксные суммы.
+    sums_x = np.concatenate(([0.0], np.cumsum(x)))
+    sums_y = np.concatenate(([0.0], np.cumsum(np.nan_to_num(y))))
+    next_starts = edges[1:]
+    next_ends = np.append(edges[2:], x.size)
+    counts = np.maximum(next_ends - next_starts, 1)
+    avg_x = (sums_x[next_ends] - sums_x[next_starts]) / counts
+    avg_y = (sums_y[next_ends] - sums_y[next_starts]) / counts
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if end <= start:
+            end = start + 1
+        areas = np.abs((x[previous] - avg_x[i]) * (y[start:end] - y[previous]) -
+                       (x[previous] - x[start:end]) * (avg_y[i] - y[previous]))
+        previous = start + int(np.nanargmax(areas)) if not np.all(np.isnan(areas)) else start
+        selected[i + 1] = previous
+
+    return x[selected], y[selected]
+
+
+if __name__ == "__main__":
+    pass
@@ -1,14 +1,41 @@
 import matplotlib.pyplot as plt
-from pandas import DataFrame
+import matplotlib.dates as mdates
+import numpy as np
+from pandas import DataFrame, DatetimeIndex, Index
 import math
+from contextlib import nullcontext
 
 from matplotlib.widgets import Button
 
+from ui.decimate import lttb, minmax
+
 
 class Drawer:
     '''
-    Класс для отрисовки графиков
+    Класс для отрисовки графиков.
+    Длинные ряды прореживаются до ширины оси в пикселях, при изменении
+    границ оси заново прореживается только видимый диапазон.
     '''
+    def __init__(self,
+                 method: str="minmax",
+                 profiler=None):
+        """
+        Входные параметры:
+            method - способ прореживания ("minmax" или "lttb")
+            profiler - профилировщик с методом span(name) (без замеров, если не задан)
+        """
+        if method not in ("minmax", "lttb"):
+            raise ValueError("Неизвестный способ прореживания: " + method)
+        self._method = method
+        self._profiler = profiler
+
+    def _span(self, name: str):
+        """
+        Возвращает контекст замера этапа отрисовки
+        """
+        if self._profiler is None:
+            return nullcontext()
+        return self._profiler.span(name)
 
     def plot(self,
              data: DataFrame,
@@ -20,15 +47,150 @@ class Drawer:
             columns - Названия столбцов, графики которых надо отрисовать
         """
 
+        with self._span("build"):
+            built = self._build(data, columns)
+        if built:
+            # Время показа включает время, пока окно открыто
+            with self._span("show"):
+                plt.show()
+
+    def save(self,
+             data: DataFrame,
+             columns: list[str],
+             path: str) -> bool:
+        """
+        Сохраняет графики в файл без открытия окна (формат - по расширению пути)
+        Входные параметры:
+            data - Таблица с данными для отрисовки
+            columns - Названия столбцов, графики которых надо отрисовать
+            path - Путь к файлу изображения (.png, .svg)
+        Возвращает:
+            True, если файл сохранен
+        """
+        if not self._build(data, columns, interactive=False):
+            return False
+        try:
+            self._fig.savefig(path)
+        finally:
+            plt.close(self._fig)
+        return True
+
+    def live(self,
+             data: DataFrame,
+             columns: list[str]) -> bool:
+        """
+        Открывает окно с графиками в режиме реального времени (без блокировки).
+        Новые точки добавляются методом append, перерисовываются только линии
+        Входные параметры:
+            data - Таблица с начальными данными
+            columns - Названия столбцов, графики которых надо отрисовать
+        Возвращает:
+            True, если окно открыто
+        """
+        if not self._build(data, columns):
+            return False
+        for line in self._lines:
+            line.set_animated(True)
+        self._fig.canvas.mpl_connect("draw_event", self._on_draw)
+        plt.show(block=False)
+        self._fig.canvas.draw()
+        return True
+
+    def is_open(self) -> bool:
+        """
+        Проверяет, что окно с графиками не закрыто
+        """
+        return hasattr(self, "_fig") and plt.fignum_exists(self._fig.number)
+
+    def wait(self,
+             seconds: float) -> None:
+        """
+        Обрабатывает события окна в течение указанного времени
+        (без полной перерисовки, в отличие от plt.pause)
+        Входные параметры:
+            seconds - время ожидания
+        """
+        self._fig.canvas.start_event_loop(seconds)
+
+    def append(self,
+               rows: DataFrame) -> None:
+        """
+        Добавляет новые точки в конец графиков режима реального времени.
+        Стоимость обновления зависит от числа новых точек, а не от длины истории
+        Входные параметры:
+            rows - Новые строки таблицы (индекс позже уже отрисованных)
+        """
+        if len(rows) == 0:
+            return
+        start = self._size
+        self._grow(start + len(rows))
+        self._xbuf[start:self._size] = self._index_to_x(rows.index)
+
+        relimit = False
+        for i, column in enumerate(self._cols):
+            ybuf = self._ybufs[i]
+            ybuf[start:self._size] = rows[column].to_numpy(dtype=float)
+            low, high = self._calc_extent(ybuf[start:self._size])
+            self._extents[i] = (min(self._extents[i][0], low), max(self._extents[i][1], high))
+
+            ax = self._axs[i]
+            bottom, top = ax.get_ylim()
+            if self._extents[i][0] < bottom or self._extents[i][1] > top:
+                ax.set_ylim(*self._padded(self._extents[i]))
+                relimit = True
+            if self._x[-1] > ax.get_xlim()[1]:
+                # Ось x расширяется с запасом, чтобы не перерисовывать ее на каждой точке
+                ax.set_xlim(self._x[0], self._x[-1] + 0.1 * (self._x[-1] - self._x[0]))
+                relimit = True
+            else:
+                self._update_tail(i)
+
+        canvas = self._fig.canvas
+        if relimit or self._background is None:
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            for ax, line in zip(self._axs, self._lines):
+                ax.draw_artist(line)
+            canvas.blit(self._fig.bbox)
+        canvas.flush_events()
+
+    def _build(self,
+               data: DataFrame,
+               columns: list[str],
+               interactive: bool=True) -> bool:
+        """
+        Создает рисунок с графиками указанных столбцов
+        Входные параметры:
+            data - Таблица с данными для отрисовки
+            columns - Названия столбцов, графики которых надо отрисовать
+            interactive - Добавлять ли кнопку сброса масштаба
+        Возвращает:
+            False, если указан неверный столбец
+        """
+
         # Проверка на корректность введенных столбцов
         for column in columns:
             if not (column in data.columns.values):
                 print("Неверное название столбца: ", column)
-                return
+                return False
 
         self._data = data
+        self._tz = data.index.tz if isinstance(data.index, DatetimeIndex) else None
+        self._xbuf = self._index_to_x(data.index)
+        self._size = self._xbuf.size
         # Хранение всех рисунков на изображении для возможности редактирования
         self._axs = []
+        self._lines = []
+        self._ybufs = []
+        # Границы значений хранятся и обновляются по мере добавления точек,
+        # а не пересчитываются на каждое нажатие Reset
+        self._extents = []
+        # Прореженная часть линии: начало диапазона и число покрытых точек
+        self._starts = []
+        self._drawn = []
+        self._history = []
+        self._background = None
         self._fig = plt.figure()
         self._cols = columns
         
@@ -38,9 +200,10 @@ class Drawer:
             self._ncols = 1
 
         # Определение кнопки 
-        resetax = self._fig.add_axes((0.8, 0.025, 0.1, 0.04))
-        button = Button(resetax, 'Reset', hovercolor='0.975')
-        button.on_clicked(self._reset)
+        if interactive:
+            resetax = self._fig.add_axes((0.8, 0.025, 0.1, 0.04))
+            self._button = Button(resetax, 'Reset', hovercolor='0.975')
+            self._button.on_clicked(self._reset)
 
         # Отрисовка всех графиков
         for i in range(0, len(columns)):
@@ -48,9 +211,38 @@ class Drawer:
                 self._plot(columns[i], (i + 1, i + 2))
             else:
                 self._plot(columns[i], i + 1)
+        return True
+
+    @property
+    def _x(self) -> np.ndarray:
+        """
+        Координаты всех добавленных точек
+        """
+        return self._xbuf[:self._size]
+
+    def _grow(self,
+              size: int) -> None:
+        """
+        Увеличивает буферы точек с удвоением емкости (амортизированно O(1) на точку)
+        Входные параметры:
+            size - новое число точек
+        """
+        if size > self._xbuf.size:
+            capacity = max(size, 2 * self._xbuf.size)
+            self._xbuf = np.concatenate((self._xbuf[:self._size], np.empty(capacity - self._size)))
+            self._ybufs = [np.concatenate((ybuf[:self._size], np.full(capacity - self._size, np.nan)))
+                           for ybuf in self._ybufs]
+        self._size = size
+
+    def _on_draw(self, event) -> None:
+        """
+        Запоминает фон рисунка после полной перерисовки и дорисовывает линии
+        """
+        canvas = self._fig.canvas
+        self._background = canvas.copy_from_bbox(self._fig.bbox)
+        for ax, line in zip(self._axs, self._lines):
+            ax.draw_artist(line)
 
-        plt.show()
-    
     def _reset(self, event) -> None:
         """
         Функция сборса масштаба всех графиков по обоим осям.
@@ -58,9 +250,9 @@ class Drawer:
         """
         
         for i in range(0, len(self._axs)):
-            self._axs[i].set_xlim(self._data.index[0], self._data.index[-1])
-            self._axs[i].set_ylim(self._data[self._cols[i]].min(), self._data[self._cols[i]].max())
-        plt.show()         
+            self._axs[i].set_xlim(self._x[0], self._x[-1])
+            self._axs[i].set_ylim(*self._padded(self._extents[i]))
+        self._fig.canvas.draw_idle()
 
     def _plot(self,
               column: str,
@@ -73,9 +265,114 @@ class Drawer:
         """
         
         ax = self._fig.add_subplot(self._nrows, self._ncols, coord)
-        ax.plot(self._data.index, self._data[column])
+        y = self._data[column].to_numpy(dtype=float)
+        xs, ys = self._decimate(ax, y, 0, y.size)
+        line, = ax.plot(xs, ys)
+        if isinstance(self._data.index, DatetimeIndex):
+            ax.xaxis_date(self._tz)
         ax.set_title(column)
         self._axs.append(ax)
+        self._lines.append(line)
+        self._ybufs.append(y)
+        self._extents.append(self._calc_extent(y))
+        self._starts.append(0)
+        self._drawn.append(y.size)
+        self._history.append((xs, ys))
+        ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
+    def _on_xlim_changed(self, ax) -> None:
+        """
+        Функция повторного прореживания видимого диапазона при изменении
+        границ оси (масштабирование, сдвиг, Reset)
+        Входные параметры:
+            ax - ось, границы которой изменились
+        """
+        i = self._axs.index(ax)
+        left, right = sorted(ax.get_xlim())
+        # По одной точке за границами, чтобы линия доходила до краев оси
+        start = max(int(np.searchsorted(self._x, left, side="left")) - 1, 0)
+        end = min(int(np.searchsorted(self._x, right, side="right")) + 1, self._x.size)
+        self._starts[i] = start
+        self._drawn[i] = end
+        self._history[i] = self._decimate(ax, self._ybufs[i], start, end)
+        self._lines[i].set_data(*self._history[i])
+
+    def _update_tail(self,
+                     i: int) -> None:
+        """
+        Функция добавления новых точек к прореженной линии.
+        Новые точки дорисовываются как есть, пока их не станет больше
+        ширины оси, после чего линия прореживается заново
+        Входные параметры:
+            i - номер графика
+        """
+        ax = self._axs[i]
+        if self._size - self._drawn[i] > 4 * max(int(ax.bbox.width), 1):
+            self._drawn[i] = self._size
+            self._history[i] = self._decimate(ax, self._ybufs[i], self._starts[i], self._size)
+        xs, ys = self._history[i]
+        self._lines[i].set_data(np.concatenate((xs, self._x[self._drawn[i]:])),
+                                np.concatenate((ys, self._ybufs[i][self._drawn[i]:self._size])))
+
+    def _decimate(self,
+                  ax,
+                  y: np.ndarray,
+                  start: int,
+                  end: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Функция прореживания диапазона точек до ширины оси в пикселях
+        Входные параметры:
+            ax - ось, на которой рисуется график
+            y - значения ряда
+            start, end - диапазон точек
+        Возвращает:
+            Координаты и значения точек для отрисовки
+        """
+        buckets = max(int(ax.bbox.width), 1)
+        if self._method == "lttb":
+            return lttb(self._x[start:end], y[start:end], 2 * buckets)
+        return minmax(self._x[start:end], y[start:end], buckets)
+
+    @staticmethod
+    def _calc_extent(y: np.ndarray) -> tuple[float, float]:
+        """
+        Функция вычисления границ значений ряда без учета пропусков
+        Входные параметры:
+            y - значения ряда
+        Возвращает:
+            Минимум и максимум
+        """
+        if np.all(np.isnan(y)):
+            return np.inf, -np.inf
+        return float(np.nanmin(y)), float(np.nanmax(y))
+
+    @staticmethod
+    def _padded(extent: tuple[float, float]) -> tuple[float, float]:
+        """
+        Функция добавления полей к границам значений
+        Входные параметры:
+            extent - минимум и максимум
+        Возвращает:
+            Границы оси y
+        """
+        low, high = extent
+        if not np.isfinite(low):
+            return 0.0, 1.0
+        margin = 0.05 * (high - low) or 0.5
+        return low - margin, high + margin
+
+    @staticmethod
+    def _index_to_x(index: Index) -> np.ndarray:
+        """
+        Функция перевода индекса в координаты оси x
+        Входные параметры:
+            index - индекс таблицы
+        Возвращает:
+            Координаты точек (для дат - в единицах matplotlib)
+        """
+        if isinstance(index, DatetimeIndex):
+            return np.asarray(mdates.date2num(index), dtype=float)
+        return np.asarray(index, dtype=float)
 
 
 if __name__ == "__main__":
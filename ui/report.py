@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+def _use_agg():
+    '''
+    Функция выбора неинтерактивного бэкенда matplotlib (без окон).
+    '''
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def render_chart(data: DataFrame,
+                 columns: list[str],
+                 path: str) -> bool:
+    '''
+    Функция отрисовки графиков в файл. Выполняется в процессах отрисовки.
+
+    Args:
+        data: Таблица с данными для отрисовки.
+        columns: Названия столбцов, графики которых надо отрисовать.
+        path: Путь к файлу изображения.
+    Returns:
+        True, если файл сохранен.
+    '''
+    _use_agg()
+    from ui.plots import Drawer
+    return Drawer().save(data, columns, path)
+
+
+class ReportInterface:
+    '''
+    Неинтерактивный интерфейс: команды берутся из списка,
+    а графики сохраняются в файлы в нескольких процессах.
+    Заменяет UserInterface в Host.
+    '''
+    def __init__(self,
+                 commands: list[str],
+                 output_dir: str,
+                 fmt: str="png",
+                 workers: int=1):
+        '''
+        Args:
+            commands: Команды в формате интерактивного режима.
+            output_dir: Каталог для изображений.
+            fmt: Формат изображений (png или svg).
+            workers: Число процессов отрисовки (при 1 - в текущем процессе).
+        '''
+        if fmt not in ("png", "svg"):
+            raise ValueError(f"Неподдерживаемый формат изображений: {fmt}")
+        _use_agg()
+        os.makedirs(output_dir, exist_ok=True)
+        self.__commands = deque(commands)
+        self.__output_dir = output_dir
+        self.__fmt = fmt
+        self.__executor = None
+        if workers > 1:
+            self.__executor = ProcessPoolExecutor(max_workers=workers, initializer=_use_agg)
+        self.__futures = []
+        self.__paths = []
+
+    def get_command(self) -> list[str]:
+        '''
+        Метод получения следующей команды. После последней команды возвращается exit.
+
+        Returns:
+            Массив, состоящий из команды и аргументов.
+        '''
+        while self.__commands:
+            command = self.__commands.popleft().strip()
+            if command and not command.startswith("#"):
+                print(">", command)
+                return command.split()
+        return ["exit"]
+
+    def get_plot(self,
+                 df: DataFrame,
+                 columns: list[str]):
+        '''
+        Метод постановки графиков в очередь на отрисовку в файл.
+        В процесс отрисовки передаются только нужные столбцы.
+
+        Args:
+            df: Таблица с данными.
+            columns: Названия столбцов, графики которых надо отрисовать.
+        '''
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            print("Неверное название столбца: ", *missing)
+            return
+        name = re.sub(r"[^\w.-]", "_", "_".join(columns))
+        path = os.path.join(self.__output_dir, f"{len(self.__paths):04d}_{name}.{self.__fmt}")
+        data = df[columns]
+        if self.__executor is None:
+            future = Future()
+            future.set_result(render_chart(data, columns, path))
+        else:
+            future = self.__executor.submit(render_chart, data, columns, path)
+        self.__futures.append(future)
+        self.__paths.append(path)
+
+    def start_live_plot(self,
+                        df: DataFrame,
+                        columns: list[str]) -> bool:
+        '''
+        Графики реального времени в пакетном режиме не открываются.
+
+        Returns:
+            False.
+        '''
+        print("Команда live недоступна в пакетном режиме.")
+        return False
+
+    def get_help(self):
+        print("Пакетный режим: команды load, save, download, draw, workers, exit; "
+              "draw сохраняет графики в файлы.")
+
+    def close(self) -> list[str]:
+        '''
+        Метод ожидания отрисовки всех графиков и завершения процессов.
+
+        Returns:
+            Пути к сохраненным изображениям.
+        '''
+        try:
+            saved = [path for path, future in zip(self.__paths, self.__futures) if future.result()]
+        finally:
+            if self.__executor is not None:
+                self.__executor.shutdown()
+        return saved
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,37 @@
+"""
+Модуль тестирования прореживания рядов для отрисовки.
+"""
+import unittest
+import numpy as np
+from ui.decimate import lttb, minmax
+
+
+class TestDecimate(unittest.TestCase):
+    def setUp(self):
+        self.x = np.arange(100_000, dtype=float)
+        self.y = np.cumsum(np.random.default_rng(7).normal(size=self.x.size))
+
+    def test_minmax_keeps_extremes_and_edges(self):
+        xs, ys = minmax(self.x, self.y, 500)
+        self.assertLessEqual(xs.size, 4 * 500)
+        self.assertEqual(ys.min(), self.y.min())
+        self.assertEqual(ys.max(), self.y.max())
+        self.assertEqual((xs[0], ys[0]), (self.x[0], self.y[0]))
+        self.assertEqual((xs[-1], ys[-1]), (self.x[-1], self.y[-1]))
+        self.assertTrue(np.all(np.diff(xs) >= 0))
+
+    def test_lttb_selects_existing_points(self):
+        xs, ys = lttb(self.x, self.y, 1000)
+        self.assertEqual(xs.size, 1000)
+        self.assertTrue(np.all(np.diff(xs) > 0))
+        np.testing.assert_array_equal(ys, self.y[xs.astype(int)])
+
+    def test_short_series_not_decimated(self):
+        xs, ys = minmax(self.x[:100], self.y[:100], 500)
+        self.assertEqual(xs.size, 100)
+        xs, ys = lttb(self.x[:100], self.y[:100], 500)
+        self.assertEqual(xs.size, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Модуль тестирования графиков, дополняемых в реальном времени.
+"""
+import unittest
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from pandas import DataFrame, date_range
+from ui.plots import Drawer
+
+
+class TestLivePlot(unittest.TestCase):
+    def setUp(self):
+        index = date_range("2024-01-01", periods=2000, freq="min")
+        values = np.cumsum(np.random.default_rng(3).normal(size=index.size))
+        self.data = DataFrame({"Open": values, "Diff": np.gradient(values)}, index=index)
+        self.drawer = Drawer()
+
+    def tearDown(self):
+        plt.close("all")
+
+    def test_append_updates_extents_incrementally(self):
+        self.assertTrue(self.drawer.live(self.data[:1000], ["Open", "Diff"]))
+        for start in range(1000, 2000, 100):
+            self.drawer.append(self.data[start:start+100])
+
+        self.assertEqual(self.drawer._size, 2000)
+        for i, column in enumerate(["Open", "Diff"]):
+            self.assertEqual(self.drawer._extents[i],
+                             (self.data[column].min(), self.data[column].max()))
+            bottom, top = self.drawer._axs[i].get_ylim()
+            self.assertLessEqual(bottom, self.data[column].min())
+            self.assertGreaterEqual(top, self.data[column].max())
+
+    def test_line_ends_with_last_point(self):
+        self.drawer.live(self.data[:1000], ["Open"])
+        self.drawer.append(self.data[1000:1010])
+        xs, ys = self.drawer._lines[0].get_data()
+        self.assertEqual(ys[-1], self.data["Open"].iloc[1009])
+        self.assertEqual(xs[-1], self.drawer._x[-1])
+
+    def test_wrong_column(self):
+        self.assertFalse(self.drawer.live(self.data, ["Close"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,35 @@
-from pandas import DataFrame
+from __future__ import annotations
 
-from ui.plots import Drawer
+from typing import TYPE_CHECKING
+
+# matplotlib загружается при первой отрисовке, а не при запуске.
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from ui.plots import Drawer
 
 
 class UserInterface:
-    def __init__(self):
-        self.__drawer = Drawer()
+    def __init__(self,
+                 profiler=None):
+        '''
+        Args:
+            profiler: Профилировщик этапов отрисовки (без замеров, если не задан).
+        '''
+        self.__profiler = profiler
+        self.__drawer = None
+
+    @property
+    def drawer(self) -> Drawer:
+        '''
+        Свойство объекта отрисовки (создается при первой отрисовке).
+
+        Returns:
+            Объект отрисовки графиков.
+        '''
+        if self.__drawer is None:
+            from ui.plots import Drawer
+            self.__drawer = Drawer(profiler=self.__profiler)
+        return self.__drawer
 
     def get_command(self) -> list[str]:
         '''
@@ -19,7 +43,38 @@ class UserInterface:
     def get_plot(self,
                  df: DataFrame,
                  columns: list[str]):
-        self.__drawer.plot(df, columns)
+        self.drawer.plot(df, columns)
+
+    def start_live_plot(self,
+                        df: DataFrame,
+                        columns: list[str]) -> bool:
+        '''
+        Метод открытия графиков, обновляемых в реальном времени.
+
+        Returns:
+            True, если окно открыто.
+        '''
+        return self.drawer.live(df, columns)
+
+    def update_live_plot(self,
+                         rows: DataFrame):
+        '''
+        Метод добавления новых строк на графики реального времени.
+        '''
+        self.drawer.append(rows)
+
+    def is_live_plot_open(self) -> bool:
+        '''
+        Метод проверки, что окно графиков реального времени не закрыто.
+        '''
+        return self.__drawer is not None and self.__drawer.is_open()
+
+    def wait(self,
+             seconds: float):
+        '''
+        Метод ожидания с обработкой событий окна графиков.
+        '''
+        self.drawer.wait(seconds)
 
     def get_help(self):
         print("Список команд:")
@@ -27,8 +82,17 @@ class UserInterface:
         print("load [sheet name] - загрузить страницу [sheet name] из .xslx файла.")
         print("save [sheet name] - сохранить данные в страницу [sheet name] .xslx файла.")
         print("download [organization] [period] [interval] [window] - загружает данные указанно компании за указанный интервал с определенным периодом." +
-            "Вычисляет все данные с указанным окном скользящего среднего.")
+            "Вычисляет все данные с указанным окном скользящего среднего " +
+            "(Movavg, Diff, Autocor и скользящие Ema, Std, Min, Max). " +
+            "Несколько компаний перечисляются через запятую, столбцы получают суффикс _[organization].")
         print("draw [list of cols] - Отобразить графики рассчитанных значений.")
+        print("live [organization] [period] [interval] [window] [list of cols] - графики Open, Movavg и Diff, " +
+            "дополняемые новыми данными до закрытия окна.")
+        print("resample [interval] - бары OHLC, среднее и число точек с указанным интервалом " +
+            "(из пирамиды 1m - 5m - 1h - 1d, сохраняемой вместе с таблицей командой save).")
+        print("workers [number] - задать число процессов для обработки нескольких компаний.")
+        print("stats [on | on memory | off | clear | dump [file]] - сводка времени и памяти по этапам команд, " +
+            "включение и выключение замеров, сохранение этапов в файл JSON Lines.")
 
     def _command_to_list(self,
                          command: str) -> list[str]: